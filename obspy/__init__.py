@@ -27,7 +27,7 @@ for seismology.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
-import sys
+import importlib
 import warnings
 
 # don't change order
@@ -44,10 +44,6 @@ with warnings.catch_warnings(record=True) as w:
     from obspy.core.utcdatetime import UTCDateTime  # NOQA
 from obspy.core.util import _get_version_string
 __version__ = _get_version_string(abbrev=10)
-from obspy.core.trace import Trace  # NOQA
-from obspy.core.stream import Stream, read
-from obspy.core.event import read_events, Catalog
-from obspy.core.inventory import read_inventory, Inventory  # NOQA
 from obspy.core.util.obspy_types import (  # NOQA
     ObsPyException, ObsPyReadingError)
 
@@ -57,16 +53,42 @@ __all__ = ["UTCDateTime", "Trace", "__version__", "Stream", "read",
            "ObsPyReadingError"]
 
 
-# insert supported read/write format plugin lists dynamically in docstrings
-from obspy.core.util.base import _add_format_plugin_table
+# All other convenience imports are only done on first access (PEP 562), so
+# that e.g. scripts only working with waveforms do not have to wait for the
+# event and inventory classes to be imported.
+_LAZY_IMPORTS = {
+    "Trace": "obspy.core.trace",
+    "Stream": "obspy.core.stream",
+    "read": "obspy.core.stream",
+    "read_events": "obspy.core.event",
+    "Catalog": "obspy.core.event",
+    "read_inventory": "obspy.core.inventory",
+    "Inventory": "obspy.core.inventory",
+}
 
 
-_add_format_plugin_table(read, "waveform", "read", numspaces=4)
-_add_format_plugin_table(read_events, "event", "read", numspaces=4)
-_add_format_plugin_table(read_inventory, "inventory", "read", numspaces=4)
-_add_format_plugin_table(Stream.write, "waveform", "write", numspaces=8)
-_add_format_plugin_table(Catalog.write, "event", "write", numspaces=8)
-_add_format_plugin_table(Inventory.write, "inventory", "write", numspaces=8)
+def __getattr__(name):
+    msg = "module %r has no attribute %r" % (__name__, name)
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    elif name.startswith("__"):
+        raise AttributeError(msg)
+    else:
+        # submodules (e.g. ``obspy.signal``) can be used without importing them
+        # explicitly
+        module_name = "%s.%s" % (__name__, name)
+        try:
+            value = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+            raise AttributeError(msg) from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 
 if __name__ == '__main__':
@@ -153,6 +153,8 @@ def pytest_addoption(parser):
                      help='test only network modules', )
     parser.addoption('--all', action='store_true', default=False,
                      help='run both network and non-network tests', )
+    parser.addoption('--benchmark', action='store_true', default=False,
+                     help='also run timing benchmarks', )
     parser.addoption('--report', '--no-report', dest='report',
                      action=ToggleAction, nargs=0,
                      help='Generate a json report of the test results and '
@@ -188,10 +190,16 @@ def pytest_configure(config):
     # Skip or select network options based on options
     network_selected = config.getoption('--network')
     all_selected = config.getoption('--all')
+    markexpr = []
     if network_selected and not all_selected:
-        setattr(config.option, 'markexpr', 'network')
+        markexpr.append('network')
     elif not network_selected and not all_selected:
-        setattr(config.option, 'markexpr', 'not network')
+        markexpr.append('not network')
+    # timing benchmarks are not stable on loaded machines, skip by default
+    if not config.getoption('--benchmark') and not all_selected:
+        markexpr.append('not benchmark')
+    if markexpr:
+        setattr(config.option, 'markexpr', ' and '.join(markexpr))
 
     # Set numpy print options to try to not break doctests.
     try:
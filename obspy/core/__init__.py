@@ -116,11 +116,44 @@ supported formats.
 
 .. _NumPy: http://www.numpy.org
 """
+import importlib
+
 # don't change order
 from obspy.core.utcdatetime import UTCDateTime  # NOQA
 from obspy.core.util.attribdict import AttribDict  # NOQA
-from obspy.core.trace import Stats, Trace  # NOQA
-from obspy.core.stream import Stream, read  # NOQA
+
+
+# Imported on first access (PEP 562) to keep ``import obspy`` fast.
+_LAZY_IMPORTS = {
+    "Stats": "obspy.core.trace",
+    "Trace": "obspy.core.trace",
+    "Stream": "obspy.core.stream",
+    "read": "obspy.core.stream",
+}
+
+
+def __getattr__(name):
+    msg = "module %r has no attribute %r" % (__name__, name)
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    elif name.startswith("__"):
+        raise AttributeError(msg)
+    else:
+        # submodules (e.g. ``obspy.core.event``) can be used without
+        # importing them explicitly
+        module_name = "%s.%s" % (__name__, name)
+        try:
+            value = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+            raise AttributeError(msg) from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 
 if __name__ == '__main__':
@@ -24,7 +24,8 @@ import numpy as np
 
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import _read_from_plugin
-from obspy.core.util.base import ENTRY_POINTS, _generic_reader
+from obspy.core.util.base import (ENTRY_POINTS, _generic_reader,
+                                  _add_format_plugin_table)
 from obspy.core.util.decorator import map_example_filename, uncompress_file
 from obspy.core.util.misc import buffered_load_entry_point
 
@@ -847,6 +848,11 @@ def _create_example_catalog():
     return read_events('/path/to/neries_events.xml')
 
 
+# insert supported read/write format plugin lists dynamically in docstrings
+_add_format_plugin_table(read_events, "event", "read", numspaces=4)
+_add_format_plugin_table(Catalog.write, "event", "write", numspaces=8)
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
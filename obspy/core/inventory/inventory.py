@@ -10,25 +10,31 @@ Provides the Inventory class.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import copy
-import fnmatch
 import textwrap
 import warnings
 
+import numpy as np
+
 import obspy
 from obspy.core.util.base import (ENTRY_POINTS, ComparingObject,
-                                  _read_from_plugin, _generic_reader)
+                                  _read_from_plugin, _generic_reader,
+                                  _add_format_plugin_table)
 from obspy.core.util.decorator import map_example_filename, uncompress_file
 from obspy.core.util.misc import buffered_load_entry_point
 from obspy.core.util.obspy_types import ObsPyException, ZeroSamplingRate
 
 from .network import Network
-from .util import _unified_content_strings, _textwrap, _response_plot_label
+from .util import (_unified_content_strings, _textwrap, _response_plot_label,
+                   _code_matcher)
 
 # Make sure this is consistent with obspy.io.stationxml! Importing it
 # from there results in hard to resolve cyclic imports.
 SOFTWARE_MODULE = "ObsPy %s" % obspy.__version__
 SOFTWARE_URI = "https://www.obspy.org"
 
+# Integer representation of NaT in datetime64 arrays.
+_NAT = np.iinfo(np.int64).min
+
 
 def _create_example_inventory():
     """
@@ -536,6 +542,78 @@ class Inventory(ComparingObject):
             orientation[key] = metadata[key]
         return orientation
 
+    def get_channel_table(self):
+        """
+        Return the channels of the inventory as a columnar table.
+
+        Collects the codes, epochs, coordinates, orientation and sampling
+        rate of all channel epochs into a single NumPy structured array with
+        one row per channel epoch, e.g. for vectorized computations with
+        :func:`~obspy.geodetics.base.gps2dist_azimuth_matrix`. Networks and
+        stations without channels do not show up in the table.
+
+        Start and end times are stored as ``datetime64[ns]`` values, missing
+        times are represented as ``NaT``. Missing numerical values are
+        represented as ``NaN``.
+
+        .. rubric:: Example
+
+        >>> from obspy import read_inventory
+        >>> inv = read_inventory()
+        >>> table = inv.get_channel_table()
+        >>> print(table.dtype.names)  # doctest: +NORMALIZE_WHITESPACE
+        ('id', 'network', 'station', 'location', 'channel', 'starttime',
+         'endtime', 'latitude', 'longitude', 'elevation', 'depth', 'azimuth',
+         'dip', 'sample_rate')
+        >>> print(table["id"][:3])
+        ['GR.FUR..HHZ' 'GR.FUR..HHN' 'GR.FUR..HHE']
+        >>> print(table["latitude"][0])
+        48.162899
+
+        :rtype: :class:`numpy.ndarray`
+        :return: Structured array with fields ``id``, ``network``,
+            ``station``, ``location``, ``channel``, ``starttime``,
+            ``endtime``, ``latitude``, ``longitude``, ``elevation``,
+            ``depth``, ``azimuth``, ``dip`` and ``sample_rate``.
+        """
+        codes = []
+        times = []
+        values = []
+        for net in self.networks:
+            for sta in net.stations:
+                for cha in sta.channels:
+                    codes.append((
+                        ".".join((net.code, sta.code, cha.location_code,
+                                  cha.code)),
+                        net.code, sta.code, cha.location_code, cha.code))
+                    times.append(tuple(
+                        t.ns if t is not None else _NAT
+                        for t in (cha.start_date, cha.end_date)))
+                    values.append(tuple(
+                        x if x is not None else np.nan
+                        for x in (cha.latitude, cha.longitude, cha.elevation,
+                                  cha.depth, cha.azimuth, cha.dip,
+                                  cha.sample_rate)))
+        code_names = ("id", "network", "station", "location", "channel")
+        value_names = ("latitude", "longitude", "elevation", "depth",
+                       "azimuth", "dip", "sample_rate")
+        dtype = [(name, "U%d" % max([len(c[i]) for c in codes] + [1]))
+                 for i, name in enumerate(code_names)]
+        dtype += [("starttime", "M8[ns]"), ("endtime", "M8[ns]")]
+        dtype += [(name, np.float64) for name in value_names]
+        table = np.empty(len(codes), dtype=dtype)
+        if not codes:
+            return table
+        for i, name in enumerate(code_names):
+            table[name] = [c[i] for c in codes]
+        times = np.array(times, dtype=np.int64)
+        table["starttime"] = times[:, 0].view("M8[ns]")
+        table["endtime"] = times[:, 1].view("M8[ns]")
+        values = np.array(values, dtype=np.float64)
+        for i, name in enumerate(value_names):
+            table[name] = values[:, i]
+        return table
+
     def select(self, network=None, station=None, location=None, channel=None,
                time=None, starttime=None, endtime=None, sampling_rate=None,
                keep_empty=False, minlatitude=None, maxlatitude=None,
@@ -640,14 +718,16 @@ class Inventory(ComparingObject):
             maximum number of degrees from the geographic point defined by the
             latitude and longitude parameters.
         """
+        network_matches = network is not None and _code_matcher(network)
+        check_time = any(t is not None for t in (time, starttime, endtime))
+
         networks = []
         for net in self.networks:
             # skip if any given criterion is not matched
-            if network is not None:
-                if not fnmatch.fnmatch(net.code.upper(),
-                                       network.upper()):
+            if network_matches:
+                if not network_matches(net.code):
                     continue
-            if any([t is not None for t in (time, starttime, endtime)]):
+            if check_time:
                 if not net.is_active(time=time, starttime=starttime,
                                      endtime=endtime):
                     continue
@@ -1161,6 +1241,11 @@ class Inventory(ComparingObject):
         return fig
 
 
+# insert supported read/write format plugin lists dynamically in docstrings
+_add_format_plugin_table(read_inventory, "inventory", "read", numspaces=4)
+_add_format_plugin_table(Inventory.write, "inventory", "write", numspaces=8)
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -10,7 +10,6 @@ Provides the Network class.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import copy
-import fnmatch
 import warnings
 
 from obspy.core.util.obspy_types import ObsPyException, ZeroSamplingRate
@@ -19,7 +18,7 @@ from obspy.geodetics import inside_geobounds
 from .station import Station
 from .util import (
     BaseNode, Operator, _unified_content_strings, _textwrap,
-    _response_plot_label)
+    _response_plot_label, _code_matcher)
 
 
 class Network(BaseNode):
@@ -458,23 +457,26 @@ class Network(BaseNode):
             initially empty stations which will always be retained if they
             are matched by the other parameters.
         """
+        station_matches = station is not None and _code_matcher(station)
+        check_time = any(t is not None for t in (time, starttime, endtime))
+        geo_filters = dict(
+            minlatitude=minlatitude, maxlatitude=maxlatitude,
+            minlongitude=minlongitude, maxlongitude=maxlongitude,
+            latitude=latitude, longitude=longitude, minradius=minradius,
+            maxradius=maxradius)
+        check_geo = any(value is not None for value in geo_filters.values())
+
         stations = []
         for sta in self.stations:
             # skip if any given criterion is not matched
-            if station is not None:
-                if not fnmatch.fnmatch(sta.code.upper(),
-                                       station.upper()):
+            if station_matches:
+                if not station_matches(sta.code):
                     continue
-            if any([t is not None for t in (time, starttime, endtime)]):
+            if check_time:
                 if not sta.is_active(time=time, starttime=starttime,
                                      endtime=endtime):
                     continue
-            geo_filters = dict(
-                minlatitude=minlatitude, maxlatitude=maxlatitude,
-                minlongitude=minlongitude, maxlongitude=maxlongitude,
-                latitude=latitude, longitude=longitude, minradius=minradius,
-                maxradius=maxradius)
-            if any(value is not None for value in geo_filters.values()):
+            if check_geo:
                 if not inside_geobounds(sta, **geo_filters):
                     continue
 
@@ -839,6 +839,7 @@ class Response(ComparingObject):
         self.resource_id = resource_id
         self.instrument_sensitivity = instrument_sensitivity
         self.instrument_polynomial = instrument_polynomial
+        self._response_stages_loader = None
         if response_stages is None:
             self.response_stages = []
         elif hasattr(response_stages, "__iter__"):
@@ -847,6 +848,52 @@ class Response(ComparingObject):
             msg = "response_stages must be an iterable."
             raise ValueError(msg)
 
+    def __eq__(self, other):
+        # Lazily loaded responses have to be materialized before comparing,
+        # otherwise the stored loaders would be compared.
+        if isinstance(other, Response):
+            self._load_response_stages()
+            other._load_response_stages()
+        return super(Response, self).__eq__(other)
+
+    def __setstate__(self, state):
+        # Responses pickled before response stages could be lazily loaded
+        # store them as a plain attribute.
+        if "response_stages" in state:
+            state["_response_stages"] = state.pop("response_stages")
+        state.setdefault("_response_stages_loader", None)
+        self.__dict__.update(state)
+
+    @property
+    def response_stages(self):
+        self._load_response_stages()
+        return self._response_stages
+
+    @response_stages.setter
+    def response_stages(self, value):
+        self._response_stages_loader = None
+        self._response_stages = value
+
+    def _load_response_stages(self):
+        """
+        Materializes lazily loaded response stages, if any.
+
+        File format readers can defer parsing the (potentially large)
+        response stages by setting ``_response_stages_loader`` to a callable
+        that gets passed this response object and appends the parsed stages to
+        its (initially empty) ``response_stages`` list on first access.
+        """
+        loader = self._response_stages_loader
+        if loader is None:
+            return
+        self._response_stages_loader = None
+        self._response_stages = []
+        try:
+            loader(self)
+        except Exception:
+            self._response_stages_loader = loader
+            raise
+
     def _attempt_to_fix_units(self):
         """
         Internal helper function that will add units to gain only stages based
@@ -10,18 +10,16 @@ Provides the Station class.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import copy
-import fnmatch
 import warnings
 
-import numpy as np
-
 from obspy import UTCDateTime
 from obspy.core.util.obspy_types import (ObsPyException, ZeroSamplingRate,
                                          FloatWithUncertaintiesAndUnit)
 from obspy.geodetics import inside_geobounds
 
 from .util import (BaseNode, Equipment, Operator, Distance, Latitude,
-                   Longitude, Site, _unified_content_strings_expanded)
+                   Longitude, Site, _unified_content_strings_expanded,
+                   _code_matcher, _sampling_rate_matches)
 
 
 class Station(BaseNode):
@@ -429,16 +427,24 @@ class Station(BaseNode):
             maximum number of degrees from the geographic point defined by the
             latitude and longitude parameters.
         """
+        location_matches = location is not None and _code_matcher(location)
+        channel_matches = channel is not None and _code_matcher(channel)
+        check_time = any(t is not None for t in (time, starttime, endtime))
+        geo_filters = dict(
+            minlatitude=minlatitude, maxlatitude=maxlatitude,
+            minlongitude=minlongitude, maxlongitude=maxlongitude,
+            latitude=latitude, longitude=longitude, minradius=minradius,
+            maxradius=maxradius)
+        check_geo = any(value is not None for value in geo_filters.values())
+
         channels = []
         for cha in self.channels:
             # skip if any given criterion is not matched
-            if location is not None:
-                if not fnmatch.fnmatch(cha.location_code.upper(),
-                                       location.upper()):
+            if location_matches:
+                if not location_matches(cha.location_code):
                     continue
-            if channel is not None:
-                if not fnmatch.fnmatch(cha.code.upper(),
-                                       channel.upper()):
+            if channel_matches:
+                if not channel_matches(cha.code):
                     continue
             if sampling_rate is not None:
                 if cha.sample_rate is None:
@@ -446,19 +452,14 @@ class Station(BaseNode):
                            "specified.")
                     warnings.warn(msg)
                     continue
-                if not np.allclose(float(sampling_rate), cha.sample_rate,
-                                   rtol=1E-5, atol=1E-8):
+                if not _sampling_rate_matches(sampling_rate,
+                                              cha.sample_rate):
                     continue
-            if any([t is not None for t in (time, starttime, endtime)]):
+            if check_time:
                 if not cha.is_active(time=time, starttime=starttime,
                                      endtime=endtime):
                     continue
-            geo_filters = dict(
-                minlatitude=minlatitude, maxlatitude=maxlatitude,
-                minlongitude=minlongitude, maxlongitude=maxlongitude,
-                latitude=latitude, longitude=longitude, minradius=minradius,
-                maxradius=maxradius)
-            if any(value is not None for value in geo_filters.values()):
+            if check_geo:
                 if not inside_geobounds(cha, **geo_filters):
                     continue
 
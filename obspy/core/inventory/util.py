@@ -10,6 +10,8 @@ Utility objects.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import copy
+import fnmatch
+import functools
 import re
 import warnings
 from textwrap import TextWrapper
@@ -1040,6 +1042,37 @@ def _textwrap(text, *args, **kwargs):
     return InventoryTextWrapper(*args, **kwargs).wrap(text)
 
 
+@functools.lru_cache(maxsize=1024)
+def _code_matcher(pattern):
+    """
+    Returns a function checking if a network/station/location/channel code
+    matches a potentially wildcarded pattern.
+
+    Matching is case insensitive and follows the rules of
+    :func:`fnmatch.fnmatch`. Patterns without wildcards are compared directly
+    and all others are only compiled once, as this is called for every single
+    element when selecting from large inventories.
+
+    :type pattern: str
+    :param pattern: Potentially wildcarded code (e.g. ``"BH?"``).
+    :rtype: callable
+    """
+    pattern = pattern.upper()
+    if not any(char in pattern for char in "*?["):
+        return lambda code: code.upper() == pattern
+    regex = re.compile(fnmatch.translate(pattern))
+    return lambda code: regex.match(code.upper()) is not None
+
+
+def _sampling_rate_matches(sampling_rate, sample_rate):
+    """
+    Same as ``np.allclose(sampling_rate, sample_rate, rtol=1E-5, atol=1E-8)``
+    for scalars, but a lot faster.
+    """
+    return abs(float(sampling_rate) - sample_rate) <= \
+        1E-8 + 1E-5 * abs(sample_rate)
+
+
 def _seed_id_keyfunction(x):
     """
     Keyfunction to use in sorting two (partial) SEED IDs
@@ -25,7 +25,8 @@ from obspy.core.trace import Trace
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util.attribdict import AttribDict
 from obspy.core.util.base import (ENTRY_POINTS, _get_function_from_entry_point,
-                                  _read_from_plugin, _generic_reader)
+                                  _read_from_plugin, _generic_reader,
+                                  _add_format_plugin_table)
 from obspy.core.util.decorator import (map_example_filename,
                                        raise_if_masked, uncompress_file)
 from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
@@ -3744,6 +3745,11 @@ def _write_pickle(stream, filename, protocol=2, **kwargs):  # @UnusedVariable
         pickle.dump(stream, filename, protocol=protocol)
 
 
+# insert supported read/write format plugin lists dynamically in docstrings
+_add_format_plugin_table(read, "waveform", "read", numspaces=4)
+_add_format_plugin_table(Stream.write, "waveform", "write", numspaces=8)
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Tests that importing ObsPy stays lightweight.
+
+All imports are done in fresh interpreters, since the test session itself
+has long imported everything.
+"""
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+def _run(code):
+    """
+    Run code in a new interpreter and return what it prints as JSON.
+    """
+    out = subprocess.run([sys.executable, "-c", code], check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def _imported_modules(statement):
+    """
+    Names of all modules imported by the given import statement.
+    """
+    return set(_run("import json, sys\n%s\nprint(json.dumps(list("
+                    "sys.modules)))" % statement))
+
+
+def _import_times():
+    """
+    Cumulative import times in microseconds of numpy and of obspy (without
+    numpy) as reported by ``python -X importtime``.
+    """
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                          "import obspy"], check=True, capture_output=True,
+                         text=True).stderr
+    times = {}
+    for line in err.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() in ("numpy", "obspy") and \
+                name.strip() not in times:
+            times[name.strip()] = int(cumulative)
+    return times["numpy"], times["obspy"] - times["numpy"]
+
+
+class TestImport:
+    """
+    Test suite for the import time of obspy
+    """
+    def test_import_obspy_is_lazy(self):
+        """
+        ``import obspy`` only imports the modules needed for UTCDateTime.
+        """
+        modules = _imported_modules("import obspy")
+        for name in ("obspy.core.stream", "obspy.core.event",
+                     "obspy.core.inventory", "obspy.imaging", "obspy.io",
+                     "obspy.signal", "matplotlib", "scipy"):
+            assert name not in modules
+        # event and inventory modules do not need matplotlib either
+        modules = _imported_modules(
+            "from obspy import read, read_events, read_inventory")
+        for name in ("obspy.imaging", "matplotlib", "scipy"):
+            assert name not in modules
+
+    def test_lazy_attributes(self):
+        """
+        Lazily imported names and submodules are the real objects.
+        """
+        result = _run(
+            "import json\n"
+            "import obspy\n"
+            "from obspy.core.stream import read\n"
+            "from obspy.core.event import Catalog\n"
+            "from obspy.core.trace import Stats\n"
+            "import obspy.core.inventory.inventory as inv\n"
+            "from obspy import *\n"
+            "print(json.dumps([obspy.read is read, obspy.Catalog is Catalog,"
+            " obspy.core.Stats is Stats, obspy.Inventory is inv.Inventory,"
+            " obspy.core.event.Catalog is Catalog,"
+            " 'Catalog' in dir(obspy), 'read' in dir(obspy.core),"
+            " hasattr(obspy, 'no_such_thing'),"
+            " 'MSEED' in read.__doc__, 'QUAKEML' in Catalog.write.__doc__,"
+            " 'STATIONXML' in obspy.read_inventory.__doc__]))")
+        assert result == [True] * 7 + [False] + [True] * 3
+
+    def test_import_obspy_signal_is_lazy(self):
+        """
+        Processing modules in obspy.signal do not import matplotlib or
+        scipy.signal just by being imported.
+        """
+        modules = _imported_modules(
+            "import obspy.signal.trigger, obspy.signal.cross_correlation, "
+            "obspy.signal.invsim, obspy.signal.spectral_estimation")
+        for name in ("matplotlib", "scipy.signal", "obspy.imaging",
+                     "obspy.io.xseed"):
+            assert name not in modules
+        modules = _imported_modules("from obspy.signal import PPSD")
+        assert "obspy.signal.spectral_estimation" in modules
+
+    @pytest.mark.benchmark
+    def test_import_time(self):
+        """
+        Benchmark guarding against regressions of the import time, only run
+        with ``--benchmark`` as timings are not stable on loaded machines.
+
+        Importing obspy on top of numpy takes about as long as importing
+        numpy itself. Compare to numpy to be independent of the machine, use
+        the best of a few runs to be robust against noise.
+        """
+        ratios = []
+        for _ in range(3):
+            numpy_time, obspy_time = _import_times()
+            ratios.append(obspy_time / numpy_time)
+        assert min(ratios) < 2.0
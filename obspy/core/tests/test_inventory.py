@@ -9,6 +9,7 @@ Test suite for the inventory class.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import copy
+import fnmatch
 import io
 import os
 import re
@@ -16,6 +17,7 @@ import warnings
 from pathlib import Path
 from unittest import mock
 
+import numpy as np
 import pytest
 
 import obspy
@@ -490,6 +492,69 @@ class TestInventory:
         # exist.
         assert len(inv.select(network="RR")) == 0
 
+    def test_inventory_select_code_matching(self):
+        """
+        Tests that matching codes in Inventory.select() follows the rules of
+        fnmatch and is case insensitive, for exact and wildcarded codes.
+        """
+        inv = read_inventory()
+        codes = [(net.code, sta.code, cha.location_code, cha.code)
+                 for net in inv for sta in net for cha in sta]
+        patterns = ["*", "", "bw", "BW", "G?", "[BG]*", "[!B]*", "R*B",
+                    "*Z", "?H?", "EH[ZN]", "BHZ", "B"]
+        for pattern in patterns:
+            for i, key in enumerate(("network", "station", "location",
+                                     "channel")):
+                got = inv.select(**{key: pattern})
+                got = [(net.code, sta.code, cha.location_code, cha.code)
+                       for net in got for sta in net for cha in sta]
+                expected = [code for code in codes if fnmatch.fnmatch(
+                    code[i].upper(), pattern.upper())]
+                assert got == expected
+        # selected channels are not copied
+        cha = inv[0][0][0]
+        selected = inv.select(channel=cha.code)[0][0].channels
+        assert any(cha_ is cha for cha_ in selected)
+
+    def test_get_channel_table(self):
+        """
+        Tests the columnar channel table of an inventory against the
+        channel objects.
+        """
+        inv = read_inventory()
+        # add a channel with some missing values
+        cha = copy.deepcopy(inv[0][0][0])
+        cha.end_date = UTCDateTime(2020, 1, 1, 0, 0, 0, 123456)
+        cha.azimuth = None
+        cha.sample_rate = None
+        inv[0][0].channels.append(cha)
+        table = inv.get_channel_table()
+        channels = [(net, sta, cha) for net in inv for sta in net
+                    for cha in sta]
+        assert len(table) == len(channels)
+        for row, (net, sta, cha) in zip(table, channels):
+            assert row["id"] == "%s.%s.%s.%s" % (
+                net.code, sta.code, cha.location_code, cha.code)
+            assert row["network"] == net.code
+            assert row["station"] == sta.code
+            assert row["location"] == cha.location_code
+            assert row["channel"] == cha.code
+            assert UTCDateTime(str(row["starttime"])) == cha.start_date
+            if cha.end_date is None:
+                assert np.isnat(row["endtime"])
+            else:
+                assert UTCDateTime(str(row["endtime"])) == cha.end_date
+            for key in ("latitude", "longitude", "elevation", "depth",
+                        "azimuth", "dip", "sample_rate"):
+                if getattr(cha, key) is None:
+                    assert np.isnan(row[key])
+                else:
+                    assert row[key] == getattr(cha, key)
+        # empty inventory
+        table = Inventory(networks=[]).get_channel_table()
+        assert len(table) == 0
+        assert table.dtype.names == inv.get_channel_table().dtype.names
+
     def test_util_unified_content_string(self):
         """
         Tests helper routine that compresses inventory content lists.
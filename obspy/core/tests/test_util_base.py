@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
 import os
 import copy
+import sys
 from unittest import mock
 
 import numpy as np
 import pytest
 from requests import HTTPError
 
+from obspy.core.util import base
 from obspy.core.util.base import (NamedTemporaryFile, get_dependency_version,
                                   download_to_file, sanitize_filename,
-                                  create_empty_data_chunk, ComparingObject)
+                                  create_empty_data_chunk, ComparingObject,
+                                  ENTRY_POINTS, _get_all_entry_points)
+from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
 
 
 class TestUtilBase:
@@ -113,3 +117,124 @@ class TestUtilBase:
         assert co == deep_copy
         deep_copy.at = 0
         assert co != deep_copy
+
+    def test_entry_point_registry(self, tmp_path, monkeypatch):
+        """
+        Entry points are stored in a registry in the cache directory, which
+        is rebuilt when the installed packages change.
+        """
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        expected = _get_all_entry_points()
+        _get_all_entry_points.cache_clear()
+        try:
+            # first call scans the installed packages and sets up registry
+            eps = _get_all_entry_points()
+            assert eps == expected
+            filename = base._get_entry_point_registry_filename()
+            assert filename.startswith(str(tmp_path))
+            assert os.path.exists(filename)
+            # second call only reads the registry
+            _get_all_entry_points.cache_clear()
+            with mock.patch.object(base, "_scan_entry_points") as p:
+                assert _get_all_entry_points() == expected
+            assert p.call_count == 0
+            # changed packages invalidate the registry
+            _get_all_entry_points.cache_clear()
+            fingerprint = base._get_installation_fingerprint()
+            with mock.patch.object(base, "_get_installation_fingerprint",
+                                   return_value=fingerprint + ["changed"]):
+                with mock.patch.object(base, "_scan_entry_points",
+                                       return_value=[]) as p:
+                    assert _get_all_entry_points() == []
+            assert p.call_count == 1
+            # broken registry files and unwritable cache directories are ok
+            _get_all_entry_points.cache_clear()
+            with open(filename, "w") as fh:
+                fh.write("{")
+            assert _get_all_entry_points() == expected
+            _get_all_entry_points.cache_clear()
+            monkeypatch.setenv("XDG_CACHE_HOME",
+                               os.path.join(filename, "not_a_directory"))
+            assert _get_all_entry_points() == expected
+        finally:
+            _get_all_entry_points.cache_clear()
+
+    def test_entry_point_registry_rewritten_entry_points(
+            self, tmp_path, monkeypatch):
+        """
+        Rewriting entry_points.txt in place, like ``setup.py develop`` does,
+        invalidates the registry. The registry can be disabled.
+        """
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setenv("XDG_CACHE_HOME", str(cache_dir))
+        egg_info = tmp_path / "site" / "fakeplug.egg-info"
+        egg_info.mkdir(parents=True)
+        (egg_info / "PKG-INFO").write_text(
+            "Metadata-Version: 2.1\nName: fakeplug\nVersion: 1.0\n")
+        entry_points = egg_info / "entry_points.txt"
+        entry_points.write_text(
+            "[obspy.plugin.detrend]\nfoo = fakeplug:foo\n")
+        monkeypatch.syspath_prepend(str(tmp_path / "site"))
+
+        def _detrend_plugins():
+            _get_all_entry_points.cache_clear()
+            base._get_entry_points.cache_clear()
+            return sorted(name for name in base._get_entry_points(
+                "obspy.plugin.detrend") if name in ("foo", "bar"))
+
+        try:
+            assert _detrend_plugins() == ["foo"]
+            mtime = os.stat(egg_info).st_mtime_ns
+            entry_points.write_text(
+                "[obspy.plugin.detrend]\nfoo = fakeplug:foo\n"
+                "bar = fakeplug:bar\n")
+            assert os.stat(egg_info).st_mtime_ns == mtime
+            assert _detrend_plugins() == ["bar", "foo"]
+            # without registry no file is written
+            monkeypatch.setenv("OBSPY_NO_ENTRY_POINT_REGISTRY", "1")
+            monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache2"))
+            entry_points.write_text(
+                "[obspy.plugin.detrend]\nbar = fakeplug:bar\n")
+            assert _detrend_plugins() == ["bar"]
+            assert not (tmp_path / "cache2").exists()
+        finally:
+            _get_all_entry_points.cache_clear()
+            base._get_entry_points.cache_clear()
+
+    def test_installation_fingerprint_ignores_plain_directories(
+            self, tmp_path, monkeypatch):
+        """
+        Directories on sys.path without package metadata, like the script
+        directory, do not change the fingerprint.
+        """
+        fingerprint = base._get_installation_fingerprint()
+        monkeypatch.syspath_prepend(str(tmp_path))
+        assert base._get_installation_fingerprint() == fingerprint
+        (tmp_path / "fakeplug.dist-info").mkdir()
+        assert base._get_installation_fingerprint() != fingerprint
+
+    def test_get_entry_point_dist_name_deprecated(self):
+        ep = ENTRY_POINTS["waveform"]["MSEED"]
+        with pytest.warns(ObsPyDeprecationWarning):
+            assert base.get_entry_point_dist_name(ep) == "obspy"
+
+    def test_entry_points(self):
+        """
+        Entry points from the registry can be loaded and the dictionary of
+        entry points is filled on access.
+        """
+        ep = ENTRY_POINTS["waveform_write"]["MSEED"]
+        assert ep.dist.name == "obspy"
+        assert ep.module == "obspy.io.mseed.core"
+        assert ep.attr is None
+        assert ep.load() is sys.modules["obspy.io.mseed.core"]
+        write_ep = [_ep for _ep in _get_all_entry_points()
+                    if _ep.group == "obspy.plugin.waveform.MSEED" and
+                    _ep.name == "writeFormat"][0]
+        assert write_ep.attr == "_write_mseed"
+        from obspy.io.mseed.core import _write_mseed
+        assert write_ep.load() is _write_mseed
+        assert "waveform" in ENTRY_POINTS
+        assert len(ENTRY_POINTS) == len(list(ENTRY_POINTS))
+        with pytest.raises(KeyError):
+            ENTRY_POINTS["no_such_plugin_type"]
@@ -10,7 +10,8 @@ from obspy import UTCDateTime, read
 from obspy.core.event import ResourceIdentifier as ResId
 from obspy.core.util.misc import CatchOutput, get_window_times, \
     _ENTRY_POINT_CACHE, _yield_obj_parent_attr
-from obspy.core.util.base import CatchAndAssertWarnings
+from obspy.core.util.base import (CatchAndAssertWarnings, _EntryPoint,
+                                  _get_all_entry_points)
 
 
 class TestUtilMisc:
@@ -255,25 +256,24 @@ class TestUtilMisc:
         """
         Ensure the entry point buffer caches results from load_entry_point
         """
+        # make sure the registry of installed plug-ins is set up
+        _get_all_entry_points()
         with mock.patch.dict(_ENTRY_POINT_CACHE, clear=True):
-            with mock.patch('importlib.metadata.entry_points') as p:
-                class _Distribution(object):
-                    name = 'obspy'
-
-                class _EntryPoint(mock.MagicMock):
-                    dist = _Distribution()
-
-                p.return_value = [_EntryPoint()]
+            with mock.patch('importlib.metadata.entry_points') as p, \
+                    mock.patch.object(_EntryPoint, 'load') as load:
                 # raises UserWarning: No matching response information found.
                 with warnings.catch_warnings(record=True):
                     warnings.simplefilter('ignore', UserWarning)
                     st = read()
                     st.write('temp.mseed', 'mseed')
-            assert len(_ENTRY_POINT_CACHE) == 3
-            if sys.version_info.minor >= 10:
-                # Skipping for py 3.8 and 3.9, it fails but it's not really
-                # a problem.
-                assert p.call_count == 3
+                    assert len(_ENTRY_POINT_CACHE) == 3
+                    assert load.call_count == 3
+                    st.write('temp.mseed', 'mseed')
+                # plug-ins are loaded only once and are looked up in the
+                # registry without scanning the installed packages again
+                assert len(_ENTRY_POINT_CACHE) == 3
+                assert load.call_count == 3
+                assert p.call_count == 0
 
     def test_yield_obj_parent_attr(self):
         """
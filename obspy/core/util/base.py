@@ -14,6 +14,7 @@ import importlib
 import importlib.metadata
 import inspect
 import io
+import json
 import os
 from contextlib import contextmanager
 from io import IOBase, TextIOBase, TextIOWrapper
@@ -24,11 +25,12 @@ import tempfile
 import unicodedata
 import warnings
 from collections import OrderedDict
+from collections.abc import Mapping
 from pathlib import PurePath
+from types import SimpleNamespace
 
 import numpy as np
 
-from obspy.core.util.attribdict import (AttribDict)
 from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
 from obspy.core.util.misc import to_int_or_zero, buffered_load_entry_point
 
@@ -230,10 +232,16 @@ def get_entry_point_dist_name(entry_point):
     Gets the distribution name from an entry point regardless of whether
     it comes from pkg_resources or importlib.metadata.
 
+    Deprecated, entry points returned by ObsPy provide the distribution
+    name as ``entry_point.dist.name`` on all Python versions.
+
     :param entry_point: An EntryPoint object from pkg_resources
      or importlib.metadata
     :return: The distribution name as a string
     """
+    msg = ("get_entry_point_dist_name() is deprecated and will be removed in "
+           "a future release. Use entry_point.dist.name instead.")
+    warnings.warn(msg, ObsPyDeprecationWarning, stacklevel=2)
     # Check for pkg_resources style EntryPoint
     if hasattr(entry_point, 'dist') and hasattr(entry_point.dist, 'name'):
         return entry_point.dist.name
@@ -264,20 +272,208 @@ def get_entry_point_dist_name(entry_point):
     return entry_point.value.split('.')[0]
 
 
+# Version of the layout of the entry point registry file, increase on changes
+_ENTRY_POINT_REGISTRY_VERSION = 1
+
+
+class _EntryPoint(object):
+    """
+    Entry point of an ObsPy plug-in as stored in the entry point registry.
+
+    Provides the parts of :class:`importlib.metadata.EntryPoint` used in
+    ObsPy, with the distribution name available as ``ep.dist.name`` on all
+    Python versions.
+    """
+    __slots__ = ("name", "value", "group", "dist")
+
+    def __init__(self, name, value, group, dist):
+        self.name = name
+        self.value = value
+        self.group = group
+        self.dist = SimpleNamespace(name=dist)
+
+    def __repr__(self):
+        return "EntryPoint(name=%r, value=%r, group=%r)" % (
+            self.name, self.value, self.group)
+
+    def __eq__(self, other):
+        if not isinstance(other, _EntryPoint):
+            return NotImplemented
+        return (self.name, self.value, self.group, self.dist.name) == \
+            (other.name, other.value, other.group, other.dist.name)
+
+    def __hash__(self):
+        return hash((self.name, self.value, self.group, self.dist.name))
+
+    @property
+    def module(self):
+        return self.value.split(":")[0].strip()
+
+    @property
+    def attr(self):
+        _, _, attr = self.value.partition(":")
+        return attr.strip() or None
+
+    def load(self):
+        """
+        Import the module of the entry point and return the named object.
+        """
+        obj = importlib.import_module(self.module)
+        for name in (self.attr or "").split("."):
+            if name:
+                obj = getattr(obj, name)
+        return obj
+
+
+def _get_entry_point_registry_filename():
+    """
+    Returns the path of the entry point registry in the user's cache
+    directory, separate for each Python version.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or \
+        os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "obspy", "entry_points-py%d.%d.json" %
+                        sys.version_info[:2])
+
+
+def _get_installation_fingerprint():
+    """
+    Fingerprint of the installed python packages.
+
+    Lists the package metadata directories in all :data:`sys.path` entries
+    together with their modification times and the size and modification
+    time of their ``entry_points.txt``. Installing, updating or removing a
+    package adds, renames or recreates its metadata directory, while
+    ``setup.py develop`` and editable installs rewrite ``entry_points.txt``
+    in place. So this changes whenever the installed entry points could
+    have changed, without having to read any package metadata. Directories
+    without package metadata (e.g. the directory of the running script or
+    the current working directory) are left out, so that scripts run from
+    different directories share the same registry.
+    """
+    fingerprint = [_ENTRY_POINT_REGISTRY_VERSION, sys.version]
+    for path in sys.path:
+        path = os.path.abspath(path or os.curdir)
+        try:
+            if not os.path.isdir(path):
+                fingerprint.append([path, os.stat(path).st_mtime_ns])
+                continue
+            metadata = [[entry.name, entry.stat().st_mtime_ns,
+                         _get_file_fingerprint(
+                             os.path.join(entry.path, "entry_points.txt"))]
+                        for entry in os.scandir(path)
+                        if entry.name.endswith((".dist-info", ".egg-info",
+                                                ".egg-link"))]
+        except OSError:
+            continue
+        if metadata:
+            fingerprint.append([path, sorted(metadata)])
+    return fingerprint
+
+
+def _get_file_fingerprint(filename):
+    """
+    Size and modification time of a file, None if it does not exist.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _scan_entry_points():
+    """
+    Scans all installed python packages for ObsPy plug-ins.
+
+    Like :func:`importlib.metadata.entry_points`, only the first
+    distribution found for each package name is considered.
+
+    :returns: List of ``[name, value, group, distribution name]`` of all
+        entry points in ``obspy.plugin`` groups.
+    """
+    if sys.version_info >= (3, 10):
+        # Python 3.10 and 3.11 return a dictionary of groups which warns on
+        # dictionary access, select() works on all versions
+        eps = importlib.metadata.entry_points()
+        eps = [ep for group in sorted(eps.groups)
+               if group.startswith("obspy.plugin")
+               for ep in eps.select(group=group)]
+        entries = []
+        dist_names = {}
+        for ep in eps:
+            if not ep.group.startswith("obspy.plugin"):
+                continue
+            # reading the name parses the package metadata, do it only once
+            if ep.dist not in dist_names:
+                dist_names[ep.dist] = ep.dist.name
+            entries.append([ep.name, ep.value, ep.group, dist_names[ep.dist]])
+        return entries
+    # Python 3.8 and 3.9: entry points do not know their distribution
+    entries = []
+    seen = set()
+    for dist in importlib.metadata.distributions():
+        dist_name = dist.metadata["Name"]
+        if dist_name is None:
+            continue
+        normalized_name = re.sub(r"[-_.]+", "-", dist_name).lower()
+        if normalized_name in seen:
+            continue
+        seen.add(normalized_name)
+        for ep in dist.entry_points:
+            if ep.group.startswith("obspy.plugin"):
+                entries.append([ep.name, ep.value, ep.group, dist_name])
+    return entries
+
+
+def _write_entry_point_registry(filename, fingerprint, entries):
+    """
+    Writes the entry point registry, silently giving up if the cache
+    directory is not writable.
+    """
+    directory = os.path.dirname(filename)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # write to a temporary file first, other processes might be reading
+        with tempfile.NamedTemporaryFile(
+                "w", dir=directory, suffix=".tmp", delete=False) as fh:
+            json.dump({"fingerprint": fingerprint, "entry_points": entries},
+                      fh)
+        os.replace(fh.name, filename)
+    except OSError:
+        pass
+
+
 @functools.lru_cache(maxsize=None)
 def _get_all_entry_points():
     """
-    Get all entry points, using a cache to avoid repeated expensive
-    scans of all installed python packages.
-
-    Returns a flat list of all EntryPoint objects.
+    Get all entry points of ObsPy plug-ins.
+
+    Scanning all installed python packages for entry points gets slow with
+    many packages installed, so the result is stored in a registry in the
+    user's cache directory. The registry is used as long as the installed
+    packages did not change, see :func:`_get_installation_fingerprint`,
+    and is rebuilt otherwise. Setting the environment variable
+    ``OBSPY_NO_ENTRY_POINT_REGISTRY`` to a non-empty value disables the
+    registry, the installed packages are then scanned every time without
+    reading or writing any file.
+
+    Returns a flat list of all entry points in ``obspy.plugin`` groups.
     """
-    eps = importlib.metadata.entry_points()
-    if not isinstance(eps, dict):
-        # Python 3.10+: convert to list
-        return list(eps)
-    # Python 3.8/3.9: flatten the dict values to a list
-    return [ep for group_eps in eps.values() for ep in group_eps]
+    if os.environ.get("OBSPY_NO_ENTRY_POINT_REGISTRY"):
+        return [_EntryPoint(*entry) for entry in _scan_entry_points()]
+    filename = _get_entry_point_registry_filename()
+    fingerprint = _get_installation_fingerprint()
+    try:
+        with open(filename, "r") as fh:
+            registry = json.load(fh)
+        if registry["fingerprint"] != fingerprint:
+            raise ValueError("Outdated entry point registry")
+        entries = registry["entry_points"]
+    except (OSError, ValueError, KeyError, TypeError):
+        entries = _scan_entry_points()
+        _write_entry_point_registry(filename, fingerprint, entries)
+    return [_EntryPoint(*entry) for entry in entries]
 
 
 @functools.lru_cache(maxsize=None)
@@ -299,80 +495,16 @@ def _get_entry_points(group, subgroup=None):
     {...'SLIST': EntryPoint(name='SLIST', value='obspy.io.ascii.core',
                             group='obspy.plugin.waveform')...}
     """
-    if sys.version_info.minor < 10:
-        # compatibility workaround for Python 3.8 and 3.9
-        eps_all = _get_all_entry_points()
-
-        # Build a dict grouped by group name for Python 3.8/3.9 compatibility
-        eps_by_group = {}
-        for ep in eps_all:
-            if ep.group not in eps_by_group:
-                eps_by_group[ep.group] = []
-            eps_by_group[ep.group].append(ep)
-
-        eps = eps_by_group.get(group, [])
-
-        if subgroup:
-            features = {}
-            for ep in eps:
-                # workaround to get the dist dict populated here
-                if hasattr(ep, "dist"):
-                    if not hasattr(ep.dist, "name"):
-                        ep.dist.name = get_entry_point_dist_name(ep)
-                else:
-                    ep.dist = AttribDict({"name":
-                                          get_entry_point_dist_name(ep)})
-                subgroup_eps = eps_by_group.get(f'{group}.{ep.name}', [])
-                for sub_ep in subgroup_eps:
-                    if sub_ep.name == subgroup:
-                        features[ep.name] = ep
-                        break
-        else:
-            features = {}
-            for ep in eps:
-                # workaround to get the dist dict populated here
-                if hasattr(ep, "dist"):
-                    if not hasattr(ep.dist, "name"):
-                        ep.dist.name = get_entry_point_dist_name(ep)
-                else:
-                    ep.dist = AttribDict({"name":
-                                          get_entry_point_dist_name(ep)})
-                features[ep.name] = ep
-    else:
-        # Efficient implementation: get all entry points once and filter in
-        # memory instead of making multiple .select() calls which scan all
-        # distributions and is very slow in Python 3.10+
-        eps_all = _get_all_entry_points()
-
-        # Filter to entries for the target group
-        eps_for_group = [ep for ep in eps_all if ep.group == group]
-
-        if subgroup:
-            # Build a map of parent plugins in each subgroup
-            # subgroups[parent_name] = [subgroup entries for that parent]
-            subgroups = {}
-            for ep in eps_all:
-                # Check if this is a subgroup entry for our target group
-                if ep.group.startswith(f'{group}.'):
-                    parent_name = ep.group[len(group)+1:]  # e.g. "MSEED"
-                    if parent_name not in subgroups:
-                        subgroups[parent_name] = []
-                    subgroups[parent_name].append(ep)
-
-            # Only include parent plugins that have the matching subgroup
-            features = {}
-            for ep in eps_for_group:
-                if (
-                    ep.name in subgroups
-                    and any(
-                        sub_ep.name == subgroup
-                        for sub_ep in subgroups[ep.name]
-                    )
-                ):
-                    features[ep.name] = ep
-        else:
-            features = {ep.name: ep for ep in eps_for_group}
-    return features
+    eps_all = _get_all_entry_points()
+    eps_for_group = [ep for ep in eps_all if ep.group == group]
+    if not subgroup:
+        return {ep.name: ep for ep in eps_for_group}
+    # only include plug-ins which have an entry point of the given name in
+    # their own subgroup, e.g. "readFormat" in "obspy.plugin.waveform.MSEED"
+    with_subgroup = set(ep.group[len(group) + 1:] for ep in eps_all
+                        if ep.name == subgroup and
+                        ep.group.startswith(group + "."))
+    return {ep.name: ep for ep in eps_for_group if ep.name in with_subgroup}
 
 
 def _get_ordered_entry_points(group, subgroup=None, order_list=[]):
@@ -395,27 +527,60 @@ def _get_ordered_entry_points(group, subgroup=None, order_list=[]):
     return entry_points
 
 
-ENTRY_POINTS = {
-    'trigger': _get_entry_points('obspy.plugin.trigger'),
-    'filter': _get_entry_points('obspy.plugin.filter'),
-    'rotate': _get_entry_points('obspy.plugin.rotate'),
-    'detrend': _get_entry_points('obspy.plugin.detrend'),
-    'interpolate': _get_entry_points('obspy.plugin.interpolate'),
-    'integrate': _get_entry_points('obspy.plugin.integrate'),
-    'differentiate': _get_entry_points('obspy.plugin.differentiate'),
-    'waveform': _get_ordered_entry_points(
-        'obspy.plugin.waveform', 'readFormat', WAVEFORM_PREFERRED_ORDER),
-    'waveform_write': _get_ordered_entry_points(
-        'obspy.plugin.waveform', 'writeFormat', WAVEFORM_PREFERRED_ORDER),
-    'event': _get_ordered_entry_points('obspy.plugin.event', 'readFormat',
-                                       EVENT_PREFERRED_ORDER),
-    'event_write': _get_entry_points('obspy.plugin.event', 'writeFormat'),
-    'taper': _get_entry_points('obspy.plugin.taper'),
-    'inventory': _get_ordered_entry_points(
-        'obspy.plugin.inventory', 'readFormat', INVENTORY_PREFERRED_ORDER),
-    'inventory_write': _get_entry_points(
-        'obspy.plugin.inventory', 'writeFormat'),
-}
+class _LazyEntryPoints(Mapping):
+    """
+    Read-only dictionary of plug-in entry points, which looks up the entry
+    points of each plug-in type only when first accessed.
+    """
+    def __init__(self, lookups):
+        self._lookups = lookups
+        self._entry_points = {}
+
+    def __getitem__(self, key):
+        if key not in self._entry_points:
+            self._entry_points[key] = self._lookups[key]()
+        return self._entry_points[key]
+
+    def __iter__(self):
+        return iter(self._lookups)
+
+    def __len__(self):
+        return len(self._lookups)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+ENTRY_POINTS = _LazyEntryPoints({
+    'trigger': functools.partial(
+        _get_entry_points, 'obspy.plugin.trigger'),
+    'filter': functools.partial(_get_entry_points, 'obspy.plugin.filter'),
+    'rotate': functools.partial(_get_entry_points, 'obspy.plugin.rotate'),
+    'detrend': functools.partial(_get_entry_points, 'obspy.plugin.detrend'),
+    'interpolate': functools.partial(
+        _get_entry_points, 'obspy.plugin.interpolate'),
+    'integrate': functools.partial(
+        _get_entry_points, 'obspy.plugin.integrate'),
+    'differentiate': functools.partial(
+        _get_entry_points, 'obspy.plugin.differentiate'),
+    'waveform': functools.partial(
+        _get_ordered_entry_points, 'obspy.plugin.waveform', 'readFormat',
+        WAVEFORM_PREFERRED_ORDER),
+    'waveform_write': functools.partial(
+        _get_ordered_entry_points, 'obspy.plugin.waveform', 'writeFormat',
+        WAVEFORM_PREFERRED_ORDER),
+    'event': functools.partial(
+        _get_ordered_entry_points, 'obspy.plugin.event', 'readFormat',
+        EVENT_PREFERRED_ORDER),
+    'event_write': functools.partial(
+        _get_entry_points, 'obspy.plugin.event', 'writeFormat'),
+    'taper': functools.partial(_get_entry_points, 'obspy.plugin.taper'),
+    'inventory': functools.partial(
+        _get_ordered_entry_points, 'obspy.plugin.inventory', 'readFormat',
+        INVENTORY_PREFERRED_ORDER),
+    'inventory_write': functools.partial(
+        _get_entry_points, 'obspy.plugin.inventory', 'writeFormat'),
+})
 
 
 def _get_function_from_entry_point(group, type):
@@ -618,34 +783,16 @@ def make_format_plugin_table(group="waveform", method="read", numspaces=4,
     eps = _get_ordered_entry_points("obspy.plugin.%s" % group, method,
                                     WAVEFORM_PREFERRED_ORDER)
 
-    # Get all entry points once using module-level cache
     all_eps = _get_all_entry_points()
 
     mod_list = []
     for name, ep in eps.items():
-        if sys.version_info.minor < 10:
-            # compatibility workaround for Python 3.8 and 3.9
-            module_short = ":mod:`%s`" % ".".join(ep.value.split(".")[:3])
-            # Filter from cached list
-            func_str = [
-                _ep
-                for _ep in all_eps
-                if _ep.group == f'{ep.group}.{ep.name}' and _ep.name == method
-            ][0].value
-        else:
-            module_short = ":mod:`%s`" % ".".join(ep.module.split(".")[:3])
-            # Filter the pre-fetched all_eps instead of
-            # calling entry_points() again
-            matching_eps = [
-                _ep
-                for _ep in all_eps
-                if _ep.group == f'{ep.group}.{ep.name}' and _ep.name == method
-            ]
-            if matching_eps:
-                func_str = matching_eps[0].value
-            else:
-                # Fallback (shouldn't happen in normal operation)
-                func_str = ep.value
+        module_short = ":mod:`%s`" % ".".join(ep.module.split(".")[:3])
+        func_str = [
+            _ep.value
+            for _ep in all_eps
+            if _ep.group == f'{ep.group}.{ep.name}' and _ep.name == method
+        ][0]
         func_str = func_str.replace(':', '.')
         func_str = f':func:`{func_str}`'
         mod_list.append((name, module_short, func_str))
@@ -9,7 +9,6 @@ Various additional utilities for ObsPy.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import contextlib
-import importlib.metadata
 import inspect
 import io
 import itertools
@@ -600,29 +599,12 @@ def buffered_load_entry_point(dist, group, name):
     """
     hash_str = '/'.join([dist, group, name])
     if hash_str not in _ENTRY_POINT_CACHE:
-        if sys.version_info.minor < 10:
-            # compatibility workaround for Python 3.8 and 3.9
-            # on these versions, entry points don't have their distribution
-            # information attached to them, so we have to check if any matching
-            # entry point we find is listed in that distribution's entry point
-            # list
-            dist_eps = (importlib.metadata.distribution(group.split(".")[0])
-                        .entry_points)
-
-            eps = list(
-                ep for ep in
-                dist_eps if f'{group}:{name}' == f"{ep.group}:{ep.name}"
-            )
-            if not len(eps):
-                eps = list(
-                    ep for ep in
-                    dist_eps if f'{group}.{name}' == f"{ep.group}:{ep.name}"
-                )
-        else:
-            eps = list(
-                ep for ep in importlib.metadata.entry_points(
-                    group=group, name=name)
-                if ep.dist.name == dist)
+        # look up the entry point in the registry of installed plug-ins
+        # instead of scanning all installed packages again
+        from obspy.core.util.base import _get_all_entry_points
+        eps = [ep for ep in _get_all_entry_points()
+               if ep.group == group and ep.name == name and
+               ep.dist.name == dist]
         if len(set(eps)) > 1:
             warnings.warn(f'Multiple entry points matching:\n{eps!s}')
         elif not len(eps):
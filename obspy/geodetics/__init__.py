@@ -9,9 +9,11 @@ obspy.geodetics - Various geodetic utilities for ObsPy
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
-from .base import (calc_vincenty_inverse, degrees2kilometers,
-                   gps2dist_azimuth, inside_geobounds,
-                   kilometer2degrees, kilometers2degrees, locations2degrees)
+from .base import (calc_vincenty_direct, calc_vincenty_inverse,
+                   degrees2kilometers, gps2dist_azimuth,
+                   gps2dist_azimuth_array, gps2dist_azimuth_matrix,
+                   inside_geobounds, kilometer2degrees, kilometers2degrees,
+                   locations2degrees)
 from .flinnengdahl import FlinnEngdahl
 
 
@@ -271,6 +271,339 @@ def gps2dist_azimuth(lat1, lon1, lat2, lon2, a=WGS84_A, f=WGS84_F):
             raise e
 
 
+def _calc_vincenty_inverse_array(lat1, lon1, lat2, lon2, a=WGS84_A,
+                                 f=WGS84_F, iterlimit=100):
+    """
+    Vectorized version of :func:`calc_vincenty_inverse`.
+
+    All coordinates are broadcast against each other.
+
+    :returns: Arrays of distances in m, azimuths A->B in degrees, azimuths
+        B->A in degrees and a boolean array that is ``False`` where the
+        iteration did not converge (nearly antipodal points). Results are NaN
+        for these.
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        *[np.asarray(x, dtype=np.float64) for x in (lat1, lon1, lat2, lon2)])
+    for lat, name in ((lat1, 'lat1'), (lat2, 'lat2')):
+        if np.any(np.abs(lat) > 90):
+            msg = '{} out of bounds! (-90 <= {} <=90)'.format(name, name)
+            raise ValueError(msg)
+    shape = lat1.shape
+    lat1, lon1, lat2, lon2 = [x.ravel() for x in (lat1, lon1, lat2, lon2)]
+
+    # normalize longitudes to the -180 to +180 range like
+    # _normalize_longitude() does
+    lon1, lon2 = [
+        np.where(lon > 180, lon - 360 * np.ceil((lon - 180) / 360),
+                 np.where(lon < -180, lon + 360 * np.ceil((-180 - lon) / 360),
+                          lon))
+        for lon in (lon1, lon2)]
+
+    b = a * (1 - f)  # semiminor axis
+
+    coincident = np.isclose(lat1, lat2, rtol=1e-9, atol=0) & \
+        np.isclose(lon1, lon2, rtol=1e-9, atol=0)
+
+    u_1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    u_2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sin_u1, cos_u1 = np.sin(u_1), np.cos(u_1)
+    sin_u2, cos_u2 = np.sin(u_2), np.cos(u_2)
+
+    omega = np.radians(lon2 - lon1)
+    dlon = omega.copy()
+    sqr_sin_sigma = np.zeros_like(omega)
+    sin_sigma = np.zeros_like(omega)
+    cos_sigma = np.ones_like(omega)
+    sigma = np.zeros_like(omega)
+    sqr_cos_alpha = np.ones_like(omega)
+    cos2sigma_m = np.zeros_like(omega)
+
+    # Iterate until no significant change in dlon for all points or iterlimit
+    # has been reached, only updating the points that did not converge yet.
+    converged = coincident.copy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for _ in range(iterlimit + 1):
+            idx = np.nonzero(~converged)
+            if not len(idx[0]):
+                break
+            su1, cu1 = sin_u1[idx], cos_u1[idx]
+            su2, cu2 = sin_u2[idx], cos_u2[idx]
+            dl = dlon[idx]
+            sqr_sin_s = (cu2 * np.sin(dl)) ** 2 + \
+                (cu1 * su2 - su1 * cu2 * np.cos(dl)) ** 2
+            sin_s = np.sqrt(sqr_sin_s)
+            cos_s = su1 * su2 + cu1 * cu2 * np.cos(dl)
+            sig = np.arctan2(sin_s, cos_s)
+            sin_alpha = cu1 * cu2 * np.sin(dl) / sin_s
+            sqr_cos_a = 1 - sin_alpha * sin_alpha
+            # Equatorial line
+            cos2s_m = np.where(sqr_cos_a == 0, 0.0,
+                               cos_s - (2 * su1 * su2 / sqr_cos_a))
+            c = (f / 16) * sqr_cos_a * (4 + f * (4 - 3 * sqr_cos_a))
+            new_dlon = omega[idx] + (1 - c) * f * sin_alpha * \
+                (sig + c * sin_s *
+                 (cos2s_m + c * cos_s * (-1 + 2 * cos2s_m ** 2)))
+            sqr_sin_sigma[idx] = sqr_sin_s
+            sin_sigma[idx] = sin_s
+            cos_sigma[idx] = cos_s
+            sigma[idx] = sig
+            sqr_cos_alpha[idx] = sqr_cos_a
+            cos2sigma_m[idx] = cos2s_m
+            dlon[idx] = new_dlon
+            converged[idx] = (new_dlon == 0) | \
+                (np.abs((dl - new_dlon) / new_dlon) <= 1.0e-9)
+
+    u2 = sqr_cos_alpha * (a * a - b * b) / (b * b)
+    _a = 1 + (u2 / 16384) * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    _b = (u2 / 1024) * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = _b * sin_sigma * \
+        (cos2sigma_m + (_b / 4) *
+            (cos_sigma * (-1 + 2 * cos2sigma_m ** 2) - (_b / 6) *
+                cos2sigma_m * (-3 + 4 * sqr_sin_sigma) *
+                (-3 + 4 * cos2sigma_m ** 2)))
+
+    dist = b * _a * (sigma - delta_sigma)
+    alpha12 = np.arctan2(cos_u2 * np.sin(dlon),
+                         cos_u1 * sin_u2 - sin_u1 * cos_u2 * np.cos(dlon))
+    alpha21 = np.arctan2(cos_u1 * np.sin(dlon),
+                         -sin_u1 * cos_u2 + cos_u1 * sin_u2 * np.cos(dlon))
+    alpha12 = np.degrees(np.mod(alpha12, 2.0 * np.pi))
+    alpha21 = np.degrees(np.mod(alpha21 + np.pi, 2.0 * np.pi))
+
+    dist[coincident] = 0.0
+    alpha12[coincident] = 0.0
+    alpha21[coincident] = 0.0
+    for values in (dist, alpha12, alpha21):
+        values[~converged] = np.nan
+    return (dist.reshape(shape), alpha12.reshape(shape),
+            alpha21.reshape(shape), converged.reshape(shape))
+
+
+def gps2dist_azimuth_array(lat1, lon1, lat2, lon2, a=WGS84_A, f=WGS84_F):
+    """
+    Computes the distances between geographic points on the WGS84 ellipsoid
+    and the forward and backward azimuths between these points for arrays of
+    points.
+
+    This is the vectorized equivalent of
+    :func:`~obspy.geodetics.base.gps2dist_azimuth`, all coordinates are
+    broadcast against each other following the usual NumPy rules.
+
+    :type lat1: float or :class:`numpy.ndarray`
+    :param lat1: Latitude(s) of point(s) A in degrees (positive for northern,
+        negative for southern hemisphere)
+    :type lon1: float or :class:`numpy.ndarray`
+    :param lon1: Longitude(s) of point(s) A in degrees (positive for eastern,
+        negative for western hemisphere)
+    :type lat2: float or :class:`numpy.ndarray`
+    :param lat2: Latitude(s) of point(s) B in degrees (positive for northern,
+        negative for southern hemisphere)
+    :type lon2: float or :class:`numpy.ndarray`
+    :param lon2: Longitude(s) of point(s) B in degrees (positive for eastern,
+        negative for western hemisphere)
+    :param a: Radius of Earth in m. Uses the value for WGS84 by default.
+    :param f: Flattening of Earth. Uses the value for WGS84 by default.
+    :rtype: tuple of three :class:`numpy.ndarray`
+    :return: (Great circle distances in m, azimuths A->B in degrees,
+        azimuths B->A in degrees)
+
+    .. note::
+        Uses a vectorized implementation of Vincenty's Inverse formulae
+        (see :func:`~obspy.geodetics.base.calc_vincenty_inverse`) which only
+        keeps iterating on pairs of points that did not converge yet. Nearly
+        antipodal pairs for which it does not converge at all are computed
+        with :func:`~obspy.geodetics.base.gps2dist_azimuth` instead, i.e.
+        with geographiclib if it is installed.
+
+    .. rubric:: Example
+
+    >>> from obspy.geodetics import gps2dist_azimuth_array
+    >>> dist, az, baz = gps2dist_azimuth_array(
+    ...     10, 10, [0, 5, 20], [10, 5, 10])
+    >>> print(dist.round(1))
+    [ 1105854.8   781106.3  1106511.4]
+    >>> print(az.round(2))
+    [ 180.   225.3    0. ]
+    """
+    dist, azim, bazim, converged = _calc_vincenty_inverse_array(
+        lat1, lon1, lat2, lon2, a=a, f=f)
+    if not converged.all():
+        lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+            lat1, lon1, lat2, lon2)
+        for i in np.flatnonzero(~converged):
+            dist.flat[i], azim.flat[i], bazim.flat[i] = gps2dist_azimuth(
+                lat1.flat[i], lon1.flat[i], lat2.flat[i], lon2.flat[i],
+                a=a, f=f)
+    return dist, azim, bazim
+
+
+def gps2dist_azimuth_matrix(lat1, lon1, lat2, lon2, a=WGS84_A, f=WGS84_F):
+    """
+    Computes the distances and the forward and backward azimuths between all
+    combinations of two sets of geographic points on the WGS84 ellipsoid.
+
+    This is the vectorized equivalent of calling
+    :func:`~obspy.geodetics.base.gps2dist_azimuth` for every pair of points,
+    e.g. for all combinations of events (A) and stations (B).
+
+    :type lat1: float or :class:`numpy.ndarray`
+    :param lat1: Latitude(s) of points A in degrees (positive for northern,
+        negative for southern hemisphere)
+    :type lon1: float or :class:`numpy.ndarray`
+    :param lon1: Longitude(s) of points A in degrees (positive for eastern,
+        negative for western hemisphere)
+    :type lat2: float or :class:`numpy.ndarray`
+    :param lat2: Latitude(s) of points B in degrees (positive for northern,
+        negative for southern hemisphere)
+    :type lon2: float or :class:`numpy.ndarray`
+    :param lon2: Longitude(s) of points B in degrees (positive for eastern,
+        negative for western hemisphere)
+    :param a: Radius of Earth in m. Uses the value for WGS84 by default.
+    :param f: Flattening of Earth. Uses the value for WGS84 by default.
+    :rtype: tuple of three :class:`numpy.ndarray`
+    :return: (Great circle distances in m, azimuths A->B in degrees,
+        azimuths B->A in degrees), each of shape ``(len(lat1), len(lat2))``.
+
+    .. note::
+        See :func:`~obspy.geodetics.base.gps2dist_azimuth_array` for details
+        on the implementation.
+
+    .. rubric:: Example
+
+    >>> from obspy.geodetics import gps2dist_azimuth_matrix
+    >>> dist, az, baz = gps2dist_azimuth_matrix(
+    ...     [0, 10], [0, 10], [0, 5, 20], [10, 5, 10])
+    >>> dist.shape
+    (2, 3)
+    >>> print(dist.round(1))  # doctest: +NORMALIZE_WHITESPACE
+    [[ 1113194.9   784028.7  2466421.1]
+     [ 1105854.8   781106.3  1106511.4]]
+    """
+    lat1 = np.atleast_1d(np.asarray(lat1, dtype=np.float64))
+    lon1 = np.atleast_1d(np.asarray(lon1, dtype=np.float64))
+    lat2 = np.atleast_1d(np.asarray(lat2, dtype=np.float64))
+    lon2 = np.atleast_1d(np.asarray(lon2, dtype=np.float64))
+    for x in (lat1, lon1, lat2, lon2):
+        if x.ndim != 1:
+            raise ValueError("Coordinates must be scalars or 1-D arrays.")
+    return gps2dist_azimuth_array(
+        lat1[:, np.newaxis], lon1[:, np.newaxis],
+        lat2[np.newaxis, :], lon2[np.newaxis, :], a=a, f=f)
+
+
+def calc_vincenty_direct(lat1, lon1, azimuth, distance, a=WGS84_A, f=WGS84_F,
+                         iterlimit=100):
+    """
+    Vincenty Direct Solution of Geodesics on the Ellipsoid.
+
+    Computes the location of the point(s) B reached when travelling the
+    given distance(s) along the geodesic(s) starting at point(s) A with the
+    given azimuth(s), and the backward azimuth(s) B->A. All arguments may be
+    arrays and are broadcast against each other following the usual NumPy
+    rules.
+
+    :type lat1: float or :class:`numpy.ndarray`
+    :param lat1: Latitude(s) of point(s) A in degrees (positive for northern,
+        negative for southern hemisphere)
+    :type lon1: float or :class:`numpy.ndarray`
+    :param lon1: Longitude(s) of point(s) A in degrees (positive for eastern,
+        negative for western hemisphere)
+    :type azimuth: float or :class:`numpy.ndarray`
+    :param azimuth: Azimuth(s) A->B in degrees
+    :type distance: float or :class:`numpy.ndarray`
+    :param distance: Distance(s) A->B along the geodesic in m
+    :param a: Radius of Earth in m. Uses the value for WGS84 by default.
+    :param f: Flattening of Earth. Uses the value for WGS84 by default.
+    :param iterlimit: Maximum number of iterations.
+    :rtype: tuple of three :class:`numpy.ndarray`
+    :return: (Latitudes of points B in degrees, longitudes of points B in
+        degrees in the range -180 to +180, azimuths B->A in degrees)
+
+    .. note::
+        The solution is the inverse of
+        :func:`~obspy.geodetics.base.calc_vincenty_inverse`, see
+        T. Vincenty: "Direct and Inverse Solutions of Geodesics on the
+        Ellipsoid with application of nested equations", Survey Review,
+        vol XXIII no 176, 1975
+        http://www.ngs.noaa.gov/PC_PROD/Inv_Fwd/Direct_Inverse.pdf
+
+    .. rubric:: Example
+
+    >>> from obspy.geodetics import calc_vincenty_direct
+    >>> lat2, lon2, baz = calc_vincenty_direct(
+    ...     10, 10, [180, 0], [1105854.8, 1106511.4])
+    >>> print(lat2.round(4))
+    [  0.  20.]
+    >>> print(lon2.round(4))
+    [ 10.  10.]
+    """
+    lat1, lon1, azimuth, distance = np.broadcast_arrays(
+        *[np.asarray(x, dtype=np.float64)
+          for x in (lat1, lon1, azimuth, distance)])
+    if np.any(np.abs(lat1) > 90):
+        msg = 'lat1 out of bounds! (-90 <= lat1 <=90)'
+        raise ValueError(msg)
+    shape = lat1.shape
+    lat1, lon1, azimuth, distance = [
+        x.ravel() for x in (lat1, lon1, azimuth, distance)]
+
+    b = a * (1 - f)  # semiminor axis
+
+    alpha1 = np.radians(azimuth)
+    sin_alpha1, cos_alpha1 = np.sin(alpha1), np.cos(alpha1)
+    u_1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    sin_u1, cos_u1 = np.sin(u_1), np.cos(u_1)
+    sigma1 = np.arctan2(np.tan(u_1), cos_alpha1)
+    sin_alpha = cos_u1 * sin_alpha1
+    sqr_cos_alpha = 1 - sin_alpha * sin_alpha
+    u2 = sqr_cos_alpha * (a * a - b * b) / (b * b)
+    _a = 1 + (u2 / 16384) * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    _b = (u2 / 1024) * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+
+    sigma0 = distance / (b * _a)
+    sigma = sigma0.copy()
+
+    # Iterate until no significant change in sigma for all points or
+    # iterlimit has been reached, only updating the points that did not
+    # converge yet.
+    converged = np.zeros(sigma.shape, dtype=bool)
+    for _ in range(iterlimit):
+        idx = np.nonzero(~converged)
+        if not len(idx[0]):
+            break
+        sig = sigma[idx]
+        cos2s_m = np.cos(2 * sigma1[idx] + sig)
+        sin_s = np.sin(sig)
+        b_ = _b[idx]
+        delta_sigma = b_ * sin_s * \
+            (cos2s_m + (b_ / 4) *
+                (np.cos(sig) * (-1 + 2 * cos2s_m ** 2) - (b_ / 6) *
+                    cos2s_m * (-3 + 4 * sin_s ** 2) *
+                    (-3 + 4 * cos2s_m ** 2)))
+        new_sigma = sigma0[idx] + delta_sigma
+        sigma[idx] = new_sigma
+        converged[idx] = np.abs(new_sigma - sig) <= 1e-12
+    cos2sigma_m = np.cos(2 * sigma1 + sigma)
+
+    sin_sigma, cos_sigma = np.sin(sigma), np.cos(sigma)
+    tmp = sin_u1 * sin_sigma - cos_u1 * cos_sigma * cos_alpha1
+    lat2 = np.arctan2(
+        sin_u1 * cos_sigma + cos_u1 * sin_sigma * cos_alpha1,
+        (1 - f) * np.sqrt(sin_alpha * sin_alpha + tmp * tmp))
+    lamb = np.arctan2(sin_sigma * sin_alpha1,
+                      cos_u1 * cos_sigma - sin_u1 * sin_sigma * cos_alpha1)
+    c = (f / 16) * sqr_cos_alpha * (4 + f * (4 - 3 * sqr_cos_alpha))
+    omega = lamb - (1 - c) * f * sin_alpha * \
+        (sigma + c * sin_sigma *
+         (cos2sigma_m + c * cos_sigma * (-1 + 2 * cos2sigma_m ** 2)))
+    lon2 = np.mod(lon1 + np.degrees(omega) + 180, 360) - 180
+    alpha21 = np.arctan2(sin_alpha, -tmp)
+    alpha21 = np.degrees(np.mod(alpha21 + np.pi, 2.0 * np.pi))
+    return (np.degrees(lat2).reshape(shape), lon2.reshape(shape),
+            alpha21.reshape(shape))
+
+
 def kilometers2degrees(kilometer, radius=6371.0):
     """
     Convenience function to convert kilometers to degrees assuming a perfectly
@@ -342,25 +675,38 @@ def locations2degrees(lat1, long1, lat2, long2):
     >>> from obspy.geodetics import locations2degrees
     >>> locations2degrees(5, 5, 10, 10) # doctest: +ELLIPSIS
     7.03970141917538...
+
+    All coordinates are broadcast against each other following the usual
+    NumPy rules, e.g. to get the distances of all events to all stations:
+
+    >>> dist = locations2degrees(np.array([[0], [10], [20]]),
+    ...                          np.array([[0], [10], [20]]),
+    ...                          [5, 10], [5, 10])
+    >>> dist.shape
+    (3, 2)
     """
-    # broadcast explicitly here so it raises once instead of somewhere in the
+    # check the shapes here so it raises once instead of somewhere in the
     # middle if things can't be broadcast
-    lat1, lat2, long1, long2 = np.broadcast_arrays(lat1, lat2, long1, long2)
+    np.broadcast(lat1, lat2, long1, long2)
 
-    # Convert to radians.
+    # Convert to radians. The trigonometric functions of the latitudes are
+    # calculated before broadcasting, e.g. only once per event and station.
     lat1 = np.radians(np.asarray(lat1))
     lat2 = np.radians(np.asarray(lat2))
     long1 = np.radians(np.asarray(long1))
     long2 = np.radians(np.asarray(long2))
+    sin_lat1, cos_lat1 = np.sin(lat1), np.cos(lat1)
+    sin_lat2, cos_lat2 = np.sin(lat2), np.cos(lat2)
     long_diff = long2 - long1
+    cos_long_diff = np.cos(long_diff)
     gd = np.degrees(
         np.arctan2(
             np.sqrt((
-                np.cos(lat2) * np.sin(long_diff)) ** 2 +
-                (np.cos(lat1) * np.sin(lat2) - np.sin(lat1) *
-                    np.cos(lat2) * np.cos(long_diff)) ** 2),
-            np.sin(lat1) * np.sin(lat2) + np.cos(lat1) * np.cos(lat2) *
-            np.cos(long_diff)))
+                cos_lat2 * np.sin(long_diff)) ** 2 +
+                (cos_lat1 * sin_lat2 - sin_lat1 *
+                    cos_lat2 * cos_long_diff) ** 2),
+            sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 *
+            cos_long_diff))
     return gd
 
 
@@ -3,9 +3,11 @@ import math
 import warnings
 import numpy as np
 
-from obspy.geodetics import (calc_vincenty_inverse, degrees2kilometers,
-                             gps2dist_azimuth, inside_geobounds,
-                             kilometer2degrees, locations2degrees)
+from obspy.geodetics import (calc_vincenty_direct, calc_vincenty_inverse,
+                             degrees2kilometers, gps2dist_azimuth,
+                             gps2dist_azimuth_array, gps2dist_azimuth_matrix,
+                             inside_geobounds, kilometer2degrees,
+                             locations2degrees)
 from obspy.geodetics.base import HAS_GEOGRAPHICLIB
 from obspy.core import AttribDict
 import pytest
@@ -303,6 +305,17 @@ class TestUtilGeodetics:
         assert_loc_np([36.12, 36.12], [-86.67, -86.67], [33.94, 33.94],
                       [-118.40, -118.40], 2893, 2)
 
+        # test numpy broadcasting of all events against all stations
+        evlats = np.array([[-30.], [0.], [60.]])
+        evlons = [[10.], [-170.], [45.]]
+        stlats, stlons = [10., 20., -80., 45.], [0., 179., -20., 45.]
+        dist = locations2degrees(evlats, evlons, stlats, stlons)
+        assert dist.shape == (3, 4)
+        for i in range(3):
+            for j in range(4):
+                assert dist[i, j] == locations2degrees(
+                    evlats[i, 0], evlons[i][0], stlats[j], stlons[j])
+
         # test numpy broadcasting (bad shapes)
         with pytest.raises(ValueError):
             locations2degrees(1, 2, [3, 4], [5, 6, 7])
@@ -328,6 +341,130 @@ class TestUtilGeodetics:
         assert round(azim, 0) == 213
         assert round(bazim, 0) == 33
 
+    def test_gps2dist_azimuth_matrix(self):
+        """
+        Tests the vectorized distance and azimuth matrices against the scalar
+        Vincenty's Inverse formulae.
+        """
+        rng = np.random.default_rng(42)
+        lat1 = rng.uniform(-90, 90, 30)
+        lon1 = rng.uniform(-180, 180, 30)
+        lat2 = rng.uniform(-90, 90, 20)
+        lon2 = rng.uniform(-540, 540, 20)
+        # coincident points, poles, equator and a nearly antipodal pair
+        lat1[:4] = [10.0, 90.0, 0.0, 15.26804251]
+        lon1[:4] = [20.0, 0.0, 0.0, 2.93007342]
+        lat2[:4] = [10.0, -90.0, 0.0, -14.80522806]
+        lon2[:4] = [380.0, 0.0, 50.0, -177.2299081]
+        dist, azim, bazim = gps2dist_azimuth_matrix(lat1, lon1, lat2, lon2)
+        assert dist.shape == azim.shape == bazim.shape == (30, 20)
+        for i in range(30):
+            for j in range(20):
+                try:
+                    expected = calc_vincenty_inverse(
+                        lat1[i], lon1[i], lat2[j], lon2[j])
+                except StopIteration:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        expected = gps2dist_azimuth(
+                            lat1[i], lon1[i], lat2[j], lon2[j])
+                np.testing.assert_allclose(dist[i, j], expected[0],
+                                           rtol=1e-12, atol=1e-6)
+                for got, exp in zip((azim[i, j], bazim[i, j]), expected[1:]):
+                    diff = abs(got - exp) % 360
+                    assert min(diff, 360 - diff) < 1e-8
+        assert dist[0, 0] == azim[0, 0] == bazim[0, 0] == 0
+        # scalars
+        dist, azim, bazim = gps2dist_azimuth_matrix(50, 10, 51, 11)
+        assert dist.shape == (1, 1)
+        assert round(azim[0, 0], 0) == 32
+        assert round(bazim[0, 0], 0) == 213
+        # out of bounds
+        with pytest.raises(ValueError):
+            gps2dist_azimuth_matrix([91], [0], [0], [0])
+        with pytest.raises(ValueError):
+            gps2dist_azimuth_matrix([0], [0], [[0]], [[0]])
+
+    def test_gps2dist_azimuth_array(self):
+        """
+        Tests that the vectorized distance and azimuth calculation broadcasts
+        its arguments and matches gps2dist_azimuth(), including nearly
+        antipodal points.
+        """
+        rng = np.random.default_rng(0)
+        lat1 = rng.uniform(-90, 90, (10, 1))
+        lon1 = rng.uniform(-180, 180, (10, 1))
+        lat2 = rng.uniform(-90, 90, 15)
+        lon2 = rng.uniform(-180, 180, 15)
+        lat1[:2, 0] = [27.3562106, 27.4675551]
+        lon1[:2, 0] = [72.2382356, 17.28133229]
+        lat2[:2] = [-27.55995499, -27.65771704]
+        lon2[:2] = [-107.78571981, -162.65420626]
+        dist, azim, bazim = gps2dist_azimuth_array(lat1, lon1, lat2, lon2)
+        assert dist.shape == azim.shape == bazim.shape == (10, 15)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for i in range(10):
+                for j in range(15):
+                    expected = gps2dist_azimuth(
+                        lat1[i, 0], lon1[i, 0], lat2[j], lon2[j])
+                    np.testing.assert_allclose(
+                        dist[i, j], expected[0], rtol=1e-9, atol=1e-3)
+                    for got, exp in zip((azim[i, j], bazim[i, j]),
+                                        expected[1:]):
+                        diff = abs(got - exp) % 360
+                        assert min(diff, 360 - diff) < 1e-6
+        # scalars give 0-dim arrays
+        dist, azim, bazim = gps2dist_azimuth_array(50, 10, 50 - 1, 10 - 1)
+        assert dist.shape == ()
+        assert round(float(azim), 0) == 213
+        assert round(float(bazim), 0) == 33
+        with pytest.raises(ValueError):
+            gps2dist_azimuth_array([0, 0], [0, 0], [-91, 0], [0, 0])
+
+    @pytest.mark.skipif(not HAS_GEOGRAPHICLIB,
+                        reason='Module geographiclib is not installed')
+    def test_calc_vincenty_direct(self):
+        """
+        Tests the vectorized Vincenty's Direct formulae against geographiclib
+        and the inverse solution.
+        """
+        from geographiclib.geodesic import Geodesic
+        rng = np.random.default_rng(1)
+        lat1 = rng.uniform(-90, 90, 500)
+        lon1 = rng.uniform(-180, 180, 500)
+        azim = rng.uniform(0, 360, 500)
+        dist = rng.uniform(0, 19.9e6, 500)
+        lat1[:3] = [90, -90, 0]
+        azim[:3] = [180, 0, 90]
+        dist[3] = 0
+        lat2, lon2, bazim = calc_vincenty_direct(lat1, lon1, azim, dist)
+        geod = Geodesic.WGS84
+        for i in range(len(lat1)):
+            expected = geod.Direct(lat1[i], lon1[i], azim[i], dist[i])
+            assert abs(lat2[i] - expected['lat2']) < 1e-8
+            assert -180 <= lon2[i] <= 180
+            if abs(lat2[i]) < 89.9:
+                diff = abs(lon2[i] - expected['lon2']) % 360
+                assert min(diff, 360 - diff) < 1e-8
+                diff = abs(bazim[i] - expected['azi2'] - 180) % 360
+                assert min(diff, 360 - diff) < 1e-8
+        # round trip with the inverse solution, away from the poles and
+        # antipodes
+        mask = (np.abs(lat1) < 80) & (np.abs(lat2) < 80) & \
+            (dist > 1e3) & (dist < 19e6)
+        dist_, azim_, bazim_ = gps2dist_azimuth_array(
+            lat1[mask], lon1[mask], lat2[mask], lon2[mask])
+        np.testing.assert_allclose(dist_, dist[mask], rtol=1e-8)
+        np.testing.assert_allclose(azim_, azim[mask], atol=1e-6)
+        np.testing.assert_allclose(bazim_, bazim[mask], atol=1e-6)
+        # broadcasting
+        lat2, lon2, bazim = calc_vincenty_direct(
+            10, 10, [[0], [90]], [0, 1e5, 1e6])
+        assert lat2.shape == lon2.shape == bazim.shape == (2, 3)
+        with pytest.raises(ValueError):
+            calc_vincenty_direct(91, 0, 0, 0)
+
     def test_inside_geobounds(self):
         obj = AttribDict()
         obj.latitude = 48.8566
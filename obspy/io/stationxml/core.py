@@ -140,7 +140,8 @@ def validate_stationxml(path_or_object):
     return (True, ())
 
 
-def _read_stationxml(path_or_file_object, level='response'):
+def _read_stationxml(path_or_file_object, level='response',
+                     lazy_responses=False):
     """
     Function reading a StationXML file.
 
@@ -148,6 +149,17 @@ def _read_stationxml(path_or_file_object, level='response'):
     :type level: str
     :param level: Level of detail to read from file. One of ``'response'``,
         ``'channel'``, ``'station'`` or ``'network'``.
+    :type lazy_responses: bool
+    :param lazy_responses: Only used with ``level='response'``. If ``True``,
+        the response stages of each channel are not parsed while reading the
+        file. Only the raw XML of each response is kept and the stages are
+        parsed on first access of
+        :attr:`~obspy.core.inventory.response.Response.response_stages`
+        (e.g. by :meth:`~obspy.core.inventory.response.Response.get_response`
+        or :meth:`~obspy.core.trace.Trace.remove_response`). The overall
+        instrument sensitivity is always read directly. This considerably
+        speeds up reading large inventories and reduces memory usage if the
+        full responses are only needed for few channels.
     """
     root = etree.parse(path_or_file_object).getroot()
 
@@ -177,7 +189,8 @@ def _read_stationxml(path_or_file_object, level='response'):
                 'Setting Numerator/Denominator with a unit is deprecated.',
                 ObsPyDeprecationWarning)
         for network in root.findall(_ns("Network")):
-            networks.append(_read_network(network, _ns, level))
+            networks.append(_read_network(network, _ns, level,
+                                          lazy_responses=lazy_responses))
 
     inv = obspy.core.inventory.Inventory(networks=networks, source=source,
                                          sender=sender, created=created,
@@ -227,7 +240,7 @@ def _read_base_node(element, object_to_write_to, _ns):
     _read_extra(element, object_to_write_to)
 
 
-def _read_network(net_element, _ns, level):
+def _read_network(net_element, _ns, level, lazy_responses=False):
     network = obspy.core.inventory.Network(net_element.get("code"))
     _read_base_node(net_element, network, _ns)
     for operator in net_element.findall(_ns("Operator")):
@@ -239,12 +252,13 @@ def _read_network(net_element, _ns, level):
     stations = []
     if level in ('station', 'channel', 'response'):
         for station in net_element.findall(_ns("Station")):
-            stations.append(_read_station(station, _ns, level))
+            stations.append(_read_station(station, _ns, level,
+                                          lazy_responses=lazy_responses))
     network.stations = stations
     return network
 
 
-def _read_station(sta_element, _ns, level):
+def _read_station(sta_element, _ns, level, lazy_responses=False):
     longitude = _read_floattype(sta_element, _ns("Longitude"), Longitude,
                                 datum=True)
     latitude = _read_floattype(sta_element, _ns("Latitude"), Latitude,
@@ -283,7 +297,8 @@ def _read_station(sta_element, _ns, level):
             # Skip empty channels.
             if not channel.items() and not channel.attrib:
                 continue
-            cha = _read_channel(channel, _ns, level=level)
+            cha = _read_channel(channel, _ns, level=level,
+                                lazy_responses=lazy_responses)
             # Might be None in case the channel could not be parsed.
             if cha is None:
                 # This is None if, and only if, one of the coordinates could
@@ -361,7 +376,7 @@ def _read_floattype_list(parent, tag, cls, unit=False, datum=False,
     return objs
 
 
-def _read_channel(cha_element, _ns, level):
+def _read_channel(cha_element, _ns, level, lazy_responses=False):
     """
     Returns either a :class:`~obspy.core.inventory.channel.Channel` object or
     ``None``.
@@ -443,12 +458,41 @@ def _read_channel(cha_element, _ns, level):
     if level == 'response':
         response = cha_element.find(_ns("Response"))
         if response is not None:
-            channel.response = _read_response(response, _ns)
-            channel.response._attempt_to_fix_units()
+            channel.response = _read_response(response, _ns,
+                                              lazy=lazy_responses)
     return channel
 
 
-def _read_response(resp_element, _ns):
+class _LazyResponseStages(object):
+    """
+    Parses the response stages of a StationXML ``Response`` element on
+    demand.
+
+    Only keeps the serialized XML of the element around, see
+    :meth:`~obspy.core.inventory.response.Response._load_response_stages`.
+    """
+    def __init__(self, resp_element):
+        self.xml = etree.tostring(resp_element, with_tail=False)
+        self.stationxml_version = \
+            resp_element.getroottree().getroot().get("schemaVersion")
+        self.namespace = etree.QName(resp_element).namespace
+
+    def __call__(self, response):
+        def _ns(tagname):
+            return "{%s}%s" % (self.namespace, tagname)
+
+        resp_element = etree.fromstring(self.xml)
+        with warnings.catch_warnings():
+            if self.stationxml_version == '1.0':
+                warnings.filterwarnings(
+                    'ignore',
+                    'Setting Numerator/Denominator with a unit is '
+                    'deprecated.', ObsPyDeprecationWarning)
+            _read_response_stages(resp_element, response, _ns)
+        response._attempt_to_fix_units()
+
+
+def _read_response(resp_element, _ns, lazy=False):
     response = obspy.core.inventory.response.Response()
     response.resource_id = resp_element.attrib.get('resourceId')
     if response.resource_id is not None:
@@ -461,13 +505,23 @@ def _read_response(resp_element, _ns):
     if instrument_polynomial is not None:
         response.instrument_polynomial = \
             _read_instrument_polynomial(instrument_polynomial, _ns)
-    # Now read all the stages.
+    if lazy:
+        response._response_stages_loader = _LazyResponseStages(resp_element)
+    else:
+        _read_response_stages(resp_element, response, _ns)
+        response._attempt_to_fix_units()
+    _read_extra(resp_element, response)
+    return response
+
+
+def _read_response_stages(resp_element, response, _ns):
+    """
+    Reads all stages of the response element into the given response.
+    """
     for stage in resp_element.findall(_ns("Stage")):
         if not len(stage):
             continue
         response.response_stages.append(_read_response_stage(stage, _ns))
-    _read_extra(resp_element, response)
-    return response
 
 
 def _read_response_stage(stage_elem, _ns):
@@ -880,7 +934,8 @@ def _read_phone(phone_element, _ns):
 
 
 def _write_stationxml(inventory, file_or_file_object, validate=False,
-                      nsmap=None, level="response", **kwargs):
+                      nsmap=None, level="response", streaming=False,
+                      **kwargs):
     """
     Writes an inventory object to a buffer.
 
@@ -894,6 +949,14 @@ def _write_stationxml(inventory, file_or_file_object, validate=False,
     :type nsmap: dict
     :param nsmap: Additional custom namespace abbreviation
         mappings (e.g. `{"edb": "http://erdbeben-in-bayern.de/xmlns/0.1"}`).
+    :type streaming: bool
+    :param streaming: If True, the document is written incrementally
+        network by network, station by station and channel by channel instead
+        of building the element tree of the whole inventory in memory first.
+        This considerably reduces the peak memory usage for large
+        inventories. The output is identical to the non-streaming
+        writer. Has no effect if ``validate`` is True, as the complete
+        document is needed for validation.
     """
     if nsmap is None:
         nsmap = {}
@@ -925,6 +988,19 @@ def _write_stationxml(inventory, file_or_file_object, validate=False,
     if level not in ["network", "station", "channel", "response"]:
         raise ValueError("Requested stationXML write level is unsupported.")
 
+    if streaming and not validate:
+        # Register all namespaces, see below.
+        for prefix, ns in nsmap.items():
+            if prefix and ns:
+                etree.register_namespace(prefix, ns)
+        if hasattr(file_or_file_object, "write"):
+            _write_stationxml_streaming(root, inventory, file_or_file_object,
+                                        level)
+        else:
+            with open(file_or_file_object, "wb") as fh:
+                _write_stationxml_streaming(root, inventory, fh, level)
+        return
+
     for network in inventory.networks:
         _write_network(root, network, level)
 
@@ -958,6 +1034,117 @@ def _write_stationxml(inventory, file_or_file_object, validate=False,
                encoding="UTF-8")
 
 
+class _StreamingMarker(object):
+    """
+    Helper to split the serialized document at the position of a given
+    element.
+
+    Pretty printing depends on the position of an element in the tree and
+    namespace declarations have to stay on the root element so elements
+    cannot be serialized on their own. Instead the whole (small) document
+    from the root element down to the element of interest is serialized
+    each time and the relevant part is cut out. For this to work, the element
+    of interest always has to be the last element of the document.
+    """
+    tag = "ObsPyStreamingMarker"
+
+    def __init__(self, parent, index=None):
+        """
+        Places a marker as last child of parent (or at the given index) to
+        determine the parts of the serialized document before and after it.
+        """
+        marker = etree.Element(self.tag)
+        parent.insert(len(parent) if index is None else index, marker)
+        data = _serialize_stationxml(parent)
+        parent.remove(marker)
+        marker = ("<%s/>" % self.tag).encode("UTF-8")
+        idx = data.rindex(marker)
+        self.before = data[:idx]
+        self.after = data[idx + len(marker):]
+        self.prefix_length = self.before.rindex(b"\n") + 1
+
+    def opening(self, parent_marker=None):
+        """
+        Opening part of the parent up to its last child, excluding the
+        indentation of the child.
+        """
+        start = parent_marker.prefix_length if parent_marker else 0
+        return self.before[start:self.prefix_length]
+
+    def child(self, element):
+        """
+        Serialized (last) child element including indentation and newline.
+        """
+        data = _serialize_stationxml(element)
+        return data[self.prefix_length:len(data) - len(self.after) + 1]
+
+    def closing(self, parent_marker):
+        """
+        Closing part of the parent.
+        """
+        return self.after[1:len(self.after) - len(parent_marker.after) + 1]
+
+
+def _serialize_stationxml(element):
+    """
+    Serializes the whole document the given element is part of.
+    """
+    return etree.tostring(element.getroottree(), pretty_print=True,
+                          xml_declaration=True, encoding="UTF-8")
+
+
+def _write_stationxml_streaming(root, inventory, fh, level):
+    """
+    Writes an inventory incrementally, see :func:`_write_stationxml`.
+
+    :param root: Root element with all header elements already set.
+    """
+    # Custom namespace tags of the root element come after all networks
+    # while custom namespace attributes are part of the root element's start
+    # tag that is written first. Handle both on a copy of the root element, to
+    # not affect the namespace declarations of all other elements.
+    root_with_extra = copy.deepcopy(root)
+    _write_extra(root_with_extra, inventory)
+    document_with_extra = _serialize_stationxml(root_with_extra)
+    opening_length = \
+        _StreamingMarker(root_with_extra, index=len(root)).prefix_length
+
+    root_marker = _StreamingMarker(root)
+    fh.write(document_with_extra[:opening_length])
+
+    for network in inventory.networks:
+        _write_network(root, network, "network")
+        network_elem = root[-1]
+        if level == "network" or not network.stations:
+            fh.write(root_marker.child(network_elem))
+            root.remove(network_elem)
+            continue
+        network_marker = _StreamingMarker(network_elem)
+        fh.write(network_marker.opening(root_marker))
+        for station in network.stations:
+            _write_station(network_elem, station, "station")
+            station_elem = network_elem[-1]
+            if level == "station" or not station.channels:
+                fh.write(network_marker.child(station_elem))
+                network_elem.remove(station_elem)
+                continue
+            station_marker = _StreamingMarker(station_elem)
+            fh.write(station_marker.opening(network_marker))
+            for channel in station.channels:
+                _write_channel(station_elem, channel, level)
+                channel_elem = station_elem[-1]
+                fh.write(station_marker.child(channel_elem))
+                station_elem.remove(channel_elem)
+            fh.write(station_marker.closing(network_marker))
+            network_elem.remove(station_elem)
+        fh.write(network_marker.closing(root_marker))
+        root.remove(network_elem)
+
+    # Remaining part of the document are the custom namespace tags and the
+    # closing tag of the root element.
+    fh.write(document_with_extra[opening_length:])
+
+
 def _get_base_node_attributes(element):
     attributes = {"code": element.code}
     if element.start_date:
@@ -1048,7 +1235,12 @@ def _write_floattype(parent, obj, attr_name, tag, additional_mapping={},
 
 def _write_floattype_list(parent, obj, attr_list_name, tag,
                           additional_mapping={}, unit=True):
-    for obj_ in getattr(obj, attr_list_name):
+    objs = getattr(obj, attr_list_name)
+    if len(additional_mapping) <= 1 and \
+            all(_is_plain_floattype(obj_, unit) for obj_ in objs):
+        _write_plain_floattype_list(parent, objs, tag, additional_mapping)
+        return
+    for obj_ in objs:
         attribs = {}
         attribs["datum"] = obj_.__dict__.get("datum")
         if hasattr(obj_, "unit") and unit:
@@ -1062,6 +1254,44 @@ def _write_floattype_list(parent, obj, attr_list_name, tag,
         etree.SubElement(parent, tag, attribs).text = _float_to_str(obj_)
 
 
+def _is_plain_floattype(obj, unit=True):
+    """
+    Checks if a float type object has no attributes that would be written to
+    StationXML other than its value and a potential number.
+    """
+    return (obj.lower_uncertainty is None and
+            obj.upper_uncertainty is None and
+            obj.measurement_method is None and
+            obj.__dict__.get("datum") is None and
+            not (unit and getattr(obj, "unit", None) is not None))
+
+
+def _write_plain_floattype_list(parent, objs, tag, additional_mapping={}):
+    """
+    Fast path of :func:`_write_floattype_list` for plain numeric lists, e.g.
+    the coefficients of large FIR filters.
+
+    Creating the elements one by one is rather slow, so the list is written
+    as a string and parsed in one go instead. Results in the exact same
+    elements as the generic path.
+    """
+    if not objs:
+        return
+    if additional_mapping:
+        (attr_name, attrib_name), = additional_mapping.items()
+    else:
+        attr_name = None
+    items = []
+    for obj_ in objs:
+        number = getattr(obj_, attr_name) if attr_name else None
+        if number is None:
+            items.append("<%s>%s</%s>" % (tag, _float_to_str(obj_), tag))
+        else:
+            items.append('<%s %s="%s">%s</%s>' % (
+                tag, attrib_name, number, _float_to_str(obj_), tag))
+    parent.extend(etree.fromstring("<List>%s</List>" % "".join(items)))
+
+
 def _float_to_str(x):
     """
     Converts a float to str making. For most numbers this results in a
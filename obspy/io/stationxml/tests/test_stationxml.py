@@ -9,12 +9,14 @@ Test suite for the StationXML reader and writer.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+import copy
 import fnmatch
 import io
 import re
 import warnings
 
 from lxml import etree
+import numpy as np
 
 import obspy
 import obspy.io.stationxml.core
@@ -22,7 +24,8 @@ from obspy import UTCDateTime
 from obspy.core.util import AttribDict, CatchAndAssertWarnings
 from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
 from obspy.core.inventory import (
-    Inventory, Network, ResponseStage, Response, Channel, Station)
+    Inventory, Network, ResponseStage, Response, Channel, Station,
+    FIRResponseStage, FilterCoefficient)
 from obspy.core.inventory.util import DataAvailability
 from obspy.core.util.base import NamedTemporaryFile
 from obspy.io.stationxml.core import _read_stationxml
@@ -1293,3 +1296,90 @@ class TestStationXML():
         # if it is present, at least it should have empty value, but let's just
         # make sure it's not present at all for now
         # assert matches[0].text is None
+
+    def test_read_with_lazy_responses(self, testdata):
+        """
+        Tests deferred parsing of response stages.
+        """
+        path = testdata['IRIS_single_channel_with_response.xml']
+        inv = _read_stationxml(path)
+        inv_lazy = _read_stationxml(path, lazy_responses=True)
+        response = inv[0][0][0].response
+        response_lazy = inv_lazy[0][0][0].response
+        # instrument sensitivity is read directly, the stages are not
+        assert response_lazy.instrument_sensitivity == \
+            response.instrument_sensitivity
+        assert response_lazy._response_stages_loader is not None
+        # stages are parsed on first access
+        assert len(response_lazy.response_stages) == \
+            len(response.response_stages)
+        assert response_lazy._response_stages_loader is None
+        assert response_lazy.response_stages == response.response_stages
+        # comparing inventories materializes all lazy responses
+        assert _read_stationxml(path, lazy_responses=True) == inv
+        # evaluating the response is transparent
+        inv_lazy = obspy.read_inventory(path, format='STATIONXML',
+                                        lazy_responses=True)
+        response_lazy = inv_lazy[0][0][0].response
+        np.testing.assert_array_equal(
+            response_lazy.get_evalresp_response_for_frequencies([0.1, 1.0]),
+            response.get_evalresp_response_for_frequencies([0.1, 1.0]))
+        # copying and writing works without materializing first
+        inv_lazy = _read_stationxml(path, lazy_responses=True)
+        assert copy.deepcopy(inv_lazy) == inv
+        with io.BytesIO() as buf, io.BytesIO() as buf_lazy:
+            inv.write(buf, format='STATIONXML')
+            inv_lazy.write(buf_lazy, format='STATIONXML')
+            assert buf.getvalue() == buf_lazy.getvalue()
+
+    @pytest.mark.parametrize('level',
+                             ['network', 'station', 'channel', 'response'])
+    def test_streaming_writer(self, testdata, level):
+        """
+        Tests that the streaming writer results in the exact same output as
+        writing the complete element tree.
+        """
+        filenames = ["IRIS_single_channel_with_response.xml",
+                     "IRIS_single_channel_with_response_custom_tags.xml",
+                     "full_random_stationxml.xml",
+                     "stationxml_with_availability.xml"]
+        for filename in filenames:
+            inv = obspy.read_inventory(testdata[filename])
+            with io.BytesIO() as buf, io.BytesIO() as buf_streaming:
+                inv.write(buf, format='STATIONXML', level=level)
+                inv.write(buf_streaming, format='STATIONXML', level=level,
+                          streaming=True)
+                assert buf.getvalue() == buf_streaming.getvalue()
+        # writing to a file name
+        inv = obspy.read_inventory()
+        with NamedTemporaryFile() as tf:
+            inv.write(tf.name, format='STATIONXML', streaming=True)
+            assert obspy.read_inventory(tf.name) == inv
+
+    def test_write_fir_coefficients(self):
+        """
+        Tests writing FIR coefficients with and without additional attributes,
+        i.e. with and without the fast path for plain coefficient lists.
+        """
+        inv = obspy.read_inventory().select(station="FUR", channel="BHZ")
+        stage = FIRResponseStage(
+            stage_sequence_number=1, stage_gain=1, stage_gain_frequency=1,
+            input_units="COUNTS", output_units="COUNTS", symmetry="NONE",
+            coefficients=[FilterCoefficient(0.5, number=1),
+                          FilterCoefficient(-1e-10, number=2),
+                          FilterCoefficient(0.25)])
+        inv[0][0][0].response.response_stages = [stage]
+        for upper_uncertainty in (None, 0.1):
+            stage.coefficients[0].upper_uncertainty = upper_uncertainty
+            with io.BytesIO() as buf:
+                inv.write(buf, format='STATIONXML')
+                buf.seek(0)
+                xml = etree.parse(buf)
+            coefficients = xml.xpath(
+                '//ns:FIR/ns:NumeratorCoefficient',
+                namespaces={'ns': 'http://www.fdsn.org/xml/station/1'})
+            assert [c.text for c in coefficients] == \
+                ['0.5', '-1e-10', '0.25']
+            assert [c.get('i') for c in coefficients] == ['1', '2', None]
+            assert coefficients[0].get('plusError') == \
+                (upper_uncertainty and str(upper_uncertainty))
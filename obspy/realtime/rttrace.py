@@ -265,6 +265,9 @@ class RtTrace(Trace):
             if gap_or_overlap and rtmemory_list is not None:
                 for n in range(len(rtmemory_list)):
                     rtmemory_list[n] = RtMemory()
+            # if gap or overlap, reset state of processing objects
+            if gap_or_overlap and hasattr(process_name, 'reset'):
+                process_name.reset()
             # apply processing
             trace = trace.copy()
             dtype = trace.data.dtype
@@ -312,6 +315,9 @@ class RtTrace(Trace):
             %s. % REALTIME_PROCESS_FUNCTIONS.keys()
             or a non-recursive, time-domain NumPy or ObsPy function which takes
             a single array as an argument and returns an array
+            or a callable object keeping state between calls, e.g.
+            :class:`~obspy.signal.trigger.RecursiveStaLta`, whose ``reset()``
+            method is called on gaps and overlaps
 
         :type process: str or callable
         :param process: Specifies which processing function is added,
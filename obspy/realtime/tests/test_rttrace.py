@@ -11,6 +11,7 @@ from obspy.core.stream import read
 from obspy.realtime import RtTrace
 from obspy.realtime.rtmemory import RtMemory
 import obspy.signal.filter
+from obspy.signal.trigger import RecursiveStaLta, recursive_sta_lta
 import pytest
 
 
@@ -218,3 +219,24 @@ class TestRtTrace():
         rt_trace.register_rt_process('tauc', width=20, notexistingoption=True)
         with pytest.raises(TypeError):
             rt_trace.append(trace)
+
+    def test_stateful_rt_process(self):
+        """
+        Processing objects keep their state between appended traces and are
+        reset on gaps.
+        """
+        tr = read()[0]
+        tr.data = tr.data.astype(np.float64)
+        rtr = RtTrace()
+        rtr.register_rt_process(RecursiveStaLta(100, 400))
+        for trace in tr / 5:
+            rtr.append(trace, gap_overlap_check=True)
+        np.testing.assert_array_equal(rtr.data,
+                                      recursive_sta_lta(tr.data, 100, 400))
+        # a gap starts processing from scratch
+        trace = tr.slice(tr.stats.starttime + 5)
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('ignore', UserWarning)
+            processed = rtr.append(trace)
+        np.testing.assert_array_equal(
+            processed.data, recursive_sta_lta(trace.data, 100, 400))
@@ -194,7 +194,18 @@ and the same page in the `Tutorial`_. For automated use see the following
 if "filter" in locals():
     del filter
 
-from .spectral_estimation import PPSD
+import importlib
+
+
+def __getattr__(name):
+    # PPSD is only imported on first access (PEP 562), importing it means
+    # importing matplotlib and big parts of SciPy.
+    if name == "PPSD":
+        value = importlib.import_module(".spectral_estimation", __name__).PPSD
+        globals()[name] = value
+        return value
+    msg = "module %r has no attribute %r" % (__name__, name)
+    raise AttributeError(msg)
 
 
 if __name__ == '__main__':
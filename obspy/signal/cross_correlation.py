@@ -18,12 +18,13 @@ Signal processing routines based on cross correlation techniques.
 """
 from bisect import bisect_left
 from copy import copy
+from multiprocessing import Pool
 import warnings
 
 import numpy as np
-import scipy
 
 from obspy import Stream, Trace
+from obspy.core.compatibility import round_away
 from obspy.core.util.misc import MatplotlibBackend
 from obspy.signal.invsim import cosine_taper
 
@@ -40,6 +41,7 @@ def _xcorr_padzeros(a, b, shift, method):
     """
     Cross-correlation using SciPy with mode='valid' and precedent zero padding.
     """
+    import scipy.signal
     if shift is None:
         shift = (len(a) + len(b) - 1) // 2
     dif = len(a) - len(b) - 2 * shift
@@ -54,6 +56,7 @@ def _xcorr_slice(a, b, shift, method):
     """
     Cross-correlation using SciPy with mode='full' and subsequent slicing.
     """
+    import scipy.signal
     mid = (len(a) + len(b) - 1) // 2
     if shift is None:
         shift = mid
@@ -183,6 +186,46 @@ def _window_sum(data, window_len):
     return window_sum[:-window_len]
 
 
+def _normalize_full(cc, sum1, sum2, lent, tnorm):
+    """
+    Normalize cross-correlation of template with every data window.
+
+    :param sum1: Sums of the data in each window, ``None`` if the data
+        is not demeaned.
+    :param sum2: Sums of the squared data in each window, modified in-place
+        if possible.
+    """
+    # in-place equivalent of
+    # if demean:
+    #     norm = ((sum2 - sum1 ** 2 / lent) * tnorm) ** 0.5
+    # else:
+    #      norm = (sum2 * tnorm) ** 0.5
+    # cc = cc / norm
+    if sum1 is not None:
+        norm = sum1 ** 2
+        if norm.dtype == float:
+            norm /= lent
+        else:
+            norm = norm / lent
+        np.subtract(sum2, norm, out=norm)
+    elif sum2.dtype == float:
+        norm = sum2
+    else:
+        norm = sum2.astype(float)
+    norm *= tnorm
+    if norm.dtype == float:
+        np.sqrt(norm, out=norm)
+    else:
+        norm = np.sqrt(norm)
+    mask = norm <= np.finfo(float).eps
+    if cc.dtype == float:
+        cc[~mask] /= norm[~mask]
+    else:
+        cc = cc / norm
+    cc[mask] = 0
+    return cc
+
+
 def correlate_template(data, template, mode='valid', normalize='full',
                        demean=True, method='auto'):
     """
@@ -238,6 +281,7 @@ def correlate_template(data, template, mode='valid', normalize='full',
     >>> round(cc[index], 9)
     1.0
     """
+    import scipy.signal
     # if we get Trace objects, use their data arrays
     if isinstance(data, Trace):
         data = data.data
@@ -270,39 +314,132 @@ def correlate_template(data, template, mode='valid', normalize='full',
             else:
                 pad1, pad2 = (pad + 1) // 2, pad // 2
             data = _pad_zeros(data, pad1, pad2)
-            # in-place equivalent of
-            # if demean:
-            #     norm = ((_window_sum(data ** 2, lent) -
-            #              _window_sum(data, lent) ** 2 / lent) * tnorm) ** 0.5
-            # else:
-            #      norm = (_window_sum(data ** 2, lent) * tnorm) ** 0.5
-            # cc = cc / norm
-            if demean:
-                norm = _window_sum(data, lent) ** 2
-                if norm.dtype == float:
-                    norm /= lent
-                else:
-                    norm = norm / lent
-                np.subtract(_window_sum(data ** 2, lent), norm, out=norm)
-            else:
-                norm = _window_sum(data ** 2, lent)
-            norm *= tnorm
-            if norm.dtype == float:
-                np.sqrt(norm, out=norm)
-            else:
-                norm = np.sqrt(norm)
-            mask = norm <= np.finfo(float).eps
-            if cc.dtype == float:
-                cc[~mask] /= norm[~mask]
-            else:
-                cc = cc / norm
-            cc[mask] = 0
+            cc = _normalize_full(cc, _window_sum(data, lent) if demean else
+                                 None, _window_sum(data ** 2, lent), lent,
+                                 tnorm)
         else:
             msg = "normalize has to be one of (None, 'naive', 'full')"
             raise ValueError(msg)
     return cc
 
 
+def correlate_template_chunks(chunks, template, normalize='full',
+                              demean=True, method='auto'):
+    """
+    Normalized cross-correlation of a template with data arriving in chunks.
+
+    This is a streaming version of
+    :func:`~obspy.signal.cross_correlation.correlate_template` with
+    ``mode='valid'`` for data too long to be held in memory, e.g. a month
+    of continuous data read hour by hour. Only the last ``len(template) - 1``
+    samples of the data are kept between chunks (overlap-save). The running
+    sums for the normalization are continued across chunk boundaries, so that
+    the normalization is exactly the same as for the whole data.
+    The concatenated cross-correlations are equal to the cross-correlation of
+    the concatenated data (exactly equal for ``method='direct'``, up to
+    numerical noise of the FFT otherwise).
+
+    :type chunks: iterable of :class:`~numpy.ndarray` or
+        :class:`~obspy.core.trace.Trace`
+    :param chunks: Consecutive chunks of data. Traces may overlap by some
+        samples (e.g. when created with :meth:`~obspy.core.trace.Trace.slide`
+        the last sample of a window is the first sample of the next window),
+        samples already processed are skipped. A gap between traces raises
+        a :class:`ValueError`.
+    :type template: :class:`~numpy.ndarray`, :class:`~obspy.core.trace.Trace`
+    :param template: Template to correlate with the data.
+    :param normalize: One of ``'full'`` or ``None``, see
+        :func:`~obspy.signal.cross_correlation.correlate_template`.
+        Normalizing by the overall standard deviation of the data
+        (``'naive'``) is not possible for streaming data.
+    :param demean: Demean template beforehand, for ``normalize='full'`` data
+        is demeaned in the window of each correlation value.
+        ``demean=True`` can not be combined with ``normalize=None``, because
+        the mean of all data is not known beforehand.
+    :param str method: Method to use to calculate the correlation, see
+        :func:`~obspy.signal.cross_correlation.correlate_template`.
+    :return: Generator yielding for every chunk the cross-correlation values
+        that can be calculated with the data received so far (possibly an
+        empty array).
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> data = read()[0]
+    >>> template = data[450:550]
+    >>> ccs = list(correlate_template_chunks(
+    ...     data.slide(window_length=10, step=10), template))
+    >>> [len(cc) for cc in ccs]
+    [902, 1000, 999]
+    >>> cc = np.concatenate(ccs)
+    >>> np.allclose(cc, correlate_template(data, template))
+    True
+    """
+    import scipy.signal
+    if normalize not in ('full', None):
+        msg = "normalize has to be one of ('full', None)"
+        raise ValueError(msg)
+    if normalize is None and demean:
+        msg = "demean=True needs normalize='full' for streaming data"
+        raise ValueError(msg)
+    if isinstance(template, Trace):
+        template = template.data
+    template = np.asarray(template)
+    lent = len(template)
+    if demean:
+        template = template - np.mean(template)
+    tnorm = np.sum(template ** 2)
+    # data not yet completely used and the running sums of data and squared
+    # data up to each of these samples, starting with the zero padding of
+    # correlate_template()
+    buffer = None
+    cumsums = None
+    next_time = None
+    for chunk in chunks:
+        if isinstance(chunk, Trace):
+            data = chunk.data
+            if next_time is not None:
+                skip = int(round((next_time - chunk.stats.starttime) *
+                                 chunk.stats.sampling_rate))
+                if skip < 0:
+                    msg = 'Gap in data before {}'.format(
+                        chunk.stats.starttime)
+                    raise ValueError(msg)
+                data = data[skip:]
+                next_time = max(next_time,
+                                chunk.stats.endtime + chunk.stats.delta)
+            else:
+                next_time = chunk.stats.endtime + chunk.stats.delta
+            chunk = data
+        chunk = np.asarray(chunk)
+        if buffer is None:
+            buffer = chunk
+            cumsums = [np.cumsum(_pad_zeros(chunk, 1, 0)),
+                       np.cumsum(_pad_zeros(chunk ** 2, 1, 0))]
+        else:
+            buffer = np.concatenate([buffer, chunk])
+            # continue the running sums exactly like one cumsum over all data
+            cumsums = [
+                np.concatenate([cumsum, np.cumsum(
+                    np.concatenate([cumsum[-1:], data]))[1:]])
+                for cumsum, data in zip(cumsums, (chunk, chunk ** 2))]
+        if len(buffer) < lent:
+            yield np.zeros(0)
+            continue
+        cc = scipy.signal.correlate(buffer, template, mode='valid',
+                                    method=method)
+        if normalize == 'full':
+            # equivalent of _window_sum() over all data
+            sum1, sum2 = [np.subtract(cumsum[lent:], cumsum[:-lent])
+                          for cumsum in cumsums]
+            cc = _normalize_full(cc, sum1 if demean else None, sum2, lent,
+                                 tnorm)
+        yield cc
+        # keep the data still needed for the next cross-correlation values
+        buffer = buffer[len(cc):]
+        cumsums = [cumsum[len(cc):] for cumsum in cumsums]
+
+
 def xcorr_3c(st1, st2, shift_len, components=["Z", "N", "E"],
              full_xcorr=False, abs_max=True):
     """
@@ -619,6 +756,245 @@ def xcorr_pick_correction(pick1, trace1, pick2, trace2, t_before, t_after,
     return (pick2_corr, coeff)
 
 
+_WORKER_WINDOWS = None
+
+
+def _get_pick_window(trace, pick, t_before, t_after, cc_maxlag):
+    """
+    Data of the window around a pick used by :func:`xcorr_pick_correction`.
+
+    Returns the same samples as :meth:`~obspy.core.trace.Trace.slice` or
+    ``None`` if the trace does not cover the window.
+    """
+    start = pick - t_before - (cc_maxlag / 2.0)
+    end = pick + t_after + (cc_maxlag / 2.0)
+    stats = trace.stats
+    if stats.starttime > start or stats.endtime < end:
+        return None
+    i = int(round_away((start - stats.starttime) * stats.sampling_rate))
+    starttime = stats.starttime + i * stats.delta
+    j = i + int(round_away((end - starttime) * stats.sampling_rate)) + 1
+    return trace.data[i:j]
+
+
+def _xcorr_pick_corrections(windows, index1, index2, shift_len, cc_maxlag):
+    """
+    Correlation maximum and its subsample position for pairs of windows.
+
+    Vectorized version of the cross-correlation and the parabola fit of
+    :func:`xcorr_pick_correction` for windows of the same sampling rate.
+    Cross-correlations are calculated with FFTs, the spectrum of each
+    window is calculated only once.
+    """
+    import scipy.fft
+    # spectra of demeaned windows
+    used, index = np.unique(np.concatenate([index1, index2]),
+                            return_inverse=True)
+    index1, index2 = index[:len(index1)], index[len(index1):]
+    lens = np.array([len(windows[i]) for i in used])
+    data = np.zeros((len(used), lens.max()))
+    for row, i in zip(data, used):
+        row[:len(windows[i])] = windows[i]
+        row[:len(windows[i])] -= np.mean(windows[i])
+    energy = np.sum(data ** 2, axis=1)
+    # large enough to avoid wrap around for all lags
+    nfft = scipy.fft.next_fast_len(2 * lens.max() + 2 * shift_len,
+                                   real=True)
+    spectra = scipy.fft.rfft(data, nfft)
+    # first lag and number of lags of correlate(..., method='direct') for
+    # the lengths of each pair, the number of lags can differ by one if the
+    # lengths differ
+    len1, len2 = lens[index1], lens[index2]
+    dif = len1 - len2 - 2 * shift_len
+    first_lag = np.where(dif > 0, dif // 2, -((-dif) // 2))
+    num_lags = len1 - len2 - 2 * first_lag + 1
+    k = np.arange(num_lags.max())
+    pick2_corr = np.full(len(index1), np.nan)
+    coeff = np.full(len(index1), np.nan)
+    block = max(1, 2 ** 22 // nfft)
+    for i in range(0, len(index1), block):
+        j = min(i + block, len(index1))
+        i1, i2 = index1[i:j], index2[i:j]
+        cc = scipy.fft.irfft(spectra[i1] * spectra[i2].conj(), nfft)
+        cc = np.take_along_axis(cc, (k + first_lag[i:j, None]) % nfft, axis=1)
+        norm = (energy[i1] * energy[i2]) ** 0.5
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cc = np.where(norm[:, None] > np.finfo(float).eps,
+                          cc / norm[:, None], 0)
+        # convex part of the cross-correlation around its maximum
+        length = num_lags[i:j, None]
+        valid = k < length
+        peak = np.argmax(np.where(valid, cc, -np.inf), axis=1)[:, None]
+        curvature = np.zeros_like(cc)
+        curvature[:, 1:-1] = np.diff(cc, 2, axis=1)
+        concave = (curvature > 0) & (k < length - 1)
+        first = np.max(np.where(concave & (k < peak), k, -1), axis=1) + 1
+        last = np.min(np.where(concave & (k > peak), k, length), axis=1) - 1
+        # least squares fit of parabola y = a x^2 + b x + c
+        mask = (k >= first[:, None]) & (k <= last[:, None])
+        x = np.where(mask, k - peak, 0).astype(float)
+        y = np.where(mask, cc, 0)
+        sx = [np.sum(mask * x ** n, axis=1) for n in range(5)]
+        sxy = [np.sum(y * x ** n, axis=1) for n in range(3)]
+        fit = last - first + 1 >= 3
+        lhs = np.array([[sx[4], sx[3], sx[2]],
+                        [sx[3], sx[2], sx[1]],
+                        [sx[2], sx[1], sx[0]]]).transpose(2, 0, 1)[fit]
+        rhs = np.array(sxy[::-1]).T[fit]
+        a, b, c = np.linalg.solve(lhs, rhs[:, :, None])[:, :, 0].T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vertex = peak[fit, 0] - b / 2.0 / a
+            coeff[i:j][fit] = c - b ** 2 / (4 * a)
+        # time of vertex on lag axis of xcorr_pick_correction(), the
+        # correction is its negative
+        pick2_corr[i:j][fit] = cc_maxlag - vertex * (cc_maxlag / shift_len)
+    return pick2_corr, coeff
+
+
+def _init_pick_correction_worker(windows):
+    """
+    Set the data windows of a worker process.
+    """
+    global _WORKER_WINDOWS
+    _WORKER_WINDOWS = windows
+
+
+def _pick_correction_worker(args):
+    """
+    Worker function for :func:`xcorr_pick_corrections`.
+    """
+    return _xcorr_pick_corrections(_WORKER_WINDOWS, *args)
+
+
+def xcorr_pick_corrections(picks1, traces1, picks2, traces2, t_before,
+                           t_after, cc_maxlag, filter=None, filter_options={},
+                           processes=1):
+    """
+    Calculate the corrections for many differential pick times at once.
+
+    Batch version of
+    :func:`~obspy.signal.cross_correlation.xcorr_pick_correction` e.g. for
+    measuring differential times of all event pairs for double-difference
+    relocation. Each distinct trace is filtered only once, no matter in how
+    many pairs it is used (pass the same
+    :class:`~obspy.core.trace.Trace` object for all picks on the same
+    waveform), and the spectrum of each distinct window around a pick is
+    calculated only once. The cross-correlations and parabola fits of all
+    pairs are calculated together with vectorized FFTs.
+
+    The results are the same as those of
+    :func:`~obspy.signal.cross_correlation.xcorr_pick_correction` up to
+    numerical noise. Pairs for which
+    :func:`~obspy.signal.cross_correlation.xcorr_pick_correction` raises an
+    error (different sampling rates, windows not covered by the traces,
+    less than three samples for the fit) get ``NaN`` values. No warnings
+    are issued for individual pairs, bad fits have to be sorted out using
+    the returned correlation coefficients.
+
+    :type picks1: list of :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param picks1: Times of first picks of all pairs.
+    :type traces1: list of :class:`~obspy.core.trace.Trace`
+    :param traces1: Waveform data for ``picks1``.
+    :type picks2: list of :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param picks2: Times of second picks of all pairs.
+    :type traces2: list of :class:`~obspy.core.trace.Trace`
+    :param traces2: Waveform data for ``picks2``.
+    :param t_before: Time to start cross correlation window before pick
+        times in seconds.
+    :param t_after: Time to end cross correlation window after pick times in
+        seconds.
+    :param cc_maxlag: Maximum lag/shift time tested during cross correlation
+        in seconds.
+    :param filter: `None` for no filtering or name of filter type as passed
+        on to :meth:`~obspy.core.trace.Trace.filter`.
+    :param filter_options: Filter options that get passed on to
+        :meth:`~obspy.core.trace.Trace.filter` if filtering is used.
+    :param int processes: Number of processes used for the
+        cross-correlations.
+    :rtype: tuple of two :class:`~numpy.ndarray`
+    :returns: Correction times for ``picks2`` and corresponding correlation
+        coefficients of all pairs.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> tr1 = read()[0]
+    >>> tr2 = tr1.copy()
+    >>> tr2.stats.starttime += 100.004
+    >>> pick1 = tr1.stats.starttime + 4.0
+    >>> picks2 = [pick1 + 100, pick1 + 100.01, pick1 + 100.02]
+    >>> dt, coeff = xcorr_pick_corrections(
+    ...     [pick1] * 3, [tr1] * 3, picks2, [tr2] * 3, 0.5, 1.0, 0.2)
+    >>> print(dt.round(3))
+    [ 0.   -0.01 -0.02]
+    """
+    num = len(picks1)
+    if not len(traces1) == len(picks2) == len(traces2) == num:
+        msg = "picks and traces have to be of the same length"
+        raise ValueError(msg)
+    # filtered traces and windows around picks, each calculated only once
+    traces = {}
+    window_ids = {}
+    windows = []
+    sampling_rates = []
+    indices = []
+    for picks, traces_ in ((picks1, traces1), (picks2, traces2)):
+        index = np.empty(num, dtype=int)
+        for i, (pick, tr) in enumerate(zip(picks, traces_)):
+            key = (id(tr), pick._ns)
+            if key not in window_ids:
+                if id(tr) not in traces:
+                    # don't modify existing traces with filters
+                    if filter:
+                        tr = tr.copy()
+                        tr.data = tr.data.astype(np.float64)
+                        tr.detrend(type='demean')
+                        tr.data *= cosine_taper(len(tr), 0.1)
+                        tr.filter(type=filter, **filter_options)
+                    traces[id(traces_[i])] = tr
+                tr = traces[id(traces_[i])]
+                window = _get_pick_window(tr, pick, t_before, t_after,
+                                          cc_maxlag)
+                if window is None:
+                    window_ids[key] = -1
+                else:
+                    window_ids[key] = len(windows)
+                    windows.append(window)
+                    sampling_rates.append(tr.stats.sampling_rate)
+            index[i] = window_ids[key]
+        indices.append(index)
+    index1, index2 = indices
+    sampling_rates = np.array(sampling_rates + [np.nan])
+    sampling_rate = sampling_rates[index1]
+    pick2_corr = np.full(num, np.nan)
+    coeff = np.full(num, np.nan)
+    # pairs of the same sampling rate processed together, possibly split
+    # up among processes
+    tasks = []
+    selections = []
+    for samp_rate in np.unique(sampling_rate[~np.isnan(sampling_rate)]):
+        selection = np.nonzero((sampling_rate == samp_rate) &
+                               (sampling_rates[index2] == samp_rate))[0]
+        shift_len = int(cc_maxlag * samp_rate)
+        if shift_len == 0 or len(selection) == 0:
+            continue
+        step = -(-len(selection) // processes)
+        for i in range(0, len(selection), step):
+            selections.append(selection[i:i + step])
+            tasks.append((index1[selections[-1]], index2[selections[-1]],
+                          shift_len, cc_maxlag))
+    if processes == 1:
+        results = [_xcorr_pick_corrections(windows, *task) for task in tasks]
+    else:
+        with Pool(processes, initializer=_init_pick_correction_worker,
+                  initargs=(windows, )) as pool:
+            results = pool.map(_pick_correction_worker, tasks)
+    for selection, (pick2_corr_, coeff_) in zip(selections, results):
+        pick2_corr[selection] = pick2_corr_
+        coeff[selection] = coeff_
+    return pick2_corr, coeff
+
+
 def templates_max_similarity(st, time, streams_templates):
     """
     Compares all event templates in the streams_templates list of streams
@@ -742,6 +1118,24 @@ def _prep_streams_correlate(stream, template, template_time=None):
     Select traces in stream and template with the same seed id and trim
     stream to correct start and end times.
     """
+    stream, template, slices, starttime = _get_correlation_slices(
+        stream, template, template_time=template_time)
+    for i, (tr, (t1, t2)) in enumerate(zip(stream, slices)):
+        tr = tr.slice(t1, t2)
+        tr.stats.starttime = starttime
+        stream.traces[i] = tr
+    return stream, template
+
+
+def _get_correlation_slices(stream, template, template_time=None):
+    """
+    Select traces in stream and template with the same seed id and determine
+    the time spans of the stream traces needed for cross-correlation.
+
+    :returns: Sorted streams of selected data and template traces, list of
+        start and end times to slice the data traces with and the start time
+        of the cross-correlations.
+    """
     if len({tr.stats.sampling_rate for tr in stream + template}) > 1:
         raise ValueError('Traces have different sampling rate')
     ids = {tr.id for tr in stream} & {tr.id for tr in template}
@@ -771,11 +1165,8 @@ def _prep_streams_correlate(stream, template, template_time=None):
              for trt in template]
     trim1 = [t - min(trim1) for t in trim1]
     trim2 = [t - max(trim2) for t in trim2]
-    for i, tr in enumerate(stream):
-        tr = tr.slice(starttime + trim1[i], endtime + trim2[i])
-        tr.stats.starttime = starttime + template_offset
-        stream.traces[i] = tr
-    return stream, template
+    slices = [(starttime + t1, endtime + t2) for t1, t2 in zip(trim1, trim2)]
+    return stream, template, slices, starttime + template_offset
 
 
 def _correlate_prepared_stream_template(stream, template, **kwargs):
@@ -856,6 +1247,216 @@ def _calc_mean(stream):
     return Trace(data=np.mean(matrix, axis=0), header=header)
 
 
+def _plan_template_correlation(stream, template, template_time=None,
+                               demean=True):
+    """
+    Determine which parts of the data traces are correlated with the traces
+    of one template, see :func:`correlate_stream_template`.
+
+    :returns: Start time and number of samples of the cross-correlations,
+        list of warning messages and for every channel a tuple of SEED id,
+        template data, offset of the correlated data in the data trace and
+        number of correlated samples.
+    """
+    stream, template, slices, starttime = _get_correlation_slices(
+        stream, template, template_time=template_time)
+    channels = []
+    for tr, trt, (t1, t2) in zip(stream, template, slices):
+        sliced = tr.slice(t1, t2)
+        offset = int(round((sliced.stats.starttime - tr.stats.starttime) *
+                           tr.stats.sampling_rate))
+        data = np.asarray(trt.data, dtype=np.float64)
+        if sliced.stats.npts < len(data):
+            raise ValueError('Data must not be shorter than template.')
+        if demean:
+            data = data - np.mean(data)
+        channels.append((tr.id, data, offset, sliced.stats.npts))
+    # make sure xcorrs have the same length, can differ by one sample
+    lens = {npts - len(data) + 1 for _, data, _, npts in channels}
+    messages = []
+    if len(lens) > 1:
+        messages.append('Samples of traces are slightly misaligned. '
+                        'Use Stream.interpolate if this is not intended.')
+        if max(lens) - min(lens) > 1:
+            msg = 'This should not happen. Please contact the developers.'
+            raise RuntimeError(msg)
+    return starttime, min(lens), messages, channels
+
+
+def _correlate_templates_fft(stream, templates, template_times=None,
+                             normalize='full', demean=True):
+    """
+    Similarities of many templates with the data, using shared FFTs of the
+    data.
+
+    The similarity is the mean of the cross-correlations of all channels,
+    like calculated with :func:`correlate_stream_template` and
+    :func:`_calc_mean`. The data of each channel is cut into overlapping
+    chunks (overlap-save method). The FFT of each chunk is calculated once
+    for a block of templates and multiplied with the spectra of all
+    templates of the block, the inverse FFTs are done in one batch. The
+    normalization is calculated from running sums of the data in each chunk
+    and the cross-correlations are directly stacked per template.
+
+    :returns: List with a tuple for every template, holding the similarity
+        trace (or the :class:`ValueError` if the template can not be used)
+        and a list of warning messages.
+    """
+    import scipy.fft
+    if normalize not in ('full', None):
+        msg = "normalize has to be one of ('full', None)"
+        raise ValueError(msg)
+    # slicing traces with only the necessary header information is faster
+    header_keys = ('network', 'station', 'location', 'channel', 'starttime',
+                   'sampling_rate')
+    stream = Stream([Trace(data=tr.data, header={
+        key: tr.stats[key] for key in header_keys}) for tr in stream])
+    plans = []
+    for template_id, template in enumerate(templates):
+        template_time = _get_item(template_times, template_id)
+        try:
+            plans.append(_plan_template_correlation(
+                stream, template, template_time=template_time,
+                demean=demean))
+        except ValueError as ex:
+            plans.append(ex)
+    similarities = [None if isinstance(plan, ValueError) else
+                    np.zeros(plan[1]) for plan in plans]
+    eps = np.finfo(float).eps
+    # add up cross-correlations in the same order as _calc_mean does
+    for tr in sorted(stream, key=lambda tr: tr.id):
+        x = np.asarray(tr.data, dtype=np.float64)
+        if demean:
+            # the templates are demeaned, so removing the mean of the data
+            # does not change the cross-correlations, but keeps the running
+            # sums of the normalization accurate for data with an offset
+            x = x - np.mean(x)
+        entries = []
+        for similarity, plan in zip(similarities, plans):
+            if similarity is None:
+                continue
+            for id_, data, offset, npts in plan[3]:
+                if id_ != tr.id:
+                    continue
+                if normalize is None and demean:
+                    # data is demeaned in the correlated time span
+                    correction = np.mean(x[offset:offset + npts]) * np.sum(
+                        data)
+                else:
+                    correction = 0
+                entries.append((similarity, data, offset,
+                                np.sum(data ** 2) ** 0.5, correction))
+        if not entries:
+            continue
+        max_len = max(len(data) for _, data, _, _, _ in entries)
+        nfft = scipy.fft.next_fast_len(
+            min(len(x), max(2 ** 17, 4 * max_len)), real=True)
+        step = nfft - max_len + 1
+        # limit the memory used for the spectra of a block of templates
+        block_size = max(2 ** 22 // nfft, 1)
+        for i in range(0, len(entries), block_size):
+            block = entries[i:i + block_size]
+            spectra = np.zeros((len(block), max_len))
+            for row, (_, data, _, _, _) in zip(spectra, block):
+                row[:len(data)] = data
+            spectra = np.conj(scipy.fft.rfft(spectra, n=nfft, axis=-1))
+            first = min(offset for _, _, offset, _, _ in block)
+            last = max(offset + len(similarity)
+                       for similarity, _, offset, _, _ in block)
+            for start in range(first, last, step):
+                chunk = x[start:start + nfft]
+                ccs = scipy.fft.irfft(scipy.fft.rfft(chunk, n=nfft) * spectra,
+                                      n=nfft, axis=-1)
+                # running sums for the normalization, per template length
+                sums = {}
+                for (similarity, data, offset, tnorm, correction), cc in zip(
+                        block, ccs):
+                    lent = len(data)
+                    # part of the chunk needed for this template
+                    i1 = max(offset - start, 0)
+                    i2 = min(offset + len(similarity) - start, step,
+                             len(chunk) - lent + 1)
+                    if i1 >= i2:
+                        continue
+                    cc = cc[i1:i2]
+                    if normalize is None:
+                        cc -= correction
+                    else:
+                        if lent not in sums:
+                            # root of the (demeaned) energy of the data in
+                            # each window, shared by templates of same length
+                            cumsum = np.zeros(len(chunk) + 1)
+                            np.cumsum(chunk ** 2, out=cumsum[1:])
+                            energy = cumsum[lent:] - cumsum[:-lent]
+                            if demean:
+                                np.cumsum(chunk, out=cumsum[1:])
+                                energy -= (cumsum[lent:] -
+                                           cumsum[:-lent]) ** 2 / lent
+                            sums[lent] = np.sqrt(energy, out=energy)
+                        norm = sums[lent][i1:i2] * tnorm
+                        mask = norm <= eps
+                        np.divide(cc, norm, out=cc, where=~mask)
+                        cc[mask] = 0
+                    j = start + i1 - offset
+                    similarity[j:j + len(cc)] += cc
+    result = []
+    for template, plan, similarity in zip(templates, plans, similarities):
+        if similarity is None:
+            result.append((plan, []))
+            continue
+        starttime, _, messages, channels = plan
+        similarity /= len(channels)
+        header = dict(sampling_rate=template[0].stats.sampling_rate,
+                      starttime=starttime)
+        result.append((Trace(data=similarity, header=header), messages))
+    return result
+
+
+# data used by the worker processes of correlation_detector()
+_WORKER_STREAM = None
+
+
+def _init_detector_worker(stream):
+    """
+    Set the data stream of a worker process.
+    """
+    global _WORKER_STREAM
+    _WORKER_STREAM = stream
+
+
+def _detector_worker(args):
+    """
+    Worker function for :func:`_correlate_templates`.
+    """
+    templates, template_times, kwargs = args
+    return _correlate_templates_fft(_WORKER_STREAM, templates,
+                                    template_times=template_times, **kwargs)
+
+
+def _correlate_templates(stream, templates, template_times=None,
+                         processes=1, **kwargs):
+    """
+    Run :func:`_correlate_templates_fft` for groups of templates in
+    ``processes`` worker processes.
+    """
+    if len(templates) == 0:
+        return []
+    if processes == 1:
+        return _correlate_templates_fft(stream, templates,
+                                        template_times=template_times,
+                                        **kwargs)
+    num = -(-len(templates) // processes)
+    tasks = [(templates[i:i + num],
+              [_get_item(template_times, j)
+               for j in range(i, min(i + num, len(templates)))],
+              kwargs)
+             for i in range(0, len(templates), num)]
+    with Pool(processes, initializer=_init_detector_worker,
+              initargs=(stream, )) as pool:
+        results = pool.map(_detector_worker, tasks)
+    return [result for results_ in results for result in results_]
+
+
 def _find_peaks(data, height, holdon_samples, holdoff_samples):
     """
     Peak finding function used for Scipy versions smaller than 1.1.
@@ -983,7 +1584,7 @@ def correlation_detector(stream, templates, heights, distance,
                          template_times=None, template_magnitudes=None,
                          template_names=None,
                          similarity_func=_calc_mean, details=None,
-                         plot=None, **kwargs):
+                         plot=None, processes=1, **kwargs):
     """
     Detector based on the cross-correlation of waveforms.
 
@@ -1028,6 +1629,8 @@ def correlation_detector(stream, templates, heights, distance,
         with the detections. If a stream is passed as argument, the traces
         in the stream will be plotted together with the similarity traces and
         detections.
+    :param processes: Number of processes to calculate the similarities of
+        the templates in.
     :param kwargs: Suitable kwargs are passed to
         :func:`~obspy.signal.cross_correlation.correlate_template` function.
         All other kwargs are passed to :func:`~scipy.signal.find_peaks`.
@@ -1055,26 +1658,54 @@ def correlation_detector(stream, templates, heights, distance,
 
     A more advanced :ref:`tutorial <correlation-detector-tutorial>`
     is available.
+
+    .. note::
+        With the default similarity function, without details, with
+        ``normalize='full'`` or ``None`` and ``method`` other than
+        ``'direct'``, the similarities of all templates are calculated
+        together using FFTs, the FFT of every chunk of the data is shared by
+        many templates. Otherwise the templates are correlated one after the
+        other with
+        :func:`~obspy.signal.cross_correlation.correlate_stream_template`
+        in one process.
     """
     if isinstance(templates, Stream):
         templates = [templates]
     cckeys = ('normalize', 'demean', 'method')
     cckwargs = {k: v for k, v in kwargs.items() if k in cckeys}
     pfkwargs = {k: v for k, v in kwargs.items() if k not in cckeys}
+    batched = (similarity_func is _calc_mean and not details and
+               cckwargs.get('normalize', 'full') in ('full', None) and
+               cckwargs.get('method', 'auto') != 'direct' and
+               len({tr.id for tr in stream}) == len(stream))
+    if batched:
+        results = _correlate_templates(
+            stream, templates, template_times=template_times,
+            processes=processes,
+            **{k: v for k, v in cckwargs.items() if k != 'method'})
     possible_detections = []
     similarities = []
     for template_id, template in enumerate(templates):
         template_time = _get_item(template_times, template_id)
         try:
-            ccs = correlate_stream_template(stream, template,
-                                            template_time=template_time,
-                                            **cckwargs)
+            if batched:
+                similarity, messages = results[template_id]
+                if isinstance(similarity, ValueError):
+                    raise similarity
+                for msg in messages:
+                    warnings.warn(msg)
+                ccs = None
+            else:
+                ccs = correlate_stream_template(stream, template,
+                                                template_time=template_time,
+                                                **cckwargs)
         except ValueError as ex:
             msg = '{} -> do not use template {}'.format(ex, template_id)
             warnings.warn(msg)
             similarities.append(None)
             continue
-        similarity = similarity_func(ccs)
+        if not batched:
+            similarity = similarity_func(ccs)
         height = _get_item(heights, template_id)
         detections_template = _similarity_detector(
             similarity, height, distance, details=details,
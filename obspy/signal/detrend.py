@@ -10,7 +10,6 @@ Python module containing detrend methods.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import numpy as np
-from scipy.interpolate import LSQUnivariateSpline
 
 
 def simple(data):
@@ -165,6 +164,7 @@ def spline(data, order, dspline, plot=False):
 
         spline(tr.data, order=2, dspline=1000, plot=True)
     """
+    from scipy.interpolate import LSQUnivariateSpline
     # Convert data if it's not a floating point type.
     if not np.issubdtype(data.dtype, np.floating):
         data = np.require(data, dtype=np.float64)
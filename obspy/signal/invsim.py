@@ -26,7 +26,6 @@ import warnings
 from pathlib import Path
 
 import numpy as np
-import scipy.signal
 
 from obspy.core.util.attribdict import AttribDict
 from obspy.core.util.base import NamedTemporaryFile
@@ -375,6 +374,7 @@ def paz_to_freq_resp(poles, zeros, scale_fac, t_samp, nfft, freq=False):
     :rtype: :class:`numpy.ndarray` complex128
     :return: Frequency response of PAZ of length nfft
     """
+    import scipy.signal
     n = nfft // 2
     b, a = scipy.signal.zpk2tf(zeros, poles, scale_fac)
     # a has to be a list for the scipy.signal.freqs() call later but zpk2tf()
@@ -602,6 +602,7 @@ def simulate_seismometer(
         data = simple_detrend(data)
     if shsim:
         # detrend using least squares
+        import scipy.signal
         data = scipy.signal.detrend(data, type="linear")
     # correct for involved overall sensitivities
     if paz_remove and remove_sensitivity and not seedresp:
@@ -20,25 +20,19 @@ Various Routines Related to Spectral Estimation
 import bisect
 import glob
 import math
+import os
+from multiprocessing import Pool
 from pathlib import Path
 import warnings
 
 import numpy as np
-from matplotlib import mlab
-from matplotlib.colors import LinearSegmentedColormap
-from matplotlib.ticker import FormatStrFormatter
-from matplotlib.patheffects import withStroke
 
 from obspy import Stream, Trace, UTCDateTime, __version__
 from obspy.core import Stats
-from obspy.imaging.scripts.scan import compress_start_end
 from obspy.core.inventory import Inventory
 from obspy.core.util import AttribDict
 from obspy.core.util.base import MATPLOTLIB_VERSION
 from obspy.core.util.obspy_types import ObsPyException
-from obspy.imaging.cm import obspy_sequential
-from obspy.imaging.util import _set_xaxis_obspy_dates
-from obspy.io.xseed import Parser
 from obspy.signal.invsim import cosine_taper
 from obspy.signal.util import prev_pow_2
 from obspy.signal.invsim import paz_to_freq_resp, evalresp
@@ -200,6 +194,65 @@ def welch_window(n):
     return taper
 
 
+def _psd_batch(data, nfft, noverlap, sampling_rate):
+    """
+    Welch power spectral densities of all rows of a 2-D array at once.
+
+    Gives the same results as calling :func:`matplotlib.mlab.psd` with
+    ``detrend=mlab.detrend_linear``, ``window=fft_taper``,
+    ``sides='onesided'`` and ``scale_by_freq=True`` on every row, but
+    detrends and transforms all overlapping segments of all rows in one
+    go. The operations are done in the same order as in matplotlib, so the
+    results are identical down to the last bit.
+
+    :type data: :class:`numpy.ndarray`
+    :param data: 2-D float64 array, one time window per row.
+    :type nfft: int
+    :param nfft: Length of the segments used for the Welch averaging.
+    :type noverlap: int
+    :param noverlap: Overlap of adjacent segments in samples.
+    :type sampling_rate: float
+    :param sampling_rate: Sampling rate of the data.
+    :returns: 2-D array of power spectral densities (one row for each input
+        row) and 1-D array of frequencies, same as for
+        :func:`matplotlib.mlab.psd`.
+    """
+    # all segments of all windows, shape (windows, segments, nfft)
+    segments = np.lib.stride_tricks.sliding_window_view(
+        data, nfft, axis=-1)[:, ::nfft - noverlap]
+    # linear detrend of every segment like mlab.detrend_linear, which gets
+    # slope and offset from numpy.cov
+    x = np.arange(nfft, dtype=np.float64)
+    centered = np.empty(segments.shape[:2] + (2, nfft))
+    centered[..., 0, :] = x
+    centered[..., 1, :] = segments
+    mean = centered.mean(axis=-1)
+    centered -= mean[..., np.newaxis]
+    cov = np.matmul(centered, centered.swapaxes(-1, -2)) * (1.0 / nfft)
+    del centered
+    slope = cov[..., 0, 1] / cov[..., 0, 0]
+    offset = mean[..., 1] - slope * mean[..., 0]
+    result = segments - (slope[..., np.newaxis] * x +
+                         offset[..., np.newaxis])
+    window = fft_taper(np.ones(nfft, dtype=np.float64))
+    result = result * window
+    num_freqs = nfft // 2 + 1
+    result = np.fft.fft(result, n=nfft, axis=-1)[..., :num_freqs]
+    result = np.conj(result) * result
+    # scale everything except the DC and (for even nfft) Nyquist component
+    if not nfft % 2:
+        result[..., 1:-1] *= 2.0
+    else:
+        result[..., 1:] *= 2.0
+    result /= sampling_rate
+    result /= (window ** 2).sum()
+    psd = result.mean(axis=1).real
+    freqs = np.fft.fftfreq(nfft, 1 / sampling_rate)[:num_freqs]
+    if not nfft % 2:
+        freqs[-1] *= -1
+    return psd, freqs
+
+
 class PPSD(object):
     """
     Class to compile probabilistic power spectral densities for one combination
@@ -256,6 +309,15 @@ class PPSD(object):
 
     >>> ppsd = PPSD.load_npz("myfile.npz")  # doctest: +SKIP
 
+    For PPSD results spanning many years, results can be appended to a
+    directory based store instead, that allows loading only the time windows
+    of a given time range without reading all psds:
+
+    >>> ppsd.save_store("mystore")  # doctest: +SKIP
+    >>> ppsd = PPSD.load_store(
+    ...     "mystore", starttime=UTCDateTime(2015, 1, 1),
+    ...     endtime=UTCDateTime(2015, 2, 1))  # doctest: +SKIP
+
     .. note::
 
         When using metadata from an
@@ -309,6 +371,8 @@ class PPSD(object):
     NPZ_SIMPLE_TYPE_MAP_R = {v: i for i, v in NPZ_SIMPLE_TYPE_MAP.items()}
     # Add current version as a class attribute to avoid hard coding it.
     _CURRENT_VERSION = 3
+    # Maximum number of histograms of different selections kept up to date
+    _HISTOGRAM_CACHE_SIZE = 32
 
     def __init__(self, stats, metadata, skip_on_gaps=False,
                  db_bins=(-200, -50, 1.), ppsd_length=3600.0, overlap=0.5,
@@ -486,6 +550,10 @@ class PPSD(object):
         self._current_hist_stack_cumulative = None
         self._current_times_used = []
         self._current_times_all_details = []
+        # histograms of recently used selections, updated with the psds
+        # of time windows added in the meantime (logged in _times_added)
+        self._histogram_cache = {}
+        self._times_added = []
 
     @property
     def network(self):
@@ -714,11 +782,13 @@ class PPSD(object):
         Replaces old
         `obspy.signal.spectral_estimation.PPSD.__insert_used_time()`
         private method and the addition ot the histogram stack that was
-        performed directly in
-        :meth:`obspy.signal.spectral_estimation.PPSD.__process()`.
+        performed directly in the old
+        `obspy.signal.spectral_estimation.PPSD.__process()`.
 
         :type utcdatetime: :class:`~obspy.core.utcdatetime.UTCDateTime`
-        :type spectrum: :class:`numpy.ndarray`
+        :type spectrum: :class:`numpy.ndarray` or None
+        :param spectrum: Binned spectrum or `None` to only reserve the time,
+            the spectrum then has to be filled in later.
         """
         t = utcdatetime._ns
         ind = bisect.bisect(self._times_processed, t)
@@ -880,63 +950,86 @@ class PPSD(object):
         # merge depending on skip_on_gaps set during __init__
         stream.merge(self.merge_method, fill_value=0)
 
-        for tr in stream:
-            # the following check should not be necessary due to the select()..
-            if not self.__sanity_check(tr):
-                msg = "Skipping incompatible trace."
-                warnings.warn(msg)
-                continue
-            t1 = tr.stats.starttime
-            t2 = tr.stats.endtime
-            if t1 + self.ppsd_length - tr.stats.delta > t2:
-                msg = (f"Trace is shorter than this PPSD's 'ppsd_length' "
-                       f"({str(self.ppsd_length)} seconds). Skipping trace: "
-                       f"{str(tr)}")
-                warnings.warn(msg)
-                continue
-            while t1 + self.ppsd_length - tr.stats.delta <= t2:
-                if self.__check_time_present(t1):
-                    msg = "Already covered time spans detected (e.g. %s), " + \
-                          "skipping these slices."
-                    msg = msg % t1
+        # windows waiting to be processed in one batch and responses already
+        # evaluated during this call
+        windows = []
+        responses = {}
+        batch_size = self._get_batch_size()
+        try:
+            for tr in stream:
+                # the following check should not be necessary due to the
+                # select()..
+                if not self.__sanity_check(tr):
+                    msg = "Skipping incompatible trace."
                     warnings.warn(msg)
-                else:
-                    # throw warnings if trace length is different
-                    # than ppsd_length..!?!
-                    slice = tr.slice(t1, t1 + self.ppsd_length -
-                                     tr.stats.delta)
-                    # XXX not good, should be working in place somehow
-                    # XXX how to do it with the padding, though?
-                    success = self.__process(slice, t1)
-                    if success:
-                        if verbose:
-                            print(t1)
-                        changed = True
-                t1 += self.step  # advance
-
-            # enforce time limits, pad zeros if gaps
-            # tr.trim(t, t+PPSD_LENGTH, pad=True)
+                    continue
+                t1 = tr.stats.starttime
+                t2 = tr.stats.endtime
+                if t1 + self.ppsd_length - tr.stats.delta > t2:
+                    msg = (f"Trace is shorter than this PPSD's 'ppsd_length' "
+                           f"({str(self.ppsd_length)} seconds). Skipping "
+                           f"trace: {str(tr)}")
+                    warnings.warn(msg)
+                    continue
+                while t1 + self.ppsd_length - tr.stats.delta <= t2:
+                    if self.__check_time_present(t1):
+                        msg = "Already covered time spans detected " + \
+                              "(e.g. %s), skipping these slices."
+                        msg = msg % t1
+                        warnings.warn(msg)
+                    else:
+                        # throw warnings if trace length is different
+                        # than ppsd_length..!?!
+                        slice = tr.slice(t1, t1 + self.ppsd_length -
+                                         tr.stats.delta)
+                        window = self.__prepare_window(slice, responses)
+                        if window is not None:
+                            # reserve the time right away, so that
+                            # overlapping windows are detected like before
+                            self.__insert_processed_data(t1, None)
+                            windows.append((t1, ) + window)
+                            if verbose:
+                                print(t1)
+                            changed = True
+                            if len(windows) >= batch_size:
+                                self.__process_windows(windows)
+                                windows = []
+                    t1 += self.step  # advance
+            self.__process_windows(windows)
+        except BaseException:
+            # do not leave reserved times without psd behind
+            for t, _, _ in windows:
+                ind = bisect.bisect_left(self._times_processed, t._ns)
+                del self._times_processed[ind]
+                del self._binned_psds[ind]
+            raise
         if changed:
             self.__invalidate_histogram()
         return changed
 
-    def __process(self, tr, t):
+    def _get_batch_size(self):
+        """
+        Number of psd segments processed together in
+        :meth:`PPSD.add`, chosen to keep memory usage moderate.
+        """
+        num_segments = (self.len - self.nlap) // (self.nfft - self.nlap)
+        return max(1, 2 ** 20 // (max(num_segments, 1) * self.nfft))
+
+    def __prepare_window(self, tr, responses):
         """
-        Processes a segment of data and save the psd information.
+        Checks a segment of data and looks up the instrument response for it.
         Whether `Trace` is compatible (station, channel, ...) has to
         checked beforehand.
 
         :type tr: :class:`~obspy.core.trace.Trace`
         :param tr: Compatible Trace with data of one PPSD segment
-        :type t: :class:`~obspy.core.utcdatetime.UTCDateTime`
-        :param t: Start time of the time window the data was cut for. This can
-            be different usually on a subsample scale and then in some cases
-            can lead to a directly following time segment being left out as
-            they seem to overlap.
-        :returns: `True` if segment was successfully processed,
-            `False` otherwise.
+        :type responses: dict
+        :param responses: Responses already evaluated, see
+            :meth:`PPSD._get_response_cached`.
+        :returns: Tuple of data as float64 array and instrument response
+            (``None`` for `special_handling="ringlaser"`), or `None` if the
+            segment can not be used.
         """
-
         # XXX DIRTY HACK!!
         if len(tr) == self.len + 1:
             tr.data = tr.data[:-1]
@@ -945,16 +1038,9 @@ class PPSD(object):
             msg = ("Got a piece of data with wrong length. Skipping:\n" +
                    str(tr))
             warnings.warn(msg)
-            return False
-        # being paranoid, only necessary if in-place operations would follow
-        tr.data = tr.data.astype(np.float64)
+            return None
         # if trace has a masked array we fill in zeros
-        try:
-            tr.data[tr.data.mask] = 0.0
-        # if it is no masked array, we get an AttributeError
-        # and have nothing to do
-        except AttributeError:
-            pass
+        data = np.ma.filled(tr.data.astype(np.float64), 0.0)
 
         # restitution:
         # mcnamara apply the correction at the end in freq-domain,
@@ -962,17 +1048,44 @@ class PPSD(object):
         # probably should be done earlier on bigger chunk of data?!
         # Yes, you should avoid removing the response until after you
         # have estimated the spectra to avoid elevated lp noise
+        if self.special_handling == "ringlaser":
+            return data, None
+        # special_handling "hydrophone" does instrument correction same as
+        # "normal" data
+        # determine instrument response from metadata
+        try:
+            resp = self._get_response_cached(tr, responses)
+        except Exception as e:
+            msg = ("Error getting response from provided metadata:\n"
+                   "%s: %s\n"
+                   "Skipping time segment(s).")
+            msg = msg % (e.__class__.__name__, str(e))
+            warnings.warn(msg)
+            return None
+        return data, resp
 
-        spec, _freq = mlab.psd(tr.data, self.nfft, self.sampling_rate,
-                               detrend=mlab.detrend_linear, window=fft_taper,
-                               noverlap=self.nlap, sides='onesided',
-                               scale_by_freq=True)
+    def __process_windows(self, windows):
+        """
+        Processes segments of data prepared by
+        :meth:`PPSD.__prepare_window` and saves the psd information at the
+        times reserved for them.
 
-        # leave out first entry (offset)
-        spec = spec[1:]
+        :type windows: list
+        :param windows: List of tuples of start time of the time window the
+            data was cut for, data and instrument response.
+        """
+        if not windows:
+            return
+        data = np.empty((len(windows), self.len), dtype=np.float64)
+        for i, (_, window_data, _) in enumerate(windows):
+            data[i] = window_data
+        spec, _freq = _psd_batch(data, self.nfft, self.nlap,
+                                 self.sampling_rate)
+        del data
 
+        # leave out first entry (offset)
         # working with the periods not frequencies later so reverse spectrum
-        spec = spec[::-1]
+        spec = spec[:, :0:-1]
 
         # Here we remove the response using the same conventions
         # since the power is squared we want to square the sensitivity
@@ -980,27 +1093,19 @@ class PPSD(object):
         if self.special_handling == "ringlaser":
             # in case of rotational data just remove sensitivity
             spec /= self.metadata['sensitivity'] ** 2
-        # special_handling "hydrophone" does instrument correction same as
-        # "normal" data
         else:
-            # determine instrument response from metadata
-            try:
-                resp = self._get_response(tr)
-            except Exception as e:
-                msg = ("Error getting response from provided metadata:\n"
-                       "%s: %s\n"
-                       "Skipping time segment(s).")
-                msg = msg % (e.__class__.__name__, str(e))
-                warnings.warn(msg)
-                return False
-
-            resp = resp[1:]
-            resp = resp[::-1]
-            # Now get the amplitude response (squared)
-            respamp = np.absolute(resp * np.conjugate(resp))
+            # Now get the amplitude response (squared), once for every
+            # distinct response
+            respamps = {}
+            for _, _, resp in windows:
+                if id(resp) not in respamps:
+                    resp_ = resp[:0:-1]
+                    respamps[id(resp)] = np.absolute(
+                        resp_ * np.conjugate(resp_))
+            respamp = np.array([respamps[id(resp)]
+                                for _, _, resp in windows])
             # Make omega with the same conventions as spec
-            w = 2.0 * math.pi * _freq[1:]
-            w = w[::-1]
+            w = 2.0 * math.pi * _freq[:0:-1]
             # Here we do the response removal
             if self.special_handling in ("hydrophone", "infrasound"):
                 spec = spec / respamp
@@ -1015,16 +1120,37 @@ class PPSD(object):
         spec = np.log10(spec)
         spec *= 10
 
-        smoothed_psd = []
-        # do this for the whole period range and append the values to our lists
-        for per_left, per_right in zip(self.period_bin_left_edges,
-                                       self.period_bin_right_edges):
-            specs = spec[(per_left <= self.psd_periods) &
-                         (self.psd_periods <= per_right)]
-            smoothed_psd.append(specs.mean())
-        smoothed_psd = np.array(smoothed_psd, dtype=np.float32)
-        self.__insert_processed_data(t, smoothed_psd)
-        return True
+        smoothed_psds = self._smooth_psds(spec)
+        for (t, _, _), smoothed_psd in zip(windows, smoothed_psds):
+            ind = bisect.bisect_left(self._times_processed, t._ns)
+            self._binned_psds[ind] = smoothed_psd
+        if self._histogram_cache:
+            self._times_added.extend(t._ns for t, _, _ in windows)
+
+    def _smooth_psds(self, spec):
+        """
+        Averages psds (in dB, one per row) over the period range of every
+        period bin.
+
+        The psd periods in every bin are a contiguous range, so all bins are
+        summed up with one :meth:`numpy.ufunc.reduceat` call, which gives the
+        same values as taking the mean of every bin separately.
+        """
+        starts = np.searchsorted(self.psd_periods, self.period_bin_left_edges,
+                                 side="left")
+        ends = np.searchsorted(self.psd_periods, self.period_bin_right_edges,
+                               side="right")
+        counts = ends - starts
+        # sum over [start, end) at even indices, junk at odd indices. the
+        # extra column makes an index at the end of the spectrum valid.
+        padded = np.zeros((spec.shape[0], spec.shape[1] + 1))
+        padded[:, :-1] = spec
+        indices = np.column_stack([starts, ends]).ravel()
+        sums = np.add.reduceat(padded, indices, axis=1)[:, ::2]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            smoothed = sums / counts
+        smoothed[:, counts == 0] = np.nan
+        return smoothed.astype(np.float32)
 
     def _get_times_all_details(self):
         # check if we can reuse a previously cached array of all times as
@@ -1034,44 +1160,40 @@ class PPSD(object):
         # otherwise compute it and store it for subsequent stacks on the
         # same data (has to be recomputed when additional data gets added)
         else:
-            dtype = np.dtype([('time_of_day', np.float32),
-                              ('iso_weekday', np.int8),
-                              ('iso_week', np.int8),
-                              ('year', np.int16),
-                              ('month', np.int8)])
-            times_all_details = np.empty(shape=len(self._times_processed),
-                                         dtype=dtype)
-            utc_times_all = [UTCDateTime(ns=t) for t in self._times_processed]
-            times_all_details['time_of_day'][:] = \
-                [t._get_hours_after_midnight() for t in utc_times_all]
-            times_all_details['iso_weekday'][:] = \
-                [t.isoweekday() for t in utc_times_all]
-            times_all_details['iso_week'][:] = \
-                [t.isocalendar()[1] for t in utc_times_all]
-            times_all_details['year'][:] = \
-                [t.year for t in utc_times_all]
-            times_all_details['month'][:] = [t.month for t in utc_times_all]
+            times_all_details = _get_times_details(self._times_processed)
             self._current_times_all_details = times_all_details
             return times_all_details
 
     def _stack_selection(self, starttime=None, endtime=None,
                          time_of_weekday=None, year=None, month=None,
-                         isoweek=None, callback=None):
+                         isoweek=None, callback=None, times=None):
         """
         For details on restrictions see :meth:`calculate_histogram`.
 
+        :type times: list[int]
+        :param times: Start times of psd pieces to evaluate the selection
+            for, as nanosecond POSIX timestamps. By default all processed
+            psd pieces are evaluated.
         :rtype: :class:`numpy.ndarray` of bool
         :returns: Boolean array of which psd pieces should be included in the
             stack.
         """
-        times_all = np.array(self._times_processed)
+        def get_times_details():
+            if times is None:
+                return self._get_times_all_details()
+            return _get_times_details(times_all)
+
+        if times is None:
+            times_all = np.array(self._times_processed)
+        else:
+            times_all = np.array(times, dtype=np.int64)
         selected = np.ones(len(times_all), dtype=bool)
         if starttime is not None:
             selected &= times_all >= starttime._ns
         if endtime is not None:
             selected &= times_all <= endtime._ns
         if time_of_weekday is not None:
-            times_all_details = self._get_times_all_details()
+            times_all_details = get_times_details()
             # we need to do a logical OR over all different user specified time
             # windows, so we start with an array of False and set all matching
             # pieces True for the final logical AND against the previous
@@ -1092,7 +1214,7 @@ class PPSD(object):
                 year[0]
             except TypeError:
                 year = [year]
-            times_all_details = self._get_times_all_details()
+            times_all_details = get_times_details()
             selected_ = times_all_details['year'] == year[0]
             for year_ in year[1:]:
                 selected_ |= times_all_details['year'] == year_
@@ -1102,13 +1224,13 @@ class PPSD(object):
                 month[0]
             except TypeError:
                 month = [month]
-            times_all_details = self._get_times_all_details()
+            times_all_details = get_times_details()
             selected_ = times_all_details['month'] == month[0]
             for month_ in month[1:]:
                 selected_ |= times_all_details['month'] == month_
             selected &= selected_
         if isoweek is not None:
-            times_all_details = self._get_times_all_details()
+            times_all_details = get_times_details()
             selected_ = times_all_details['iso_week'] == isoweek[0]
             for isoweek_ in isoweek[1:]:
                 selected_ |= times_all_details['iso_week'] == isoweek_
@@ -1200,60 +1322,58 @@ class PPSD(object):
             self._current_times_used = []
             return
 
-        # determine which psd pieces should be used in the stack,
-        # based on all selection criteria specified by user
-        selected = self._stack_selection(
-            starttime=starttime, endtime=endtime,
-            time_of_weekday=time_of_weekday, year=year, month=month,
-            isoweek=isoweek, callback=callback)
-        used_indices = selected.nonzero()[0]
-        used_count = len(used_indices)
-        used_times = np.array(self._times_processed)[used_indices]
-
-        num_period_bins = len(self.period_bin_centers)
-        num_db_bins = len(self.db_bin_centers)
-
-        # initial setup of 2D histogram
-        hist_stack = np.zeros((num_period_bins, num_db_bins), dtype=np.uint64)
+        # reuse the histogram of the same selection calculated before if
+        # possible, then only psds added in the meantime have to be counted
+        key = None
+        if callback is None:
+            key = _get_selection_key(starttime, endtime, time_of_weekday,
+                                     year, month, isoweek)
+        entry = self._histogram_cache.pop(key, None)
+        if entry is not None and self.__histogram_cache_valid(entry):
+            hist_stack, used_times = entry["hist_stack"], entry["used_times"]
+            new_times = self._times_added[entry["times_added"]:]
+            if new_times:
+                selected = self._stack_selection(
+                    starttime=starttime, endtime=endtime,
+                    time_of_weekday=time_of_weekday, year=year, month=month,
+                    isoweek=isoweek, times=new_times)
+                new_times = np.array(new_times, dtype=np.int64)[selected]
+                used_indices = [
+                    bisect.bisect_left(self._times_processed, t)
+                    for t in new_times.tolist()]
+                hist_stack = hist_stack + self._get_histogram_counts(
+                    used_indices)
+                used_times = np.insert(
+                    used_times, used_times.searchsorted(new_times),
+                    new_times)
+        else:
+            # determine which psd pieces should be used in the stack,
+            # based on all selection criteria specified by user
+            selected = self._stack_selection(
+                starttime=starttime, endtime=endtime,
+                time_of_weekday=time_of_weekday, year=year, month=month,
+                isoweek=isoweek, callback=callback)
+            used_indices = selected.nonzero()[0]
+            used_times = np.array(self._times_processed,
+                                  dtype=np.int64)[used_indices]
+            hist_stack = self._get_histogram_counts(used_indices)
+        if key is not None:
+            self._histogram_cache[key] = {
+                "hist_stack": hist_stack, "used_times": used_times,
+                "times_processed": self._times_processed,
+                "binned_psds": self._binned_psds,
+                "count": len(self._times_processed),
+                "times_added": len(self._times_added)}
+            self.__trim_histogram_cache()
 
         # empty selection, set all histogram stacks to zeros
-        if not used_count:
+        if not len(used_times):
             self._current_hist_stack = hist_stack
             self._current_hist_stack_cumulative = np.zeros_like(
                 hist_stack, dtype=np.float32)
             self._current_times_used = used_times
             return
 
-        # concatenate all used spectra, evaluate index of amplitude bin each
-        # value belongs to
-        inds = np.hstack([self._binned_psds[i] for i in used_indices])
-        # for "inds" now a number of ..
-        #   - 0 means below lowest bin (bin index 0)
-        #   - 1 means, hit lowest bin (bin index 0)
-        #   - ..
-        #   - len(self.db_bin_edges) means above top bin
-        # we need minus one because searchsorted returns the insertion index in
-        # the array of bin edges which is the index of the corresponding bin
-        # plus one
-        inds = self.db_bin_edges.searchsorted(inds, side="left") - 1
-        # for "inds" now a number of ..
-        #   - -1 means below lowest bin (bin index 0)
-        #   - 0 means, hit lowest bin (bin index 0)
-        #   - ..
-        #   - (len(self.db_bin_edges)-1) means above top bin
-        # values that are left of first bin edge have to be moved back into the
-        # binning
-        inds[inds == -1] = 0
-        # same goes for values right of last bin edge
-        inds[inds == num_db_bins] -= 1
-        # reshape such that we can iterate over the array, extracting for
-        # each period bin an array of all amplitude bins we have hit
-        inds = inds.reshape((used_count, num_period_bins)).T
-        for i, inds_ in enumerate(inds):
-            # count how often each bin has been hit for this period bin,
-            # set the current 2D histogram column accordingly
-            hist_stack[i, :] = np.bincount(inds_, minlength=num_db_bins)
-
         # calculate and set the cumulative version (i.e. going from 0 to 1 from
         # low to high psd values for every period column) of the current
         # histogram stack.
@@ -1271,11 +1391,87 @@ class PPSD(object):
         self._current_hist_stack_cumulative = hist_stack_cumul
         self._current_times_used = used_times
 
+    def _get_histogram_counts(self, indices):
+        """
+        Counts how often each amplitude bin is hit for every period bin by
+        the psds with the given indices.
+
+        :rtype: :class:`numpy.ndarray`
+        :returns: 2D histogram of shape (number of period bins, number of db
+            bins).
+        """
+        num_period_bins = len(self.period_bin_centers)
+        num_db_bins = len(self.db_bin_centers)
+
+        # initial setup of 2D histogram
+        hist_stack = np.zeros((num_period_bins, num_db_bins), dtype=np.uint64)
+
+        # go through the used spectra in blocks to keep memory usage low (psds
+        # loaded with load_store() are only read from disk here)
+        block_size = max(2 ** 20 // num_period_bins, 1)
+        for i in range(0, len(indices), block_size):
+            block = indices[i:i + block_size]
+            # stack used spectra, evaluate index of amplitude bin each value
+            # belongs to
+            inds = np.vstack([self._binned_psds[j] for j in block])
+            # for "inds" now a number of ..
+            #   - 0 means below lowest bin (bin index 0)
+            #   - 1 means, hit lowest bin (bin index 0)
+            #   - ..
+            #   - len(self.db_bin_edges) means above top bin
+            # we need minus one because searchsorted returns the insertion
+            # index in the array of bin edges which is the index of the
+            # corresponding bin plus one
+            inds = self.db_bin_edges.searchsorted(inds, side="left") - 1
+            # for "inds" now a number of ..
+            #   - -1 means below lowest bin (bin index 0)
+            #   - 0 means, hit lowest bin (bin index 0)
+            #   - ..
+            #   - (len(self.db_bin_edges)-1) means above top bin
+            # values that are left of first bin edge have to be moved back
+            # into the binning
+            inds[inds == -1] = 0
+            # same goes for values right of last bin edge
+            inds[inds == num_db_bins] -= 1
+            # count how often each amplitude bin has been hit for every period
+            # bin in one go, using the index into the flattened 2D histogram
+            inds += np.arange(num_period_bins) * num_db_bins
+            counts = np.bincount(inds.ravel(), minlength=hist_stack.size)
+            hist_stack += counts.reshape(hist_stack.shape).astype(np.uint64)
+        return hist_stack
+
+    def __histogram_cache_valid(self, entry):
+        """
+        Checks if a cached histogram can be updated with the psds added since
+        it was calculated, i.e. if no psds were added or removed in other
+        ways (e.g. by directly modifying the lists of psds and times).
+        """
+        return (entry["times_processed"] is self._times_processed and
+                entry["binned_psds"] is self._binned_psds and
+                entry["count"] + len(self._times_added) -
+                entry["times_added"] == len(self._times_processed))
+
+    def __trim_histogram_cache(self):
+        """
+        Drops least recently used histograms from the cache and shortens the
+        log of added psds to what is still needed by cached histograms.
+        """
+        while len(self._histogram_cache) > self._HISTOGRAM_CACHE_SIZE:
+            del self._histogram_cache[next(iter(self._histogram_cache))]
+        start = min((entry["times_added"]
+                     for entry in self._histogram_cache.values()),
+                    default=len(self._times_added))
+        if start:
+            del self._times_added[:start]
+            for entry in self._histogram_cache.values():
+                entry["times_added"] -= start
+
     def _get_response(self, tr):
         # check type of metadata and use the correct subroutine
         # first, to save some time, tried to do this in __init__ like:
         #   self._get_response = self._get_response_from_inventory
         # but that makes the object non-picklable
+        from obspy.io.xseed import Parser
         if isinstance(self.metadata, Inventory):
             return self._get_response_from_inventory(tr)
         elif isinstance(self.metadata, Parser):
@@ -1288,6 +1484,33 @@ class PPSD(object):
             msg = "Unexpected type for `metadata`: %s" % type(self.metadata)
             raise TypeError(msg)
 
+    def _get_response_cached(self, tr, responses):
+        """
+        Same as :meth:`PPSD._get_response` but evaluates every response only
+        once for an :class:`~obspy.core.inventory.inventory.Inventory` (once
+        per channel epoch) or a poles and zeros dictionary.
+
+        :type responses: dict
+        :param responses: Responses evaluated so far, filled by this method.
+        """
+        if isinstance(self.metadata, Inventory):
+            response = self.metadata.get_response(self.id, tr.stats.starttime)
+            # also keep a reference to the response, so its id stays unique
+            key = id(response)
+            if key not in responses:
+                resp, _ = response.get_evalresp_response(
+                    t_samp=self.delta, nfft=self.nfft, output="VEL")
+                responses[key] = (response, resp)
+            return responses[key][1]
+        elif isinstance(self.metadata, dict):
+            # poles and zeros do not depend on time
+            if "paz" not in responses:
+                responses["paz"] = (
+                    None, self._get_response_from_paz_dict(tr))
+            return responses["paz"][1]
+        # RESP files and Parser objects have to be evaluated for every time
+        return self._get_response(tr)
+
     def _get_response_from_inventory(self, tr):
         inventory = self.metadata
         response = inventory.get_response(self.id, tr.stats.starttime)
@@ -1497,36 +1720,46 @@ class PPSD(object):
         for filename in glob.glob(filename):
             self._add_npz(filename, allow_pickle=allow_pickle)
 
+    def _check_npz_compatibility(self, data):
+        """
+        Checks that PPSD results stored in an npz file were computed with the
+        same settings as the current PPSD instance.
+
+        Raises an :class:`AssertionError` on any mismatch, differing version
+        numbers only emit a warning.
+        """
+        # check ppsd_version version and raise if higher than current
+        _check_npz_ppsd_version(self, data)
+        # check if all metadata agree
+        for key in self.NPZ_STORE_KEYS_SIMPLE_TYPES:
+            value_ = data[key].item()
+            value = self.NPZ_SIMPLE_TYPE_MAP_R.get(value_, value_)
+            if getattr(self, key) != value:
+                msg = ("Mismatch in '%s' attribute.\n\tCurrent:\n\t%s\n\t"
+                       "Loaded:\n\t%s")
+                msg = msg % (key, getattr(self, key), data[key].item())
+                raise AssertionError(msg)
+        for key in self.NPZ_STORE_KEYS_ARRAY_TYPES:
+            try:
+                np.testing.assert_array_equal(getattr(self, key),
+                                              data[key])
+            except AssertionError as e:
+                msg = ("Mismatch in '%s' attribute.\n") % key
+                raise AssertionError(msg + str(e))
+        for key in self.NPZ_STORE_KEYS_VERSION_NUMBERS:
+            if getattr(self, key) != data[key].item():
+                msg = ("Mismatch in version numbers (%s) between current "
+                       "data (%s) and loaded data (%s).") % (
+                           key, getattr(self, key), data[key].item())
+                warnings.warn(msg)
+
     def _add_npz(self, filename, allow_pickle=False):
         """
         See :meth:`PPSD.add_npz()`.
         """
         def _add(data):
-            # check ppsd_version version and raise if higher than current
-            _check_npz_ppsd_version(self, data)
-            # check if all metadata agree
-            for key in self.NPZ_STORE_KEYS_SIMPLE_TYPES:
-                value_ = data[key].item()
-                value = self.NPZ_SIMPLE_TYPE_MAP_R.get(value_, value_)
-                if getattr(self, key) != value:
-                    msg = ("Mismatch in '%s' attribute.\n\tCurrent:\n\t%s\n\t"
-                           "Loaded:\n\t%s")
-                    msg = msg % (key, getattr(self, key), data[key].item())
-                    raise AssertionError(msg)
-            for key in self.NPZ_STORE_KEYS_ARRAY_TYPES:
-                try:
-                    np.testing.assert_array_equal(getattr(self, key),
-                                                  data[key])
-                except AssertionError as e:
-                    msg = ("Mismatch in '%s' attribute.\n") % key
-                    raise AssertionError(msg + str(e))
+            self._check_npz_compatibility(data)
             # load new psd data
-            for key in self.NPZ_STORE_KEYS_VERSION_NUMBERS:
-                if getattr(self, key) != data[key].item():
-                    msg = ("Mismatch in version numbers (%s) between current "
-                           "data (%s) and loaded data (%s).") % (
-                               key, getattr(self, key), data[key].item())
-                    warnings.warn(msg)
             _times_data = data["_times_data"].tolist()
             _times_gaps = data["_times_gaps"].tolist()
             _times_processed = [d_ for d_ in data["_times_processed"]]
@@ -1550,6 +1783,8 @@ class PPSD(object):
                     duplicates += 1
                     continue
                 self.__insert_processed_data(t, psd)
+                if self._histogram_cache:
+                    self._times_added.append(t._ns)
             # warn if some segments were omitted
             if duplicates:
                 msg = ("%d/%d segments omitted in file '%s' "
@@ -1566,6 +1801,140 @@ class PPSD(object):
                    "of PPSD.load_npz to True")
             raise ValueError(msg)
 
+    def save_store(self, directory):
+        """
+        Saves the PPSD to a directory based store, appending to PPSD results
+        already stored there.
+
+        In contrast to :meth:`save_npz`, psds are stored uncompressed in one
+        2-D array per year, so that :meth:`load_store` can memory map them and
+        only needs to read the psds of a requested time range. Only the psds
+        of the years with new time windows are rewritten. Time windows
+        already covered by stored results are not added again (a warning is
+        emitted if any segments are omitted).
+
+        :type directory: str
+        :param directory: Directory of the store, it is created if it does
+            not exist yet.
+        """
+        os.makedirs(directory, exist_ok=True)
+        header_filename = os.path.join(directory, "ppsd.npz")
+        times_data = np.array(self._times_data, dtype=np.int64).reshape(-1, 2)
+        times_gaps = np.array(self._times_gaps, dtype=np.int64).reshape(-1, 2)
+        times = np.array(self._times_processed, dtype=np.int64)
+        psds = np.array(self._binned_psds, dtype=np.float32).reshape(
+            len(times), len(self.period_bin_centers))
+        if os.path.exists(header_filename):
+            with np.load(header_filename) as data:
+                self._check_npz_compatibility(data)
+                times_data = np.unique(
+                    np.vstack([data["_times_data"], times_data]), axis=0)
+                times_gaps = np.unique(
+                    np.vstack([data["_times_gaps"], times_gaps]), axis=0)
+            # omit time windows overlapping stored ones by more than the
+            # overlap, like add_npz() does
+            stored = [np.load(_get_ppsd_store_filenames(directory, year)[0])
+                      for year in _get_ppsd_store_years(directory)]
+            stored = np.sort(np.concatenate([np.empty(0, np.int64)] + stored))
+            if len(stored) and len(times):
+                ind = stored.searchsorted(times)
+                left = stored[np.clip(ind - 1, 0, len(stored) - 1)]
+                right = stored[np.clip(ind, 0, len(stored) - 1)]
+                covered = ((np.abs(times - left) < self.step * 1e9) |
+                           (np.abs(right - times) < self.step * 1e9))
+                if covered.any():
+                    msg = ("%d/%d segments omitted in store '%s' (time ranges "
+                           "already covered).")
+                    msg = msg % (covered.sum(), len(times), directory)
+                    warnings.warn(msg)
+                    times = times[~covered]
+                    psds = psds[~covered]
+        years = _ns_to_years(times)
+        for year in np.unique(years):
+            times_filename, psds_filename = \
+                _get_ppsd_store_filenames(directory, year)
+            times_ = times[years == year]
+            psds_ = psds[years == year]
+            if os.path.exists(times_filename):
+                times_ = np.concatenate([np.load(times_filename), times_])
+                psds_ = np.concatenate([np.load(psds_filename), psds_])
+                order = np.argsort(times_, kind="stable")
+                times_ = times_[order]
+                psds_ = psds_[order]
+            _save_npy(psds_filename, psds_)
+            _save_npy(times_filename, times_)
+        out = {}
+        for key in (self.NPZ_STORE_KEYS_ARRAY_TYPES +
+                    self.NPZ_STORE_KEYS_SIMPLE_TYPES +
+                    self.NPZ_STORE_KEYS_VERSION_NUMBERS):
+            value = getattr(self, key)
+            if key in self.NPZ_STORE_KEYS_SIMPLE_TYPES:
+                value = self.NPZ_SIMPLE_TYPE_MAP.get(value, value)
+            out[key] = value
+        out["_times_data"] = times_data
+        out["_times_gaps"] = times_gaps
+        tmp_filename = os.path.join(directory, "ppsd.tmp.npz")
+        np.savez(tmp_filename, **out)
+        os.replace(tmp_filename, header_filename)
+
+    @staticmethod
+    def load_store(directory, starttime=None, endtime=None, metadata=None):
+        """
+        Load PPSD results from a store written with :meth:`save_store`.
+
+        Only time windows starting in the given time range are loaded. Their
+        psds are memory mapped, so that they are only read from disk when
+        they are used, e.g. in :meth:`calculate_histogram`,
+        :meth:`extract_psd_values` or when plotting. This allows to look at
+        parts of PPSD results spanning many years without loading all psds.
+
+        :type directory: str
+        :param directory: Directory of the store.
+        :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param starttime: If set, time windows starting before the specified
+            time are not loaded.
+        :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param endtime: If set, time windows starting after the specified
+            time are not loaded.
+        :type metadata: :class:`~obspy.core.inventory.inventory.Inventory` or
+            :class:`~obspy.io.xseed.parser.Parser` or str or dict
+        :param metadata: Response information of instrument. See notes in
+            :meth:`PPSD.__init__` for details.
+        """
+        t1 = -np.inf if starttime is None else starttime._ns
+        t2 = np.inf if endtime is None else endtime._ns
+        ppsd = PPSD(Stats(), metadata=metadata)
+        with np.load(os.path.join(directory, "ppsd.npz")) as data:
+            _check_npz_ppsd_version(ppsd, data)
+            for key in (ppsd.NPZ_STORE_KEYS_ARRAY_TYPES +
+                        ppsd.NPZ_STORE_KEYS_SIMPLE_TYPES +
+                        ppsd.NPZ_STORE_KEYS_VERSION_NUMBERS):
+                data_ = data[key]
+                if key not in ppsd.NPZ_STORE_KEYS_ARRAY_TYPES:
+                    data_ = data_.item()
+                    data_ = ppsd.NPZ_SIMPLE_TYPE_MAP_R.get(data_, data_)
+                setattr(ppsd, key, data_)
+            # only keep data and gap time spans touching the time range
+            for key in ("_times_data", "_times_gaps"):
+                setattr(ppsd, key, [[start, end]
+                                    for start, end in data[key].tolist()
+                                    if end >= t1 and start <= t2])
+        for year in _get_ppsd_store_years(directory):
+            if year < _ns_to_years(t1) or year > _ns_to_years(t2):
+                continue
+            times_filename, psds_filename = \
+                _get_ppsd_store_filenames(directory, year)
+            times = np.load(times_filename)
+            start = times.searchsorted(t1, side="left")
+            end = times.searchsorted(t2, side="right")
+            if start == end:
+                continue
+            psds = np.load(psds_filename, mmap_mode="r")
+            ppsd._times_processed.extend(times[start:end].tolist())
+            ppsd._binned_psds.extend(psds[start:end])
+        ppsd.ppsd_version = PPSD._CURRENT_VERSION
+        return ppsd
+
     def _split_lists(self, times, psds):
         """
         """
@@ -1593,7 +1962,7 @@ class PPSD(object):
         """
         return self._split_lists(self.times_processed, self.psd_values)
 
-    def plot_spectrogram(self, cmap=obspy_sequential, clim=None, grid=True,
+    def plot_spectrogram(self, cmap=None, clim=None, grid=True,
                          filename=None, show=True):
         """
         Plot the temporal evolution of the PSD in a spectrogram-like plot.
@@ -1617,6 +1986,11 @@ class PPSD(object):
         :param show: Enable/disable immediately showing the plot.
         """
         import matplotlib.pyplot as plt
+        from obspy.imaging.cm import obspy_sequential
+        from obspy.imaging.util import _set_xaxis_obspy_dates
+
+        if cmap is None:
+            cmap = obspy_sequential
 
         fig, ax = plt.subplots()
 
@@ -1743,6 +2117,7 @@ class PPSD(object):
         :param show: Enable/disable immediately showing the plot.
         """
         import matplotlib.pyplot as plt
+        from obspy.imaging.util import _set_xaxis_obspy_dates
 
         try:
             len(period)
@@ -1836,7 +2211,7 @@ class PPSD(object):
              show_percentiles=False, percentiles=[0, 25, 50, 75, 100],
              show_noise_models=True, grid=True, show=True,
              max_percentage=None, period_lim=(0.01, 179), show_mode=False,
-             show_mean=False, cmap=obspy_sequential, cumulative=False,
+             show_mean=False, cmap=None, cumulative=False,
              cumulative_number_of_colors=20, xaxis_frequency=False,
              show_earthquakes=None):
         """
@@ -1895,8 +2270,9 @@ class PPSD(object):
         :type show_mean: bool, optional
         :param show_mean: Enable/disable plotting of mean psd values.
         :type cmap: :class:`matplotlib.colors.Colormap`
-        :param cmap: Colormap to use for the plot. To use the color map like in
-            PQLX, [McNamara2004]_ use :class:`obspy.imaging.cm.pqlx`.
+        :param cmap: Colormap to use for the plot. If not specified, then the
+            default ObsPy sequential colormap is used. To use the color map
+            like in PQLX, [McNamara2004]_ use :class:`obspy.imaging.cm.pqlx`.
         :type cumulative: bool
         :param cumulative: Can be set to `True` to show a cumulative
             representation of the histogram, i.e. showing color coded for each
@@ -1912,6 +2288,13 @@ class PPSD(object):
             in Hertz as opposed to the default of period in seconds.
         """
         import matplotlib.pyplot as plt
+        from matplotlib.colors import LinearSegmentedColormap
+        from matplotlib.patheffects import withStroke
+        from matplotlib.ticker import FormatStrFormatter
+        from obspy.imaging.cm import obspy_sequential
+
+        if cmap is None:
+            cmap = obspy_sequential
         self.__check_histogram()
         fig = plt.figure()
         fig.ppsd = AttribDict()
@@ -2173,6 +2556,7 @@ class PPSD(object):
         """
         Helper function to plot coverage into given axes.
         """
+        from obspy.imaging.scripts.scan import compress_start_end
         ax.figure
         ax.clear()
         ax.xaxis_date()
@@ -2209,6 +2593,278 @@ class PPSD(object):
         ax.autoscale_view()
 
 
+def _get_ppsd_store_filenames(directory, year):
+    """
+    Filenames of the times and psds of one year in a PPSD store.
+    """
+    return (os.path.join(directory, "times_processed.%04d.npy" % year),
+            os.path.join(directory, "psd_values.%04d.npy" % year))
+
+
+def _get_ppsd_store_years(directory):
+    """
+    Sorted list of all years in a PPSD store.
+    """
+    filenames = glob.glob(os.path.join(directory, "times_processed.*.npy"))
+    return sorted(int(os.path.basename(f).split(".")[1]) for f in filenames)
+
+
+def _ns_to_years(ns):
+    """
+    Years of nanosecond POSIX timestamps, infinite timestamps are mapped to
+    years far out of range.
+    """
+    if np.isscalar(ns) and np.isinf(ns):
+        return -10000 if ns < 0 else 10000
+    ns = np.asarray(ns, dtype=np.int64)
+    return ns.astype("datetime64[ns]").astype("datetime64[Y]").astype(
+        np.int64) + 1970
+
+
+def _get_selection_key(starttime, endtime, time_of_weekday, year, month,
+                       isoweek):
+    """
+    Hashable key of a selection of psds for
+    :meth:`PPSD.calculate_histogram`.
+    """
+    def as_tuple(value):
+        if value is None:
+            return None
+        try:
+            return tuple(value)
+        except TypeError:
+            return (value, )
+
+    if time_of_weekday is not None:
+        time_of_weekday = tuple(tuple(x) for x in time_of_weekday)
+    if starttime is not None:
+        starttime = starttime._ns
+    if endtime is not None:
+        endtime = endtime._ns
+    return (starttime, endtime, time_of_weekday, as_tuple(year),
+            as_tuple(month), as_tuple(isoweek))
+
+
+def _get_times_details(times):
+    """
+    Time of day, ISO weekday, ISO week, year and month of nanosecond POSIX
+    timestamps.
+
+    Gives the same values as the respective :class:`UTCDateTime` properties,
+    i.e. timestamps are rounded to microseconds first.
+
+    :rtype: :class:`numpy.ndarray`
+    :returns: Structured array with fields ``'time_of_day'`` (in float
+        hours), ``'iso_weekday'``, ``'iso_week'``, ``'year'`` and
+        ``'month'``.
+    """
+    dtype = np.dtype([('time_of_day', np.float32),
+                      ('iso_weekday', np.int8),
+                      ('iso_week', np.int8),
+                      ('year', np.int16),
+                      ('month', np.int8)])
+    times = np.asarray(times, dtype=np.int64)
+    # round to microseconds, halfway cases to even like round() does
+    us, remainder = np.divmod(times, 1000)
+    us += (remainder > 500) | ((remainder == 500) & (us % 2 == 1))
+    days = us.astype("datetime64[us]").astype("datetime64[D]")
+    details = np.empty(len(times), dtype=dtype)
+    us_of_day = (us - days.astype("datetime64[us]").astype(np.int64))
+    details['time_of_day'] = (us_of_day / 1e6) / 3600.0
+    # 1970-01-01 was a Thursday
+    weekday = (days.astype(np.int64) + 3) % 7
+    details['iso_weekday'] = weekday + 1
+    # the ISO week is the week of the year of the Thursday of the same week
+    thursdays = days - weekday + 3
+    day_of_year = thursdays - thursdays.astype("datetime64[Y]")
+    details['iso_week'] = day_of_year.astype(np.int64) // 7 + 1
+    years = days.astype("datetime64[Y]")
+    details['year'] = years.astype(np.int64) + 1970
+    details['month'] = (days.astype("datetime64[M]") -
+                        years.astype("datetime64[M]")).astype(np.int64) + 1
+    return details
+
+
+def _save_npy(filename, array):
+    """
+    Saves an array to an npy file, replacing an existing file only after
+    the new one has been written completely.
+    """
+    tmp_filename = filename[:-len(".npy")] + ".tmp.npy"
+    np.save(tmp_filename, array)
+    os.replace(tmp_filename, filename)
+
+
+# metadata used by the worker processes of calculate_sds_ppsds()
+_WORKER_METADATA = None
+
+
+def _init_sds_worker(metadata):
+    """
+    Set the metadata of a worker process.
+    """
+    global _WORKER_METADATA
+    _WORKER_METADATA = metadata
+
+
+def _sds_ppsd_worker(args):
+    """
+    Worker function for :func:`calculate_sds_ppsds`.
+    """
+    return _sds_ppsd_day(*args, metadata=_WORKER_METADATA)
+
+
+def _get_sds_checkpoint_filename(checkpoint_dir, seed_id, day):
+    """
+    Filename of the checkpoint of one channel and day.
+    """
+    return os.path.join(checkpoint_dir, seed_id, "%s.%04d.%03d.npz" % (
+        seed_id, day.year, day.julday))
+
+
+def _sds_ppsd_day(client, seed_id, day, filename, kwargs, metadata):
+    """
+    Updates the PPSD checkpoint of one channel and day.
+
+    Nothing is done if no data file of the day was modified after the
+    checkpoint was written. Otherwise the psds of the checkpoint are reused
+    and only the psds of new time windows are computed.
+
+    :returns: ``True`` if the checkpoint was written, ``False`` otherwise.
+    """
+    network, station, location, channel = seed_id.split(".")
+    ppsd_length = kwargs.get("ppsd_length", 3600.0)
+    step = ppsd_length * (1.0 - kwargs.get("overlap", 0.5))
+    # all time windows starting on this day, the last one reaches into the
+    # next day
+    endtime = day + 86400 - step + ppsd_length
+    data_files = client._get_filenames(network, station, location, channel,
+                                       day, endtime)
+    if not data_files:
+        return False
+    data_mtime = max(os.path.getmtime(f) for f in data_files)
+    if os.path.exists(filename) and os.path.getmtime(filename) >= data_mtime:
+        return False
+    st = client.get_waveforms(network, station, location, channel, day,
+                              endtime)
+    if not st:
+        return False
+    ppsd = PPSD(st[0].stats, metadata, **kwargs)
+    if os.path.exists(filename):
+        # reuse psds computed before, add() then skips these time windows
+        old = PPSD.load_npz(filename)
+        # checkpoints computed with different settings are recomputed
+        compatible = all(
+            np.array_equal(getattr(old, key), getattr(ppsd, key))
+            for key in PPSD.NPZ_STORE_KEYS_ARRAY_TYPES) and all(
+            getattr(old, key) == getattr(ppsd, key)
+            for key in PPSD.NPZ_STORE_KEYS_SIMPLE_TYPES)
+        if compatible:
+            ppsd._times_processed = old._times_processed
+            ppsd._binned_psds = old._binned_psds
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", "Already covered time spans",
+                                UserWarning)
+        ppsd.add(st)
+    if not ppsd._times_processed:
+        return False
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    # write to a temporary file first, so that an interrupted run does not
+    # leave a broken checkpoint behind
+    tmp_filename = filename[:-len(".npz")] + ".tmp.npz"
+    ppsd.save_npz(tmp_filename)
+    os.replace(tmp_filename, filename)
+    # data files modified while this day was processed will be newer than
+    # the checkpoint
+    os.utime(filename, (data_mtime, data_mtime))
+    return True
+
+
+def calculate_sds_ppsds(sds_root, seed_ids, starttime, endtime, metadata,
+                        checkpoint_dir, processes=1, sds_type="D",
+                        format="MSEED", **kwargs):
+    """
+    Calculate PPSDs of many channels of a SeisComP Data Structure (SDS)
+    archive, in parallel and incrementally.
+
+    Every channel is processed day by day, for every day the PPSD results
+    are stored as a checkpoint with :meth:`PPSD.save_npz` in
+    ``checkpoint_dir``. When called again, days whose data files did not
+    change since their checkpoint was written are not read at all, and for
+    days with new data (e.g. the current day in a nightly run) only the psds
+    of time windows not in :attr:`PPSD.times_processed` of the checkpoint
+    are computed. Finally the daily results of every channel are merged.
+
+    .. note::
+        Time windows are aligned to the start of every day (or the start of
+        the first data after a gap), so results can differ slightly from
+        adding all data of a channel to one PPSD in one go.
+
+    :type sds_root: str
+    :param sds_root: Root directory of the SDS archive, see
+        :class:`obspy.clients.filesystem.sds.Client`.
+    :type seed_ids: list[str]
+    :param seed_ids: SEED IDs of all channels to process, e.g.
+        ``["IU.ANMO.00.LHZ"]``.
+    :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param starttime: Start of time range to process, the whole day of the
+        start time is processed.
+    :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param endtime: End of time range to process (days starting before the
+        end time are processed).
+    :type metadata: :class:`~obspy.core.inventory.inventory.Inventory` or
+        :class:`~obspy.io.xseed.parser.Parser` or str or dict
+    :param metadata: Response information of all channels, see
+        :meth:`PPSD.__init__`.
+    :type checkpoint_dir: str
+    :param checkpoint_dir: Directory to store the daily PPSD results in.
+    :type processes: int
+    :param processes: Number of processes to process channels and days in.
+    :type sds_type: str
+    :param sds_type: SDS data type identifier.
+    :type format: str
+    :param format: File format of the SDS archive.
+    :param kwargs: Additional keyword arguments passed on to
+        :class:`PPSD`, e.g. ``ppsd_length``. These have to stay the same
+        between calls, otherwise checkpoints are recomputed.
+    :rtype: dict
+    :returns: Dictionary with merged :class:`PPSD` for every SEED ID with
+        data in the time range.
+    """
+    from obspy.clients.filesystem.sds import Client
+    client = Client(sds_root, sds_type=sds_type, format=format)
+    days = []
+    day = UTCDateTime(starttime.date)
+    while day < endtime:
+        days.append(day)
+        day += 86400
+    tasks = [(client, seed_id, day,
+              _get_sds_checkpoint_filename(checkpoint_dir, seed_id, day),
+              kwargs)
+             for seed_id in seed_ids for day in days]
+    if processes == 1:
+        for task in tasks:
+            _sds_ppsd_day(*task, metadata=metadata)
+    else:
+        with Pool(processes, initializer=_init_sds_worker,
+                  initargs=(metadata, )) as pool:
+            for _ in pool.imap_unordered(_sds_ppsd_worker, tasks):
+                pass
+
+    ppsds = {}
+    for seed_id in seed_ids:
+        filenames = [_get_sds_checkpoint_filename(checkpoint_dir, seed_id,
+                                                  day) for day in days]
+        filenames = [f for f in filenames if os.path.exists(f)]
+        if not filenames:
+            continue
+        ppsd = PPSD.load_npz(filenames[0], metadata=metadata)
+        for filename in filenames[1:]:
+            ppsd._add_npz(filename)
+        ppsds[seed_id] = ppsd
+    return ppsds
+
+
 def get_nlnm():
     """
     Returns periods and psd values for the New Low Noise Model.
@@ -13,8 +13,8 @@ from obspy.core.util import AttribDict
 from obspy.core.util.libnames import _load_cdll
 from obspy.signal.cross_correlation import (
     correlate, correlate_template, correlate_stream_template,
-    correlation_detector,
-    xcorr_pick_correction, xcorr_3c, xcorr_max,
+    correlate_template_chunks, correlation_detector,
+    xcorr_pick_correction, xcorr_pick_corrections, xcorr_3c, xcorr_max,
     _xcorr_padzeros, _xcorr_slice, _find_peaks)
 from obspy.signal.trigger import coincidence_trigger
 
@@ -221,6 +221,49 @@ class TestCrossCorrelation:
         assert tr1 == tr1_copy
         assert tr2 == tr2_copy
 
+    def test_xcorr_pick_corrections(self, testdata):
+        """
+        Batch pick corrections are the same as single pick corrections.
+        """
+        tr1 = read(testdata['BW.UH1._.EHZ.D.2010.147.a.slist.gz'])[0]
+        tr2 = read(testdata['BW.UH1._.EHZ.D.2010.147.b.slist.gz'])[0]
+        tr1_copy = tr1.copy()
+        t1 = UTCDateTime("2010-05-27T16:24:33.315000Z")
+        t2 = UTCDateTime("2010-05-27T16:27:30.585000Z")
+        picks1 = [t1, t2, t1 + 0.011, t1, t1]
+        traces1 = [tr1, tr2, tr1, tr1, tr1]
+        picks2 = [t2, t1, t2 - 0.023, t2 + 0.014, t2]
+        traces2 = [tr2, tr1, tr2, tr2, tr2]
+        # trace not covering the window and different sampling rate
+        picks1.extend([tr1.stats.starttime, t1])
+        traces1.extend([tr1, tr1])
+        picks2.extend([t2, t2])
+        traces2.extend([tr2, tr2.copy().resample(50)])
+        for kwargs in ({}, {'filter': 'bandpass',
+                            'filter_options': {'freqmin': 1,
+                                               'freqmax': 10}}):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                expected = [xcorr_pick_correction(
+                    pick1, tr1_, pick2, tr2_, 0.05, 0.2, 0.1, **kwargs)
+                    for pick1, tr1_, pick2, tr2_ in zip(
+                        picks1[:5], traces1, picks2, traces2)]
+            dt, coeff = xcorr_pick_corrections(
+                picks1, traces1, picks2, traces2, 0.05, 0.2, 0.1, **kwargs)
+            np.testing.assert_allclose(dt[:5], [x[0] for x in expected],
+                                       rtol=1e-10, atol=1e-13)
+            np.testing.assert_allclose(coeff[:5], [x[1] for x in expected],
+                                       rtol=1e-10)
+            assert np.isnan(dt[5:]).all() and np.isnan(coeff[5:]).all()
+            dt2, coeff2 = xcorr_pick_corrections(
+                picks1, traces1, picks2, traces2, 0.05, 0.2, 0.1,
+                processes=2, **kwargs)
+            np.testing.assert_array_equal(dt2, dt)
+            np.testing.assert_array_equal(coeff2, coeff)
+        assert tr1 == tr1_copy
+        with pytest.raises(ValueError):
+            xcorr_pick_corrections([t1], [tr1], [], [], 0.05, 0.2, 0.1)
+
     def test_xcorr_pick_correction_images(self, state, image_path, testdata):
         """
         Test cross correlation pick correction on a set of two small local
@@ -419,6 +462,48 @@ class TestCrossCorrelation:
         shift, corr = xcorr_max(cc)
         assert shift == 0
 
+    def test_correlate_template_chunks(self):
+        """
+        Cross-correlations of chunks of data concatenated are the same as
+        the cross-correlation of all data.
+        """
+        np.random.seed(42)
+        data = np.random.random(5000) + 10
+        template = data[1000:1100] + np.random.random(100)
+        for dtype in (float, np.int32):
+            data_ = (data * 100).astype(dtype)
+            for kwargs in ({}, {'demean': False},
+                           {'demean': False, 'normalize': None}):
+                expected = correlate_template(data_, template,
+                                              method='direct', **kwargs)
+                for splits in ([], [50, 120, 130, 4000], range(0, 5000, 7)):
+                    chunks = np.split(data_, splits)
+                    ccs = list(correlate_template_chunks(
+                        chunks, template, method='direct', **kwargs))
+                    assert len(ccs) == len(chunks)
+                    np.testing.assert_array_equal(np.concatenate(ccs),
+                                                  expected)
+                    ccs = correlate_template_chunks(chunks, template,
+                                                    method='fft', **kwargs)
+                    np.testing.assert_allclose(np.concatenate(list(ccs)),
+                                               expected, atol=1e-10)
+        # overlapping traces
+        tr = read()[0]
+        template = tr.data[450:550]
+        expected = correlate_template(tr, template, method='direct')
+        windows = tr.slide(5, 5, include_partial_windows=True)
+        ccs = correlate_template_chunks(windows, template, method='direct')
+        np.testing.assert_array_equal(np.concatenate(list(ccs)), expected)
+        with pytest.raises(ValueError, match='Gap in data'):
+            list(correlate_template_chunks(
+                [tr.slice(None, tr.stats.starttime + 10),
+                 tr.slice(tr.stats.starttime + 12, None)], template))
+        with pytest.raises(ValueError):
+            list(correlate_template_chunks([tr], template, normalize=None))
+        with pytest.raises(ValueError):
+            list(correlate_template_chunks([tr], template,
+                                           normalize='naive'))
+
     def test_integer_input_equals_float_input(self):
         a = [-3, 0, 4]
         b = [-3, 4]
@@ -587,3 +672,77 @@ class TestCrossCorrelation:
         assert len(sims) == 2
         assert isinstance(sims[0], Trace)
         assert sims[1] is None
+
+    def test_correlation_detector_batched_vs_single_templates(self):
+        """
+        Similarities of many templates calculated together agree with
+        correlating one template after the other.
+        """
+        from obspy.signal.cross_correlation import _calc_mean
+
+        def mean(ccs):
+            return _calc_mean(ccs)
+
+        stream = read().filter('highpass', freq=5)
+        np.random.seed(42)
+        for tr in stream:
+            tr.data = np.tile(tr.data, 100) + np.random.random(300000) - 0.5
+        # channels start at slightly different times
+        stream[1].trim(stream[1].stats.starttime + 1.005, None)
+        t = stream[0].stats.starttime
+        templates = [stream.slice(t + 7 + 30 * i, t + 12 + 30 * i + i % 3)
+                     for i in range(6)]
+        # templates with different and shifted channels
+        templates[1] = templates[1][1:]
+        templates[2][0].trim(templates[2][0].stats.starttime + 0.5, None)
+        # a template without matching channels
+        templates.append(templates[3].copy())
+        for tr in templates[-1]:
+            tr.stats.station = 'XXX'
+        template_times = [tmpl[0].stats.starttime - 10 if tmpl else None
+                          for tmpl in templates]
+        for kwargs in ({}, {'demean': False}, {'normalize': None}):
+            with warnings.catch_warnings(record=True) as w1:
+                warnings.simplefilter('always')
+                detections1, sims1 = correlation_detector(
+                    stream, templates, 0.5, 10, similarity_func=mean,
+                    template_times=template_times, **kwargs)
+            for processes in (1, 2):
+                with warnings.catch_warnings(record=True) as w2:
+                    warnings.simplefilter('always')
+                    detections2, sims2 = correlation_detector(
+                        stream, templates, 0.5, 10, processes=processes,
+                        template_times=template_times, **kwargs)
+                assert [str(w_.message) for w_ in w1] == \
+                    [str(w_.message) for w_ in w2]
+                assert sims1[-1] is None and sims2[-1] is None
+                for sim1, sim2 in zip(sims1[:-1], sims2[:-1]):
+                    assert sim1.stats == sim2.stats
+                    np.testing.assert_allclose(sim2.data, sim1.data,
+                                               rtol=1e-6, atol=1e-8)
+                assert len(detections1) == len(detections2)
+                for d1, d2 in zip(detections1, detections2):
+                    assert d1['time'] == d2['time']
+                    assert d1['template_id'] == d2['template_id']
+        assert len(detections1) > 10
+
+    def test_correlation_detector_data_with_offset(self):
+        """
+        A constant offset of data and templates does not change the
+        similarities, also not when many templates are correlated together.
+        """
+        from obspy.signal.cross_correlation import _correlate_templates
+        stream = read().filter('highpass', freq=1)
+        t = stream[0].stats.starttime
+        templates = [stream.slice(t + 5, t + 7), stream.slice(t + 10, t + 13)]
+        expected = [sim.data for sim, _ in _correlate_templates(stream,
+                                                                templates)]
+        for stream_ in [stream] + templates:
+            for tr in stream_:
+                tr.data = tr.data + 1e6
+        for processes in (1, 2):
+            got = _correlate_templates(stream, templates, processes=processes)
+            for (sim, _), exp in zip(got, expected):
+                np.testing.assert_allclose(sim.data, exp, rtol=0, atol=1e-10)
+                assert np.max(sim.data) < 1 + 1e-12
+            assert _correlate_templates(stream, [], processes=processes) == []
@@ -5,9 +5,11 @@ The psd test suite.
 """
 import gzip
 import io
+import os
 import re
 import warnings
 from copy import deepcopy
+from unittest import mock
 
 import numpy as np
 import pytest
@@ -19,7 +21,9 @@ from obspy.core.util import CatchAndAssertWarnings
 from obspy.core.util.base import NamedTemporaryFile
 from obspy.core.util.obspy_types import ObsPyException
 from obspy.io.xseed import Parser
-from obspy.signal.spectral_estimation import (PPSD, welch_taper, welch_window)
+from obspy.signal.spectral_estimation import (PPSD, welch_taper, welch_window,
+                                              fft_taper, _psd_batch,
+                                              calculate_sds_ppsds)
 from obspy.signal.spectral_estimation import earthquake_models
 from obspy.signal.spectral_estimation import get_idc_infra_low_noise
 from obspy.signal.spectral_estimation import get_idc_infra_hi_noise
@@ -593,6 +597,109 @@ class TestPsd:
             np.testing.assert_array_equal(_times_processed,
                                           ppsd._times_processed)
 
+    def test_ppsd_save_and_load_store(self, tmp_path):
+        """
+        Test PPSD.save_store() and PPSD.load_store().
+        """
+        # set up a bogus PPSD with psds over the turn of a year
+        ppsd = PPSD(stats=Stats(dict(sampling_rate=150)), metadata=None,
+                    db_bins=(-200, -50, 1.), period_step_octaves=1.4)
+        t0 = UTCDateTime(2014, 12, 20)
+        times = [(t0 + i * 1800)._ns for i in range(2000)]
+        rng = np.random.default_rng(1234)
+        psds = rng.uniform(-200, -50, (2000, len(ppsd.period_bin_centers)))
+        psds = [psd for psd in psds.astype(np.float32)]
+        ppsd._times_processed = times[:1200]
+        ppsd._binned_psds = psds[:1200]
+        ppsd._times_data = [[times[0], times[1199]]]
+        directory = str(tmp_path / "store")
+        ppsd.save_store(directory)
+        # appending overlapping results omits windows already stored
+        ppsd._times_processed = times[1000:]
+        ppsd._binned_psds = psds[1000:]
+        ppsd._times_data = [[times[1000], times[-1]]]
+        with CatchAndAssertWarnings(
+                expected=[(UserWarning, "200/1000 segments omitted")]):
+            ppsd.save_store(directory)
+        assert sorted(os.listdir(directory)) == [
+            "ppsd.npz", "psd_values.2014.npy", "psd_values.2015.npy",
+            "times_processed.2014.npy", "times_processed.2015.npy"]
+        # load everything
+        ppsd = PPSD.load_store(directory)
+        assert ppsd._times_processed == times
+        np.testing.assert_array_equal(ppsd.psd_values, psds)
+        assert ppsd._times_data == [[times[0], times[1199]],
+                                    [times[1000], times[-1]]]
+        full = PPSD.load_store(directory)
+        full.calculate_histogram(starttime=t0 + 10 * 86400,
+                                 endtime=t0 + 15 * 86400)
+        # load a time range only
+        ppsd = PPSD.load_store(directory, starttime=t0 + 10 * 86400,
+                               endtime=t0 + 15 * 86400)
+        assert ppsd._times_processed == times[480:721]
+        assert isinstance(ppsd.psd_values[0], np.memmap)
+        np.testing.assert_array_equal(ppsd.psd_values, psds[480:721])
+        assert ppsd._times_data == [[times[0], times[1199]]]
+        ppsd.calculate_histogram()
+        np.testing.assert_array_equal(ppsd.current_histogram,
+                                      full.current_histogram)
+        assert ppsd.current_histogram.sum() == \
+            241 * len(ppsd.period_bin_centers)
+        np.testing.assert_array_equal(ppsd.get_percentile(50),
+                                      full.get_percentile(50))
+        values, _, _, _ = ppsd.extract_psd_values(10)
+        assert len(values) == 241
+        # results computed with other settings can not be appended
+        other = PPSD(stats=Stats(dict(sampling_rate=150)), metadata=None,
+                     db_bins=(-200, -50, 2.), period_step_octaves=1.4)
+        with pytest.raises(AssertionError, match="_db_bin_edges"):
+            other.save_store(directory)
+
+    def test_ppsd_incremental_histogram(self, _sample_data):
+        """
+        Histograms of selections used before are updated with the psds of
+        newly added time windows only.
+        """
+        tr, paz = _sample_data
+        ppsd = PPSD(tr.stats, paz, ppsd_length=600)
+        t = tr.stats.starttime
+        ppsd.add(tr.slice(t, t + 4800))
+        selections = [{}, {"time_of_weekday": [(-1, 0.5, 1.5)]},
+                      {"starttime": t + 1200, "month": 3},
+                      {"isoweek": [13], "year": [2011]}]
+        for kwargs in selections:
+            ppsd.calculate_histogram(**kwargs)
+        ppsd.add(tr.slice(t + 4500, t + 9000))
+        assert len(ppsd.times_processed) == 29
+        results = []
+        for kwargs in selections:
+            with mock.patch.object(
+                    PPSD, '_get_histogram_counts', autospec=True,
+                    side_effect=PPSD._get_histogram_counts) as p:
+                ppsd.calculate_histogram(**kwargs)
+            # at most the 14 new psds are counted
+            assert len(p.call_args[0][1]) <= 14
+            results.append((ppsd.current_histogram,
+                            ppsd.current_times_used))
+        assert ppsd.current_histogram_count == 29
+        # same results as when calculating from scratch
+        ppsd._histogram_cache.clear()
+        for kwargs, (hist, times_used) in zip(selections, results):
+            ppsd.calculate_histogram(**kwargs)
+            np.testing.assert_array_equal(hist, ppsd.current_histogram)
+            assert times_used == ppsd.current_times_used
+        # the current histogram is invalidated by adding data, then
+        # recalculated for all data
+        ppsd.add(tr.slice(t + 8700, t + 10000))
+        assert ppsd.current_histogram_count == 30
+        assert ppsd.current_histogram.sum() == \
+            30 * len(ppsd.period_bin_centers)
+        # histograms are recalculated if psds are modified directly
+        ppsd._binned_psds = ppsd._binned_psds[:-1]
+        ppsd._times_processed = ppsd._times_processed[:-1]
+        ppsd.calculate_histogram()
+        assert ppsd.current_histogram_count == 29
+
     def test_ppsd_time_checks(self):
         """
         Some tests that make sure checking if a new PSD slice to be addded to
@@ -717,6 +824,131 @@ class TestPsd:
         with pytest.raises(AttributeError):
             ppsd.psd_values = 123
 
+    def test_psd_batch_vs_mlab(self):
+        """
+        Batched psd calculation gives exactly the results of
+        :func:`matplotlib.mlab.psd` for every row.
+        """
+        from matplotlib import mlab
+        data = np.random.default_rng(42).normal(size=(5, 3000)).cumsum(axis=1)
+        for nfft, noverlap in ((512, 384), (511, 100)):
+            psds, freqs = _psd_batch(data, nfft, noverlap, 20.0)
+            for row, psd in zip(data, psds):
+                expected, expected_freqs = mlab.psd(
+                    row, nfft, 20.0, detrend=mlab.detrend_linear,
+                    window=fft_taper, noverlap=noverlap, sides='onesided',
+                    scale_by_freq=True)
+                np.testing.assert_array_equal(psd, expected)
+            np.testing.assert_array_equal(freqs, expected_freqs)
+
+    def test_ppsd_add_identical_to_single_windows(self, _sample_data):
+        """
+        Processing all windows together in PPSD.add() gives exactly the
+        same psd values as processing one window after the other like
+        before.
+        """
+        from matplotlib import mlab
+        tr, paz = _sample_data
+        ppsd = PPSD(tr.stats, paz, ppsd_length=1800)
+        ppsd.add(tr)
+        assert len(ppsd.psd_values) == 9
+        resp = ppsd._get_response(tr)[:0:-1]
+        respamp = np.absolute(resp * np.conjugate(resp))
+        for t, psd in zip(ppsd.times_processed, ppsd.psd_values):
+            data = tr.slice(t, t + 1800 - tr.stats.delta).data[:ppsd.len]
+            spec, freq = mlab.psd(
+                data.astype(np.float64), ppsd.nfft, ppsd.sampling_rate,
+                detrend=mlab.detrend_linear, window=fft_taper,
+                noverlap=ppsd.nlap, sides='onesided', scale_by_freq=True)
+            w = 2.0 * np.pi * freq[:0:-1]
+            spec = 10 * np.log10((w ** 2) * spec[:0:-1] / respamp)
+            expected = [
+                spec[(left <= ppsd.psd_periods) &
+                     (ppsd.psd_periods <= right)].mean()
+                for left, right in zip(ppsd.period_bin_left_edges,
+                                       ppsd.period_bin_right_edges)]
+            np.testing.assert_array_equal(
+                psd, np.array(expected, dtype=np.float32))
+
+    def test_calculate_sds_ppsds(self, tmp_path):
+        """
+        PPSDs of an SDS archive are calculated incrementally using daily
+        checkpoints, also in parallel.
+        """
+        from obspy.clients.filesystem.sds import Client
+        paz = {'gain': 1.0, 'poles': [-4.44 + 4.44j, -4.44 - 4.44j],
+               'sensitivity': 1e9, 'zeros': [0j, 0j]}
+        t0 = UTCDateTime(2020, 1, 1)
+        rng = np.random.default_rng(42)
+        (tmp_path / "sds").mkdir()
+        client = Client(str(tmp_path / "sds"))
+        seed_ids = ["XX.ABC..BHZ", "XX.ABC..BHN"]
+        data = {seed_id: rng.normal(size=(2, 86400)).astype(np.float32)
+                for seed_id in seed_ids}
+
+        def write_day(seed_id, day, npts):
+            net, sta, loc, cha = seed_id.split(".")
+            header = {"network": net, "station": sta, "location": loc,
+                      "channel": cha, "starttime": t0 + day * 86400}
+            tr = Trace(data[seed_id][day, :npts], header)
+            filename = client._get_filename(net, sta, loc, cha,
+                                            tr.stats.starttime)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            tr.write(filename, format="MSEED")
+            # make sure modifications are newer than the checkpoints
+            mtime = os.path.getmtime(filename) + 10 * day + npts / 1e3
+            os.utime(filename, (mtime, mtime))
+
+        for seed_id in seed_ids:
+            write_day(seed_id, 0, 86400)
+            write_day(seed_id, 1, 43200)
+        checkpoint_dir = str(tmp_path / "checkpoints")
+        kwargs = dict(ppsd_length=1800, db_bins=(-200, -50, 1.0))
+        ppsds = calculate_sds_ppsds(str(tmp_path / "sds"), seed_ids, t0,
+                                    t0 + 2 * 86400, paz, checkpoint_dir,
+                                    **kwargs)
+        assert sorted(ppsds) == sorted(seed_ids)
+        expected = [t0 + i * 900 for i in range(96 + 47)]
+        for seed_id in seed_ids:
+            assert ppsds[seed_id].times_processed == expected
+        # results are the same as with one PPSD for all data
+        st = client.get_waveforms("XX", "ABC", "", "BHZ", t0, t0 + 2 * 86400)
+        ppsd = PPSD(st[0].stats, paz, **kwargs)
+        ppsd.add(st)
+        assert ppsd.times_processed == expected
+        np.testing.assert_array_equal(ppsd.psd_values,
+                                      ppsds["XX.ABC..BHZ"].psd_values)
+
+        # unchanged days are not read again, for the extended day only the
+        # new time windows are processed
+        for seed_id in seed_ids:
+            write_day(seed_id, 1, 86400)
+        with mock.patch('obspy.signal.spectral_estimation._psd_batch',
+                        side_effect=_psd_batch) as p:
+            ppsds = calculate_sds_ppsds(str(tmp_path / "sds"), seed_ids,
+                                        t0, t0 + 2 * 86400, paz,
+                                        checkpoint_dir, **kwargs)
+        assert p.call_count == 2
+        assert sum(len(call[0][0]) for call in p.call_args_list) == 2 * 48
+        expected = [t0 + i * 900 for i in range(96 + 95)]
+        for seed_id in seed_ids:
+            assert ppsds[seed_id].times_processed == expected
+        with mock.patch('obspy.signal.spectral_estimation._psd_batch') as p:
+            ppsds2 = calculate_sds_ppsds(str(tmp_path / "sds"), seed_ids,
+                                         t0, t0 + 2 * 86400, paz,
+                                         checkpoint_dir, **kwargs)
+        assert p.call_count == 0
+        # calculation from scratch in parallel gives the same results
+        ppsds3 = calculate_sds_ppsds(str(tmp_path / "sds"), seed_ids, t0,
+                                     t0 + 2 * 86400, paz,
+                                     str(tmp_path / "checkpoints2"),
+                                     processes=2, **kwargs)
+        for seed_id in seed_ids:
+            for other in (ppsds2, ppsds3):
+                assert other[seed_id].times_processed == expected
+                np.testing.assert_array_equal(
+                    other[seed_id].psd_values, ppsds[seed_id].psd_values)
+
     def test_ppsd_temporal_plot(self, testdata, image_path):
         """
         Test plot of several period bins over time
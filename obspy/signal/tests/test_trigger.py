@@ -13,9 +13,11 @@ from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 from obspy import Stream, UTCDateTime, read
 from obspy.signal.trigger import (
-    ar_pick, classic_sta_lta, classic_sta_lta_py, coincidence_trigger, pk_baer,
-    recursive_sta_lta, recursive_sta_lta_py, trigger_onset, aic_simple,
-    energy_ratio, modified_energy_ratio)
+    ClassicStaLta, RecursiveStaLta, TriggerOnset, ar_pick, carl_sta_trig,
+    characteristic_functions, classic_sta_lta, classic_sta_lta_py,
+    coincidence_trigger, coincidence_trigger_chunks, delayed_sta_lta,
+    pk_baer, recursive_sta_lta, recursive_sta_lta_py, trigger_onset,
+    z_detect, aic_simple, energy_ratio, modified_energy_ratio)
 from obspy.signal.util import clibsignal
 
 
@@ -566,6 +568,113 @@ class TestTrigger():
                             'BW.UH4..EHZ']}]
         assert trig == remaining_results
 
+    def test_coincidence_trigger_chunks(self, testdata):
+        """
+        Coincidence triggers of chunks of data are the same as for all data.
+        """
+        st = Stream()
+        files = ["BW.UH1._.SHZ.D.2010.147.cut.slist.gz",
+                 "BW.UH2._.SHZ.D.2010.147.cut.slist.gz",
+                 "BW.UH3._.SHZ.D.2010.147.cut.slist.gz",
+                 "BW.UH4._.EHZ.D.2010.147.cut.slist.gz"]
+        for filename in files:
+            st += read(testdata[filename])
+        st.filter('bandpass', freqmin=10, freqmax=20)
+        st.trigger('recstalta', sta=0.5, lta=10)
+        t = st[0].stats.starttime
+        # chunks overlapping by one sample, shorter than some triggers
+        chunks = [st.slice(t + i, t + i + 2) for i in range(0, 232, 2)]
+        trace_ids = {"BW.UH1..SHZ": 0.4, "BW.UH2..SHZ": 0.35,
+                     "BW.UH3..SHZ": 0.4, "BW.UH4..EHZ": 0.25}
+        for kwargs in ({}, {'details': True, 'trace_ids': trace_ids},
+                       {'trigger_off_extension': 5},
+                       {'max_trigger_length': 5,
+                        'delete_long_trigger': True}):
+            expected = coincidence_trigger(None, 3.5, 1, st, 1, **kwargs)
+            assert len(expected) > 1
+            triggers = list(coincidence_trigger_chunks(3.5, 1, chunks, 1,
+                                                       **kwargs))
+            assert len(triggers) == len(chunks) + 1
+            assert [trigger for triggers_ in triggers
+                    for trigger in triggers_] == expected
+        # triggers are returned soon after they ended
+        assert [len(triggers_) for triggers_ in triggers[:40]].count(0) < 40
+        with pytest.raises(ValueError, match='Gap in data'):
+            list(coincidence_trigger_chunks(3.5, 1, chunks[::2], 1))
+
+    def test_characteristic_functions(self):
+        """
+        Characteristic functions of 2-D arrays are the same as for each row.
+        """
+        rng = np.random.default_rng(42)
+        data = rng.standard_normal((5, 2000))
+        for type, func, options in (
+                ('recstalta', recursive_sta_lta, dict(nsta=20, nlta=200)),
+                ('classicstalta', classic_sta_lta, dict(nsta=20, nlta=200)),
+                ('delayedstalta', delayed_sta_lta, dict(nsta=20, nlta=200)),
+                ('carlstatrig', carl_sta_trig,
+                 dict(nsta=20, nlta=200, ratio=0.8, quiet=0.8)),
+                ('zdetect', z_detect, dict(nsta=20))):
+            expected = np.array([func(row, **options) for row in data])
+            for threads in (1, 2):
+                out = np.empty(data.shape)
+                result = characteristic_functions(
+                    data, type, out=out, threads=threads, **options)
+                assert result is out
+                assert_array_equal(result, expected)
+            # the numpy functions also handle 2-D arrays directly
+            if type not in ('recstalta', 'classicstalta'):
+                assert_array_equal(func(data, **options), expected)
+        # streams with sta and lta in seconds
+        st = read()
+        result = characteristic_functions(st, 'classicstalta', sta=1, lta=4)
+        for tr, cft in zip(st, result):
+            assert_array_equal(cft, classic_sta_lta(tr.data, 100, 400))
+        with pytest.raises(ValueError, match='type has to be'):
+            characteristic_functions(data, 'foo', nsta=20)
+        with pytest.raises(ValueError, match='out has to be'):
+            characteristic_functions(data, 'zdetect', out=np.empty((5, 10)),
+                                     nsta=20)
+        st[0].stats.sampling_rate = 50
+        with pytest.raises(ValueError, match='same sampling rate'):
+            characteristic_functions(st, 'zdetect', sta=1)
+
+    def test_streaming_sta_lta_and_trigger_onset(self):
+        """
+        Characteristic functions and triggers of consecutive packets are the
+        same as for all data.
+        """
+        rng = np.random.default_rng(42)
+        data = rng.standard_normal(20000)
+        data[2000:2300] *= 20
+        data[6000:7500] *= 20
+        data[12000:12030] *= 20
+        # packets of random length including empty and single samples
+        cuts = np.sort(rng.integers(0, len(data), 50))
+        packets = np.split(data, np.concatenate(([1, 1], cuts)))
+        for cls, func in ((RecursiveStaLta, recursive_sta_lta),
+                          (ClassicStaLta, classic_sta_lta)):
+            stalta = cls(10, 200)
+            cft = np.concatenate([stalta(packet) for packet in packets])
+            assert_array_equal(cft, func(data, 10, 200))
+            stalta.reset()
+            assert_array_equal(stalta(data), func(data, 10, 200))
+        cft = classic_sta_lta(data, 10, 200)
+        for kwargs in ({}, {'max_len': 50},
+                       {'max_len': 50, 'max_len_delete': True}):
+            expected = trigger_onset(cft, 5, 1, **kwargs)
+            assert len(expected) > 0
+            trigger = TriggerOnset(5, 1, **kwargs)
+            triggers = [trigger(cft[i]) for i in np.split(
+                np.arange(len(cft)), np.concatenate(([1, 1], cuts)))]
+            triggers.append(trigger.flush())
+            assert_array_equal(np.concatenate(triggers), expected)
+        # a trigger active at the end of the data is returned by flush
+        trigger = TriggerOnset(5, 1)
+        assert len(trigger(cft[:2030])) == 0
+        assert trigger.flush().tolist() == [[2000, 2029]]
+        assert trigger_onset(cft[:2030], 5, 1).tolist() == [[2000, 2029]]
+
     def test_classic_sta_lta_c_python(self):
         """
         Test case for ctypes version of recursive_sta_lta
@@ -24,12 +24,13 @@ characteristic functions and a coincidence triggering routine.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
-from collections import deque
+from collections import defaultdict, deque
 import ctypes as C  # NOQA
+from multiprocessing.pool import ThreadPool
+import os
 import warnings
 
 import numpy as np
-import scipy
 
 from obspy import UTCDateTime
 from obspy.signal.cross_correlation import templates_max_similarity
@@ -110,7 +111,7 @@ def carl_sta_trig(a, nsta, nlta, ratio, quiet):
     eta = star - (ratio * ltar) - abs(sta - lta) - quiet
 
     :type a: NumPy :class:`~numpy.ndarray`
-    :param a: Seismic Trace
+    :param a: Seismic Trace, or 2-D array of several traces (one per row)
     :type nsta: int
     :param nsta: Length of short time average window in samples
     :type nlta: int
@@ -122,39 +123,42 @@ def carl_sta_trig(a, nsta, nlta, ratio, quiet):
     :rtype: NumPy :class:`~numpy.ndarray`
     :return: Characteristic function of CarlStaTrig
     """
-    m = len(a)
+    m = a.shape[-1]
     #
-    sta = np.zeros(len(a), dtype=np.float64)
-    lta = np.zeros(len(a), dtype=np.float64)
-    star = np.zeros(len(a), dtype=np.float64)
-    ltar = np.zeros(len(a), dtype=np.float64)
-    pad_sta = np.zeros(nsta)
-    pad_lta = np.zeros(nlta)  # avoid for 0 division 0/1=0
+    sta = np.zeros(a.shape, dtype=np.float64)
+    lta = np.zeros(a.shape, dtype=np.float64)
+    star = np.zeros(a.shape, dtype=np.float64)
+    ltar = np.zeros(a.shape, dtype=np.float64)
+    pad_sta = np.zeros(a.shape[:-1] + (nsta, ))
+    pad_lta = np.zeros(a.shape[:-1] + (nlta, ))  # avoid for 0 division 0/1=0
     #
     # compute the short time average (STA)
     for i in range(nsta):  # window size to smooth over
-        sta += np.concatenate((pad_sta, a[i:m - nsta + i]))
+        sta += np.concatenate((pad_sta, a[..., i:m - nsta + i]), axis=-1)
     sta /= nsta
     #
     # compute the long time average (LTA), 8 sec average over sta
     for i in range(nlta):  # window size to smooth over
-        lta += np.concatenate((pad_lta, sta[i:m - nlta + i]))
+        lta += np.concatenate((pad_lta, sta[..., i:m - nlta + i]), axis=-1)
     lta /= nlta
-    lta = np.concatenate((np.zeros(1), lta))[:m]  # XXX ???
+    lta = np.concatenate((np.zeros(a.shape[:-1] + (1, )), lta),
+                         axis=-1)[..., :m]  # XXX ???
     #
     # compute star, average of abs diff between trace and lta
     for i in range(nsta):  # window size to smooth over
         star += np.concatenate((pad_sta,
-                               abs(a[i:m - nsta + i] - lta[i:m - nsta + i])))
+                                abs(a[..., i:m - nsta + i] -
+                                    lta[..., i:m - nsta + i])), axis=-1)
     star /= nsta
     #
     # compute ltar, 8 sec average over star
     for i in range(nlta):  # window size to smooth over
-        ltar += np.concatenate((pad_lta, star[i:m - nlta + i]))
+        ltar += np.concatenate((pad_lta, star[..., i:m - nlta + i]),
+                               axis=-1)
     ltar /= nlta
     #
     eta = star - (ratio * ltar) - abs(sta - lta) - quiet
-    eta[:nlta] = -1.0
+    eta[..., :nlta] = -1.0
     return eta
 
 
@@ -239,7 +243,7 @@ def delayed_sta_lta(a, nsta, nlta):
     Delayed STA/LTA.
 
     :type a: NumPy :class:`~numpy.ndarray`
-    :param a: Seismic Trace
+    :param a: Seismic Trace, or 2-D array of several traces (one per row)
     :type nsta: int
     :param nsta: Length of short time average window in samples
     :type nlta: int
@@ -249,18 +253,20 @@ def delayed_sta_lta(a, nsta, nlta):
 
     .. seealso:: [Withers1998]_ (p. 98) and [Trnkoczy2012]_
     """
-    m = len(a)
+    a = np.asarray(a)
     #
     # compute the short time average (STA) and long time average (LTA)
     # don't start for STA at nsta because it's muted later anyway
-    sta = np.zeros(m, dtype=np.float64)
-    lta = np.zeros(m, dtype=np.float64)
-    for i in range(m):
-        sta[i] = (a[i] ** 2 + a[i - nsta] ** 2) / nsta + sta[i - 1]
-        lta[i] = (a[i - nsta - 1] ** 2 + a[i - nsta - nlta - 1] ** 2) / \
-            nlta + lta[i - 1]
-    sta[0:nlta + nsta + 50] = 0
-    lta[0:nlta + nsta + 50] = 1  # avoid division by zero
+    # running sums, sample i - n wraps around to the end of the trace for
+    # i < n
+    a2 = a ** 2
+    sta = np.cumsum((a2 + np.roll(a2, nsta, axis=-1)) / nsta, axis=-1,
+                    dtype=np.float64)
+    lta = np.cumsum((np.roll(a2, nsta + 1, axis=-1) +
+                     np.roll(a2, nsta + nlta + 1, axis=-1)) / nlta,
+                    axis=-1, dtype=np.float64)
+    sta[..., 0:nlta + nsta + 50] = 0
+    lta[..., 0:nlta + nsta + 50] = 1  # avoid division by zero
     return sta / lta
 
 
@@ -268,18 +274,19 @@ def z_detect(a, nsta):
     """
     Z-detector.
 
+    :param a: Seismic Trace, or 2-D array of several traces (one per row)
     :param nsta: Window length in Samples.
 
     .. seealso:: [Withers1998]_, p. 99
     """
     # Z-detector given by Swindell and Snell (1977)
     # Standard Sta shifted by 1
-    sta = np.cumsum(a ** 2, dtype=np.float64)
-    sta[nsta + 1:] = sta[nsta:-1] - sta[:-nsta - 1]
-    sta[nsta] = sta[nsta - 1]
-    sta[:nsta] = 0
-    a_mean = np.mean(sta)
-    a_std = np.std(sta)
+    sta = np.cumsum(np.asarray(a) ** 2, axis=-1, dtype=np.float64)
+    sta[..., nsta + 1:] = sta[..., nsta:-1] - sta[..., :-nsta - 1]
+    sta[..., nsta] = sta[..., nsta - 1]
+    sta[..., :nsta] = 0
+    a_mean = np.mean(sta, axis=-1, keepdims=True)
+    a_std = np.std(sta, axis=-1, keepdims=True)
     _z = (sta - a_mean) / a_std
     return _z
 
@@ -351,6 +358,119 @@ def modified_energy_ratio(a, nsta, power=3):
     return mer
 
 
+def _recursive_sta_lta_rows(a, out, nsta, nlta):
+    """
+    Recursive STA/LTA of rows of ``a`` written into rows of ``out``.
+    """
+    for a_, out_ in zip(a, out):
+        clibsignal.recstalta(a_, out_, len(a_), nsta, nlta)
+
+
+def _classic_sta_lta_rows(a, out, nsta, nlta):
+    """
+    Classic STA/LTA of rows of ``a`` written into rows of ``out``.
+    """
+    head = np.empty(1, dtype=head_stalta_t)
+    head[:] = (a.shape[1], nsta, nlta)
+    for a_, out_ in zip(a, out):
+        errcode = clibsignal.stalta(head, a_, out_)
+        if errcode != 0:
+            raise Exception('ERROR %d stalta: len(data) < nlta' % errcode)
+
+
+def characteristic_functions(data, type, out=None, threads=None, **options):
+    """
+    Compute characteristic functions of many channels at once.
+
+    The channels are split into blocks processed in parallel threads. The C
+    implementations of the recursive and classic STA/LTA release the GIL,
+    the other characteristic functions are calculated vectorized for all
+    channels of a block.
+
+    :type data: :class:`~numpy.ndarray` or :class:`~obspy.core.stream.Stream`
+    :param data: 2-D array with the data of one channel per row, or Stream
+        with traces of the same sampling rate and number of samples.
+    :type type: str
+    :param type: One of ``'recstalta'``, ``'classicstalta'``,
+        ``'delayedstalta'``, ``'carlstatrig'`` or ``'zdetect'``, see
+        :meth:`~obspy.core.trace.Trace.trigger`.
+    :type out: :class:`~numpy.ndarray`
+    :param out: Preallocated C-contiguous float64 array of the same shape as
+        ``data`` for the results.
+    :type threads: int
+    :param threads: Number of threads, defaults to the number of CPUs.
+    :param options: Options of the characteristic function, e.g. ``nsta``
+        and ``nlta`` in samples. For Stream input ``sta`` and ``lta`` in
+        seconds can be used like in
+        :meth:`~obspy.core.trace.Trace.trigger`.
+    :rtype: :class:`~numpy.ndarray`
+    :return: Characteristic functions, one per row.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> st = read()
+    >>> cfts = characteristic_functions(st, 'recstalta', sta=1, lta=4)
+    >>> cfts.shape
+    (3, 3000)
+    >>> np.array_equal(cfts[1], recursive_sta_lta(st[1].data, 100, 400))
+    True
+    """
+    from obspy import Stream
+    if isinstance(data, Stream):
+        if len(set((tr.stats.sampling_rate, tr.stats.npts)
+                   for tr in data)) > 1:
+            msg = ('All traces need to have the same sampling rate and '
+                   'number of samples')
+            raise ValueError(msg)
+        if len(data):
+            spr = data[0].stats.sampling_rate
+            for key in ['sta', 'lta']:
+                if key in options:
+                    options['n%s' % (key)] = int(options.pop(key) * spr)
+        data = np.array([tr.data for tr in data])
+    funcs = {'recstalta': _recursive_sta_lta_rows,
+             'classicstalta': _classic_sta_lta_rows,
+             'delayedstalta': delayed_sta_lta,
+             'carlstatrig': carl_sta_trig,
+             'zdetect': z_detect}
+    type = type.lower()
+    if type not in funcs:
+        msg = "type has to be one of %s" % ', '.join(funcs)
+        raise ValueError(msg)
+    func = funcs[type]
+    data = np.ascontiguousarray(data, dtype=np.float64)
+    if data.ndim != 2:
+        msg = "data has to be a 2-D array"
+        raise ValueError(msg)
+    if out is None:
+        out = np.empty(data.shape, dtype=np.float64)
+    elif (out.shape != data.shape or out.dtype != np.float64 or
+          not out.flags.c_contiguous):
+        msg = ("out has to be a C-contiguous float64 array of the same "
+               "shape as data")
+        raise ValueError(msg)
+
+    def _process(rows):
+        if type in ('recstalta', 'classicstalta'):
+            func(data[rows], out[rows], **options)
+        else:
+            out[rows] = func(data[rows], **options)
+
+    if threads is None:
+        threads = os.cpu_count() or 1
+    threads = max(1, min(threads, len(data)))
+    step = -(-len(data) // threads) if len(data) else 1
+    blocks = [slice(i, i + step) for i in range(0, len(data), step)]
+    if threads == 1:
+        for rows in blocks:
+            _process(rows)
+    else:
+        with ThreadPool(threads) as pool:
+            pool.map(_process, blocks)
+    return out
+
+
 def trigger_onset(charfct, thres1, thres2, max_len=9e99, max_len_delete=False):
     """
     Calculate trigger on and off times.
@@ -435,6 +555,293 @@ def trigger_onset(charfct, thres1, thres2, max_len=9e99, max_len_delete=False):
     return np.array(pick, dtype=np.int64)
 
 
+class RecursiveStaLta(object):
+    """
+    Recursive STA/LTA of data arriving in consecutive packets.
+
+    The running averages are kept between calls, so the characteristic
+    function of all packets is identical to
+    :func:`~obspy.signal.trigger.recursive_sta_lta` of all data. Instances
+    can be registered as processing function of an
+    :class:`~obspy.realtime.rttrace.RtTrace`, which calls :meth:`reset` on
+    gaps and overlaps. Note that RtTrace keeps the data type of the appended
+    traces, so it has to be used with floating point data.
+
+    :type nsta: int
+    :param nsta: Length of short time average window in samples
+    :type nlta: int
+    :param nlta: Length of long time average window in samples
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> data = read()[0].data
+    >>> rec = RecursiveStaLta(100, 400)
+    >>> cft = np.concatenate([rec(data[i:i + 512])
+    ...                       for i in range(0, len(data), 512)])
+    >>> np.array_equal(cft, recursive_sta_lta(data, 100, 400))
+    True
+    """
+    def __init__(self, nsta, nlta):
+        self.nsta = nsta
+        self.nlta = nlta
+        self.reset()
+
+    def __repr__(self):
+        return "%s(nsta=%s, nlta=%s)" % (self.__class__.__name__,
+                                         self.nsta, self.nlta)
+
+    def reset(self):
+        """
+        Forget all previous data, e.g. after a gap.
+        """
+        self.npts = 0
+        self._zi = np.zeros((2, 1))
+
+    def __call__(self, a):
+        """
+        Compute the characteristic function of the next packet of data.
+
+        :type a: :class:`numpy.ndarray`
+        :param a: Next packet of data
+        :rtype: :class:`numpy.ndarray`, dtype=float64
+        :return: Characteristic function of the packet
+        """
+        from scipy.signal import lfilter
+        a = np.asarray(a, dtype=np.float64)
+        charfct = np.zeros(len(a))
+        # like recursive_sta_lta the first sample is skipped, lfilter uses
+        # the same operations as the C version and gives identical results
+        start = 1 if self.npts == 0 else 0
+        a2 = a[start:] ** 2
+        if len(a2):
+            csta = 1. / self.nsta
+            clta = 1. / self.nlta
+            sta, self._zi[0] = lfilter([csta], [1., -(1 - csta)], a2,
+                                       zi=self._zi[0])
+            lta, self._zi[1] = lfilter([clta], [1., -(1 - clta)], a2,
+                                       zi=self._zi[1])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                charfct[start:] = sta / lta
+        charfct[:max(0, self.nlta - self.npts)] = 0.
+        self.npts += len(a)
+        return charfct
+
+
+class ClassicStaLta(object):
+    """
+    Classic STA/LTA of data arriving in consecutive packets.
+
+    The running sums and the last ``nlta`` samples are kept between calls, so
+    the characteristic function of all packets is identical to
+    :func:`~obspy.signal.trigger.classic_sta_lta` of all data. Instances
+    can be registered as processing function of an
+    :class:`~obspy.realtime.rttrace.RtTrace` like
+    :class:`~obspy.signal.trigger.RecursiveStaLta`.
+
+    :type nsta: int
+    :param nsta: Length of short time average window in samples
+    :type nlta: int
+    :param nlta: Length of long time average window in samples
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> data = read()[0].data
+    >>> stalta = ClassicStaLta(100, 400)
+    >>> cft = np.concatenate([stalta(data[i:i + 512])
+    ...                       for i in range(0, len(data), 512)])
+    >>> np.array_equal(cft, classic_sta_lta(data, 100, 400))
+    True
+    """
+    def __init__(self, nsta, nlta):
+        self.nsta = nsta
+        self.nlta = nlta
+        self.reset()
+
+    def __repr__(self):
+        return "%s(nsta=%s, nlta=%s)" % (self.__class__.__name__,
+                                         self.nsta, self.nlta)
+
+    def reset(self):
+        """
+        Forget all previous data, e.g. after a gap.
+        """
+        self.npts = 0
+        self._sta = 0.
+        self._lta = 0.
+        self._a2 = np.empty(0)
+
+    def __call__(self, a):
+        """
+        Compute the characteristic function of the next packet of data.
+
+        :type a: :class:`numpy.ndarray`
+        :param a: Next packet of data
+        :rtype: :class:`numpy.ndarray`, dtype=float64
+        :return: Characteristic function of the packet
+        """
+        a = np.asarray(a, dtype=np.float64)
+        npts = len(a)
+        # squares of the last nlta samples followed by those of the packet
+        k = len(self._a2)
+        a2 = np.concatenate((self._a2, a ** 2))
+        # previous running sums followed by their changes computed like in
+        # the C version, cumsum adds them up sequentially and gives identical
+        # results
+        dsta = np.concatenate(([self._sta], a2[k:]))
+        dlta = np.concatenate(([self._lta], a2[k:]))
+        i = min(npts, max(0, self.nsta - self.npts))
+        dsta[i + 1:] -= a2[k + i - self.nsta:k + npts - self.nsta]
+        i = min(npts, max(0, self.nlta - self.npts))
+        dlta[i + 1:] -= a2[k + i - self.nlta:k + npts - self.nlta]
+        sta = np.cumsum(dsta)[1:]
+        lta = np.cumsum(dlta)[1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            charfct = sta / lta * (float(self.nlta) / float(self.nsta))
+        charfct[:max(0, self.nlta - 1 - self.npts)] = 0.
+        if npts:
+            self._sta = sta[-1]
+            self._lta = lta[-1]
+            self._a2 = a2[-self.nlta:].copy()
+        self.npts += npts
+        return charfct
+
+
+class TriggerOnset(object):
+    """
+    Trigger on and off times of a characteristic function arriving in
+    consecutive packets.
+
+    Calling the instance with the next packet of the characteristic function
+    returns the triggers switched off so far, :meth:`flush` returns a trigger
+    still active at the end of the data. All returned triggers together are
+    identical to :func:`~obspy.signal.trigger.trigger_onset` of the whole
+    characteristic function. Sample indices count from the first sample
+    after creation or after the last :meth:`reset`.
+
+    :type thres1: float
+    :param thres1: Value above which trigger (of characteristic function)
+                   is activated (higher threshold)
+    :type thres2: float
+    :param thres2: Value below which trigger (of characteristic function)
+        is deactivated (lower threshold)
+    :type max_len: int
+    :param max_len: Maximum length of triggered event in samples. A new
+                    event will be triggered as soon as the signal reaches
+                    again above thres1.
+    :type max_len_delete: bool
+    :param max_len_delete: Do not return events longer than max_len.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> data = read()[0].data
+    >>> stalta = ClassicStaLta(100, 400)
+    >>> trigger = TriggerOnset(2, 0.5)
+    >>> for i in range(0, len(data), 512):
+    ...     print(trigger(stalta(data[i:i + 512])))
+    []
+    [[515 903]]
+    []
+    [[1671 1974]]
+    []
+    [[2499 2879]]
+    >>> print(trigger.flush())
+    []
+    """
+    def __init__(self, thres1, thres2, max_len=9e99, max_len_delete=False):
+        self.thres1 = thres1
+        self.thres2 = thres2
+        self.max_len = max_len
+        self.max_len_delete = max_len_delete
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all previous data and a still active trigger.
+        """
+        self.npts = 0
+        self._above1 = False
+        self._above2 = False
+        self._on = None
+        self._last_off = -1
+
+    def __call__(self, charfct):
+        """
+        Process the next packet of the characteristic function.
+
+        :type charfct: :class:`numpy.ndarray`
+        :param charfct: Next packet of the characteristic function
+        :rtype: :class:`numpy.ndarray`
+        :return: Trigger on and off times in samples, one row per trigger
+            switched off in this packet.
+        """
+        charfct = np.asarray(charfct)
+        above1 = np.concatenate(([self._above1], charfct >= self.thres1))
+        above2 = np.concatenate(([self._above2], charfct >= self.thres2))
+        on = (np.flatnonzero(above1[1:] & ~above1[:-1]) +
+              self.npts).tolist()
+        # last samples above thres2, known up to the second last sample
+        off = (np.flatnonzero(above2[:-1] & ~above2[1:]) +
+               self.npts - 1).tolist()
+        self.npts += len(charfct)
+        self._above1 = above1[-1]
+        self._above2 = above2[-1]
+        return self._triggers(on, off, self.npts - 2)
+
+    def flush(self):
+        """
+        Return the trigger still active at the end of the data and reset.
+
+        :rtype: :class:`numpy.ndarray`
+        :return: Trigger on and off times in samples, like
+            :func:`~obspy.signal.trigger.trigger_onset` a trigger is
+            switched off at the last sample.
+        """
+        off = [self.npts - 1] if self._above2 else []
+        triggers = self._triggers([], off, self.npts - 1, final=True)
+        self.reset()
+        return triggers
+
+    def _triggers(self, on, off, known, final=False):
+        """
+        Match trigger on times with off times known up to sample ``known``.
+        """
+        pick = []
+        i = j = 0
+        while True:
+            if self._on is None:
+                # a new trigger starts after the last one was switched off
+                while i < len(on) and on[i] <= self._last_off:
+                    i += 1
+                if i == len(on):
+                    break
+                self._on = on[i]
+            while j < len(off) and off[j] < self._on:
+                j += 1
+            if j < len(off):
+                of = off[j]
+            elif final:
+                of = np.inf if self.max_len_delete else known + 1
+            elif (known + 1 - self._on > self.max_len and
+                    not self.max_len_delete):
+                # switched off after max_len, whatever comes later
+                of = known + 1
+            else:
+                break
+            if of - self._on > self.max_len:
+                if self.max_len_delete:
+                    self._last_off = of
+                    self._on = None
+                    continue
+                of = self._on + self.max_len
+            pick.append([self._on, of])
+            self._last_off = of
+            self._on = None
+        return np.array(pick, dtype=np.int64).reshape(-1, 2)
+
+
 def pk_baer(reltrc, samp_int, tdownmax, tupevent, thr1, thr2, preset_len,
             p_dur, return_cf=False):
     """
@@ -564,6 +971,7 @@ def ar_pick(a, b, c, samp_rate, f1, f2, lta_p, sta_p, lta_s, sta_s, m_p, m_s,
     :rtype: tuple
     :returns: A tuple with the P and the S arrival.
     """
+    import scipy.signal
     if not (len(a) == len(b) == len(c)):
         raise ValueError("All three data arrays must have the same length.")
 
@@ -675,6 +1083,189 @@ def plot_trigger(trace, cft, thr_on, thr_off, show=True):
     return fig, axes
 
 
+def _station_triggers(trace_id, data, starttime, sampling_rate, thr_on,
+                      thr_off, details, offset=0, **kwargs):
+    """
+    Single station triggers of a characteristic function as arrays.
+
+    :param offset: Sample index of the first sample of ``data`` relative to
+        ``starttime``.
+    :return: Tuple of arrays of on and off timestamps, trace ids,
+        characteristic function peaks and standard deviations (only
+        calculated if ``details`` is set).
+    """
+    triggers = np.asarray(trigger_onset(data, thr_on, thr_off, **kwargs),
+                          dtype=np.int64).reshape(-1, 2)
+    # same rounding to nanoseconds as adding seconds to UTCDateTime
+    on, off = [(starttime._ns + np.round(
+        (triggers[:, i] + offset).astype(np.float64) / sampling_rate *
+        1e9).astype(np.int64)) / 1e9 for i in range(2)]
+    cft_peaks = np.zeros(len(triggers))
+    cft_stds = np.zeros(len(triggers))
+    if details:
+        for i, (on_, off_) in enumerate(triggers):
+            try:
+                cft_peaks[i] = data[on_:off_].max()
+                cft_stds[i] = data[on_:off_].std()
+            except ValueError:
+                cft_peaks[i] = data[on_]
+                cft_stds[i] = 0
+    ids = np.empty(len(triggers), dtype=object)
+    ids[:] = trace_id
+    return on, off, ids, cft_peaks, cft_stds
+
+
+def _concatenate_triggers(triggers):
+    """
+    Concatenate tuples of trigger arrays returned by
+    :func:`_station_triggers`.
+    """
+    if not triggers:
+        return (np.zeros(0), np.zeros(0), np.zeros(0, dtype=object),
+                np.zeros(0), np.zeros(0))
+    return tuple(np.concatenate(arrays) for arrays in zip(*triggers))
+
+
+def _associate_triggers(on, off, ids, weights, thr_coincidence_sum,
+                        trigger_off_extension, similar=None,
+                        safe_time=np.inf):
+    """
+    Associate single station triggers sorted by on time.
+
+    Every trigger starts a coincidence trigger collecting all following
+    triggers of other traces as long as they overlap with one of the
+    collected triggers (the off times extended by ``trigger_off_extension``).
+    Coincidence triggers consisting of a single trigger below
+    ``thr_coincidence_sum`` and not ``similar`` are left out.
+
+    :param ids: Integer ids of the traces.
+    :param safe_time: Stop at the first coincidence trigger that would be
+        extended by a trigger with an on time not before ``safe_time``.
+    :return: List of tuples with index of the first trigger, indices of all
+        collected triggers, off time and coincidence sum, and the index of
+        the first trigger not yet used as start of a coincidence trigger.
+    """
+    num = len(on)
+    ext_off = off + trigger_off_extension
+    # triggers not overlapping with the next trigger
+    single = np.ones(num, dtype=bool)
+    single[:-1] = (on[1:] > ext_off[:-1]) & (ids[1:] != ids[:-1])
+    skip = single & (weights < thr_coincidence_sum) & (ext_off < safe_time)
+    # index of the previous trigger of the same trace
+    order = np.argsort(ids, kind='stable')
+    previous = np.full(num, -1)
+    same = ids[order[1:]] == ids[order[:-1]]
+    previous[order[1:][same]] = order[:-1][same]
+    if similar is not None:
+        skip &= ~similar
+    coincidences = []
+    for i in np.nonzero(~skip)[0]:
+        if single[i]:
+            members = np.array([i])
+            end_time = ext_off[i]
+        else:
+            # triggers of traces already collected are skipped, i.e. the
+            # first trigger of each trace is collected until the first gap
+            size = 16
+            while True:
+                j = min(i + size, num)
+                first = previous[i:j] < i
+                end_times = np.maximum.accumulate(
+                    np.where(first, ext_off[i:j], -np.inf))
+                gaps = np.nonzero(first[1:] & (on[i + 1:j] >
+                                               end_times[:-1]))[0]
+                if len(gaps) or j == num:
+                    break
+                size *= 4
+            length = gaps[0] + 1 if len(gaps) else j - i
+            members = i + np.nonzero(first[:length])[0]
+            end_time = end_times[length - 1]
+        if end_time >= safe_time:
+            return coincidences, i
+        coincidences.append((i, members, off[members].max(),
+                             np.cumsum(weights[members])[-1]))
+    return coincidences, num
+
+
+def _coincidence_triggers(triggers, trace_ids, thr_coincidence_sum,
+                          trigger_off_extension, details, last_off_time=0.0,
+                          safe_time=np.inf, similarity=None,
+                          similarity_threshold=None):
+    """
+    Network coincidence triggers from single station triggers.
+
+    :type triggers: tuple of :class:`~numpy.ndarray`
+    :param triggers: Single station triggers, see :func:`_station_triggers`.
+    :param similarity: Function returning the similarity of each sorted
+        trigger to event templates (``NaN`` if there are none).
+    :return: List of coincidence triggers, remaining triggers not used in
+        coincidence triggers ending before ``safe_time`` and the off time of
+        the last coincidence trigger.
+    """
+    on, off, tr_ids, cft_peaks, cft_stds = triggers
+    unique_ids, ids = np.unique(tr_ids.astype(str), return_inverse=True)
+    if details:
+        order = np.lexsort((cft_stds, cft_peaks, ids, off, on))
+    else:
+        order = np.lexsort((ids, off, on))
+    on, off, tr_ids, cft_peaks, cft_stds, ids = (
+        on[order], off[order], tr_ids[order], cft_peaks[order],
+        cft_stds[order], ids[order])
+    stations = [tr_id.split(".")[1] for tr_id in unique_ids]
+    weights = np.array([float(trace_ids[tr_id])
+                        for tr_id in unique_ids])[ids]
+    similar = None
+    if similarity is not None:
+        simil = similarity(on, tr_ids)
+        thresholds = np.array([similarity_threshold.get(sta, np.nan)
+                               for sta in stations])
+        with np.errstate(invalid='ignore'):
+            similar = simil > thresholds[ids]
+    coincidences, num = _associate_triggers(
+        on, off, ids, weights, thr_coincidence_sum, trigger_off_extension,
+        similar=similar, safe_time=safe_time)
+    coincidence_triggers = []
+    for i, members, off_, coincidence_sum in coincidences:
+        event_similarity = {}
+        if similar is not None:
+            for j in members:
+                if not np.isnan(simil[j]):
+                    event_similarity[stations[ids[j]]] = simil[j]
+        # skip if both coincidence sum and similarity thresholds are not met
+        if coincidence_sum < thr_coincidence_sum:
+            if not event_similarity:
+                continue
+            elif not any([val > similarity_threshold[_s]
+                          for _s, val in event_similarity.items()]):
+                continue
+        # skip coincidence trigger if it is just a subset of the previous
+        # (determined by a shared off-time, this is a bit sloppy)
+        if off_ <= last_off_time:
+            continue
+        event = {}
+        event['time'] = UTCDateTime(on[i])
+        event['stations'] = [stations[ids[j]] for j in members]
+        event['trace_ids'] = list(tr_ids[members])
+        event['coincidence_sum'] = float(coincidence_sum)
+        event['similarity'] = event_similarity
+        if details:
+            event['cft_peaks'] = cft_peaks[members].tolist()
+            event['cft_stds'] = cft_stds[members].tolist()
+        event['duration'] = float(off_ - on[i])
+        if details:
+            weights_ = weights[members]
+            weighted_values = np.array(event['cft_peaks']) * weights_
+            event['cft_peak_wmean'] = weighted_values.sum() / weights_.sum()
+            event['cft_std_wmean'] = \
+                (np.array(event['cft_stds']) * weights_).sum() / \
+                weights_.sum()
+        coincidence_triggers.append(event)
+        last_off_time = off_
+    remaining = tuple(array[num:] for array in
+                      (on, off, tr_ids, cft_peaks, cft_stds))
+    return coincidence_triggers, remaining, last_off_time
+
+
 def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
                         thr_coincidence_sum, trace_ids=None,
                         max_trigger_length=1e6, delete_long_trigger=False,
@@ -805,94 +1396,152 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
             tr.trigger(trigger_type, **options)
         kwargs['max_len'] = int(
             max_trigger_length * tr.stats.sampling_rate + 0.5)
-        tmp_triggers = trigger_onset(tr.data, thr_on, thr_off, **kwargs)
-        for on, off in tmp_triggers:
-            try:
-                cft_peak = tr.data[on:off].max()
-                cft_std = tr.data[on:off].std()
-            except ValueError:
-                cft_peak = tr.data[on]
-                cft_std = 0
-            on = tr.stats.starttime + float(on) / tr.stats.sampling_rate
-            off = tr.stats.starttime + float(off) / tr.stats.sampling_rate
-            triggers.append((on.timestamp, off.timestamp, tr.id, cft_peak,
-                             cft_std))
-    triggers.sort()
-
-    for i, (on, off, tr_id, cft_peak, cft_std) in enumerate(triggers):
-        sta = tr_id.split(".")[1]
-        templates = event_templates.get(sta)
-        if templates:
-            simil = templates_max_similarity(
-                stream, UTCDateTime(on), templates)
-        else:
-            simil = None
-        triggers[i] = (on, off, tr_id, cft_peak, cft_std, simil)
+        triggers.append(_station_triggers(
+            tr.id, tr.data, tr.stats.starttime, tr.stats.sampling_rate,
+            thr_on, thr_off, details, **kwargs))
+    triggers = _concatenate_triggers(triggers)
+
+    def similarity(on, tr_ids):
+        simil = np.full(len(on), np.nan)
+        for i, (on_, tr_id) in enumerate(zip(on, tr_ids)):
+            templates = event_templates.get(tr_id.split(".")[1])
+            if templates:
+                simil[i] = templates_max_similarity(
+                    stream, UTCDateTime(on_), templates)
+        return simil
 
     # the coincidence triggering and coincidence sum computation
-    coincidence_triggers = []
+    coincidence_triggers = _coincidence_triggers(
+        triggers, trace_ids, thr_coincidence_sum, trigger_off_extension,
+        details, similarity=similarity if event_templates else None,
+        similarity_threshold=similarity_threshold)[0]
+    return coincidence_triggers
+
+
+def coincidence_trigger_chunks(thr_on, thr_off, streams, thr_coincidence_sum,
+                               trace_ids=None, max_trigger_length=1e6,
+                               delete_long_trigger=False,
+                               trigger_off_extension=0, details=False):
+    """
+    Perform a network coincidence trigger on data arriving in chunks.
+
+    Streaming version of
+    :func:`~obspy.signal.trigger.coincidence_trigger` with
+    ``trigger_type=None``, e.g. for long continuous data read piece by piece
+    or for real time processing. The streams contain consecutive chunks of
+    precomputed characteristic functions of all stations (e.g. calculated
+    with :class:`~obspy.realtime.rttrace.RtTrace`). Single station triggers
+    and network coincidence triggers spanning chunk boundaries are handled
+    and the concatenated results are the same as those of
+    :func:`~obspy.signal.trigger.coincidence_trigger` for the merged
+    streams.
+
+    Of every characteristic function only the samples since it last dropped
+    below ``thr_off`` are kept between chunks. Coincidence triggers are
+    returned as soon as no later single station trigger can be part of them.
+
+    :type streams: iterable of :class:`~obspy.core.stream.Stream`
+    :param streams: Consecutive chunks of characteristic functions. Traces
+        of the same id may overlap (samples already processed are skipped),
+        a gap raises a :class:`ValueError`.
+    :param trace_ids: Trace IDs to be used in the network coincidence sum,
+        list or dictionary with trace IDs as keys and weights as values. The
+        default of ``None`` uses all traces with weight 1.
+    :param details: If set to ``True`` the output coincidence triggers
+        contain more detailed information.
+
+    See :func:`~obspy.signal.trigger.coincidence_trigger` for the other
+    parameters.
+
+    :return: Generator yielding a list of coincidence triggers for every
+        chunk and a last list with the coincidence triggers at the end of the
+        data.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> from obspy.signal.trigger import recursive_sta_lta
+    >>> st = read()
+    >>> for tr in st:
+    ...     tr.data = recursive_sta_lta(tr.data, 50, 500)
+    >>> t = st[0].stats.starttime
+    >>> chunks = [st.slice(t + i, t + i + 5) for i in range(0, 30, 5)]
+    >>> triggers = [trigger for triggers in coincidence_trigger_chunks(
+    ...     1.5, 0.5, chunks, 2) for trigger in triggers]
+    >>> triggers == coincidence_trigger(None, 1.5, 0.5, st, 2)
+    True
+    >>> for trigger in triggers:
+    ...     print(trigger['time'], trigger['coincidence_sum'])
+    2009-08-24T00:20:08.000000Z 3.0
+    2009-08-24T00:20:27.340000Z 2.0
+    """
+    use_all = trace_ids is None
+    if use_all:
+        trace_ids = defaultdict(lambda: 1)
+    elif isinstance(trace_ids, list) or isinstance(trace_ids, tuple):
+        trace_ids = dict.fromkeys(trace_ids, 1)
+    kwargs = {'max_len_delete': delete_long_trigger}
+    # for every trace id the start time, sampling rate, index of the next
+    # sample, index of the first kept sample, the kept samples and the
+    # single station triggers on them (only final at the end of the data)
+    states = {}
+    pending = _concatenate_triggers([])
     last_off_time = 0.0
-    while triggers != []:
-        # remove first trigger from list and look for overlaps
-        on, off, tr_id, cft_peak, cft_std, simil = triggers.pop(0)
-        sta = tr_id.split(".")[1]
-        event = {}
-        event['time'] = UTCDateTime(on)
-        event['stations'] = [tr_id.split(".")[1]]
-        event['trace_ids'] = [tr_id]
-        event['coincidence_sum'] = float(trace_ids[tr_id])
-        event['similarity'] = {}
-        if details:
-            event['cft_peaks'] = [cft_peak]
-            event['cft_stds'] = [cft_std]
-        # evaluate maximum similarity for station if event templates were
-        # provided
-        if simil is not None:
-            event['similarity'][sta] = simil
-        # compile the list of stations that overlap with the current trigger
-        for (tmp_on, tmp_off, tmp_tr_id, tmp_cft_peak, tmp_cft_std,
-                tmp_simil) in triggers:
-            tmp_sta = tmp_tr_id.split(".")[1]
-            # skip retriggering of already present station in current
-            # coincidence trigger
-            if tmp_tr_id in event['trace_ids']:
-                continue
-            # check for overlapping trigger,
-            # break if there is a gap in between the two triggers
-            if tmp_on > off + trigger_off_extension:
-                break
-            event['stations'].append(tmp_sta)
-            event['trace_ids'].append(tmp_tr_id)
-            event['coincidence_sum'] += trace_ids[tmp_tr_id]
-            if details:
-                event['cft_peaks'].append(tmp_cft_peak)
-                event['cft_stds'].append(tmp_cft_std)
-            # allow sets of triggers that overlap only on subsets of all
-            # stations (e.g. A overlaps with B and B overlaps w/ C => ABC)
-            off = max(off, tmp_off)
-            # evaluate maximum similarity for station if event templates were
-            # provided
-            if tmp_simil is not None:
-                event['similarity'][tmp_sta] = tmp_simil
-        # skip if both coincidence sum and similarity thresholds are not met
-        if event['coincidence_sum'] < thr_coincidence_sum:
-            if not event['similarity']:
-                continue
-            elif not any([val > similarity_threshold[_s]
-                          for _s, val in event['similarity'].items()]):
+    for stream in streams:
+        triggers = [pending]
+        for tr in stream:
+            if not use_all and tr.id not in trace_ids:
+                if tr.id not in states:
+                    msg = "At least one trace's ID was not found in the " + \
+                          "trace ID list and was disregarded (%s)" % tr.id
+                    warnings.warn(msg, UserWarning)
+                    states[tr.id] = None
                 continue
-        # skip coincidence trigger if it is just a subset of the previous
-        # (determined by a shared off-time, this is a bit sloppy)
-        if off <= last_off_time:
-            continue
-        event['duration'] = off - on
-        if details:
-            weights = np.array([trace_ids[i] for i in event['trace_ids']])
-            weighted_values = np.array(event['cft_peaks']) * weights
-            event['cft_peak_wmean'] = weighted_values.sum() / weights.sum()
-            weighted_values = np.array(event['cft_stds']) * weights
-            event['cft_std_wmean'] = \
-                (np.array(event['cft_stds']) * weights).sum() / weights.sum()
-        coincidence_triggers.append(event)
-        last_off_time = off
-    return coincidence_triggers
+            state = states.get(tr.id)
+            if state is None:
+                state = states[tr.id] = {
+                    'starttime': tr.stats.starttime,
+                    'sampling_rate': tr.stats.sampling_rate, 'next': 0,
+                    'start': 0, 'data': tr.data[:0], 'triggers': None}
+            index = int(round((tr.stats.starttime - state['starttime']) *
+                              state['sampling_rate']))
+            if index > state['next']:
+                msg = 'Gap in data of {} before {}'.format(
+                    tr.id, tr.stats.starttime)
+                raise ValueError(msg)
+            data = tr.data[state['next'] - index:]
+            state['next'] += len(data)
+            data = np.concatenate([state['data'], data])
+            kwargs['max_len'] = int(
+                max_trigger_length * state['sampling_rate'] + 0.5)
+            on, off, ids, cft_peaks, cft_stds = _station_triggers(
+                tr.id, data, state['starttime'], state['sampling_rate'],
+                thr_on, thr_off, details, offset=state['start'], **kwargs)
+            # triggers starting after the characteristic function last
+            # dropped below thr_off can still change with the next chunk
+            below = np.nonzero(~(data >= thr_off))[0]
+            keep = below[-1] + 1 if len(below) else 0
+            keep_time = (state['starttime'] +
+                         float(state['start'] + keep) /
+                         state['sampling_rate']).timestamp
+            final = on < keep_time
+            triggers.append(tuple(array[final] for array in
+                                  (on, off, ids, cft_peaks, cft_stds)))
+            state['triggers'] = tuple(array[~final] for array in
+                                      (on, off, ids, cft_peaks, cft_stds))
+            state['data'] = data[keep:]
+            state['start'] += keep
+            state['safe_time'] = keep_time
+        safe_time = min([state['safe_time'] for state in states.values()
+                         if state is not None and 'safe_time' in state],
+                        default=np.inf)
+        coincidence_triggers, pending, last_off_time = _coincidence_triggers(
+            _concatenate_triggers(triggers), trace_ids, thr_coincidence_sum,
+            trigger_off_extension, details, last_off_time=last_off_time,
+            safe_time=safe_time)
+        yield coincidence_triggers
+    triggers = [pending] + [state['triggers'] for state in states.values()
+                            if state is not None]
+    yield _coincidence_triggers(
+        _concatenate_triggers(triggers), trace_ids, thr_coincidence_sum,
+        trigger_off_extension, details, last_off_time=last_off_time)[0]
@@ -13,7 +13,6 @@ import ctypes as C  # NOQA
 import math
 
 import numpy as np
-from scipy import fftpack, signal
 
 from obspy.core.util.misc import factorize_int
 from obspy.signal.headers import clibsignal
@@ -132,6 +131,7 @@ def enframe(x, win, inc):
     :return f: output matrix, each frame occupies one row
     :return length, no_win: length of each frame in samples, number of frames
     """
+    from scipy import signal
     nx = len(x)
     nwin = len(win)
     if (nwin == 1):
@@ -161,6 +161,7 @@ def smooth(x, smoothie):
     :param smoothie: number of past/future values to calculate moving average
     :return out: smoothed signal
     """
+    from scipy import signal
     size_x = np.size(x)
     if smoothie > 0:
         if (len(x) > 1 and len(x) < size_x):
@@ -213,6 +214,7 @@ def rdct(x, n=0):
     :params n: window length (default: signal length)
     :return y: discrete cosine transform
     """
+    from scipy import fftpack
     m, k = x.shape
     if (n == 0):
         n = m
@@ -11,13 +11,73 @@ Calculations for 3D ray paths.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import warnings
+from multiprocessing import Pool
+
 import numpy as np
 
 import obspy.geodetics.base as geodetics
 
 
+# Model used in the worker processes of get_ray_paths().
+_WORKER_MODEL = None
+
+
+def _init_worker(model):
+    """
+    Set the model of a worker process.
+    """
+    global _WORKER_MODEL
+    _WORKER_MODEL = model
+
+
+def _event_ray_paths_worker(args):
+    """
+    Compute the ray paths from one event in a worker process.
+    """
+    return _event_ray_paths(_WORKER_MODEL, *args)
+
+
+def _event_ray_paths(model, evlat, evlon, evdepth_km, stlats, stlons,
+                     phase_list, coordinate_system):
+    """
+    Compute the ray paths from one event to all stations.
+
+    Returns a list with the great circle coordinates and phase names of
+    the ray paths for each station.
+    """
+    from obspy.taup.taup_geo import add_geo_to_arrivals, calc_dist
+    radius = model.model.radius_of_planet
+    distances = [calc_dist(evlat, evlon, stlat, stlon, radius,
+                           model.planet_flattening)
+                 for stlat, stlon in zip(stlats, stlons)]
+    all_arrivals = model.get_ray_paths_many(evdepth_km, distances,
+                                            phase_list=phase_list)
+    greatcircles = []
+    for stlat, stlon, arrivals in zip(stlats, stlons, all_arrivals):
+        arrivals = add_geo_to_arrivals(arrivals, evlat, evlon, stlat, stlon,
+                                       radius, model.planet_flattening,
+                                       resample=True)
+        station_greatcircles = []
+        for arr in arrivals:
+            radii = (radius - arr.path['depth']) / radius
+            thetas = np.radians(90. - arr.path['lat'])
+            phis = np.radians(arr.path['lon'])
+
+            if coordinate_system == 'RTP':
+                gcircle = np.array([radii, thetas, phis])
+
+            if coordinate_system == 'XYZ':
+                gcircle = np.array([radii * np.sin(thetas) * np.cos(phis),
+                                    radii * np.sin(thetas) * np.sin(phis),
+                                    radii * np.cos(thetas)])
+
+            station_greatcircles.append((gcircle, arr.name))
+        greatcircles.append(station_greatcircles)
+    return greatcircles
+
+
 def get_ray_paths(inventory, catalog, phase_list=['P'],
-                  coordinate_system='XYZ', taup_model='iasp91'):
+                  coordinate_system='XYZ', taup_model='iasp91', processes=1):
     """
     This function returns lat, lon, depth coordinates from an event
     location to all stations in the inventory object
@@ -28,6 +88,10 @@ def get_ray_paths(inventory, catalog, phase_list=['P'],
     :param coordinate_system: can be either 'XYZ' or 'RTP'.
     :param taup_model: the taup model for which the greatcircle paths are
                   computed
+    :param processes: Number of worker processes over which the events are
+        distributed. ``1`` computes everything in the current process,
+        ``None`` uses as many processes as there are CPUs.
+    :type processes: int
     :returns: a list of tuples
         ``[(gcircle, phase_name, station_label, event_timestamp,
         event_magnitude, event_id, origin_id), ...]``. ``gcircle`` is an array
@@ -101,33 +165,25 @@ def get_ray_paths(inventory, catalog, phase_list=['P'],
     else:
         model = taup_model
 
-    # now loop through all stations and source combinations
-    r_earth = model.model.radius_of_planet
-    greatcircles = []
-    for stlat, stlon, stlabel in zip(stlats, stlons, stlabels):
-        for evlat, evlon, evdepth_km, time, magnitude, event_id, origin_id \
-                in zip(evlats, evlons, evdepths, times, magnitudes, event_ids,
-                       origin_ids):
-            arrivals = model.get_ray_paths_geo(
-                evdepth_km, evlat, evlon, stlat, stlon, phase_list=phase_list,
-                resample=True)
-            if len(arrivals) == 0:
-                continue
-
-            for arr in arrivals:
-                radii = (r_earth - arr.path['depth']) / r_earth
-                thetas = np.radians(90. - arr.path['lat'])
-                phis = np.radians(arr.path['lon'])
-
-                if coordinate_system == 'RTP':
-                    gcircle = np.array([radii, thetas, phis])
-
-                if coordinate_system == 'XYZ':
-                    gcircle = np.array([radii * np.sin(thetas) * np.cos(phis),
-                                        radii * np.sin(thetas) * np.sin(phis),
-                                        radii * np.cos(thetas)])
+    # compute the paths from each event to all stations at once, optionally
+    # spread over several processes
+    tasks = [(evlat, evlon, evdepth_km, stlats, stlons, phase_list,
+              coordinate_system)
+             for evlat, evlon, evdepth_km in zip(evlats, evlons, evdepths)]
+    if processes == 1 or len(tasks) < 2:
+        results = [_event_ray_paths(model, *task) for task in tasks]
+    else:
+        with Pool(processes, initializer=_init_worker,
+                  initargs=(model, )) as pool:
+            results = pool.map(_event_ray_paths_worker, tasks)
 
-                greatcircles.append((gcircle, arr.name, stlabel, time,
+    # keep the order of looping through all stations and then all sources
+    greatcircles = []
+    for i, stlabel in enumerate(stlabels):
+        for event_results, time, magnitude, event_id, origin_id in zip(
+                results, times, magnitudes, event_ids, origin_ids):
+            for gcircle, name in event_results[i]:
+                greatcircles.append((gcircle, name, stlabel, time,
                                      magnitude, event_id, origin_id))
 
     return greatcircles
@@ -125,6 +125,12 @@ class SeismicPhase(object):
         self.down_going = []
         # ArrayList of wave types corresponding to each leg of the phase.
         self.wave_type = []
+        # Cached branches and layer ranges used when shooting rays, as well
+        # as the velocities at source and receiver. These only depend on the
+        # phase and are set up on first use.
+        self._shoot_branches = None
+        self._takeoff_velocity = None
+        self._incident_velocity = None
 
         self.parse_name(tau_model)
         self.sum_branches(tau_model)
@@ -1233,6 +1239,64 @@ class SeismicPhase(object):
                 self._settings["max_recursion"]))
         return arrivals
 
+    def calc_time_many(self, degrees,
+                       ray_param_tol=_DEFAULT_VALUES[
+                           "default_time_ray_param_tol"]):
+        """
+        Calculate arrival times for this phase for many distances at once.
+
+        The search for the ray parameter intervals containing each distance
+        is done for all distances in a single call to the C library, the
+        arrivals are then refined just like in :meth:`calc_time`.
+
+        :param degrees: Epicentral distances in degrees.
+        :type degrees: :class:`numpy.ndarray`
+        :returns: Indices into ``degrees`` and the corresponding arrivals,
+            sorted by index and time.
+        :rtype: tuple of :class:`numpy.ndarray` and list of
+            :class:`~obspy.taup.helper_classes.Arrival`
+        """
+        degrees = np.ascontiguousarray(degrees, dtype=np.float64).ravel()
+        count = len(self.dist)
+        # Upper bound for the number of arrivals per distance, see
+        # seismic_phase_calc_time_inner_loop().
+        max_per_degree = max(2 * (count - 1), 0) * (
+            int(self.max_distance // (2 * math.pi)) + 1)
+        # Limit the memory used for the intermediate results.
+        chunk_size = max(1, 1000000 // max(max_per_degree, 1))
+
+        indices = []
+        arrivals = []
+        for start in range(0, len(degrees), chunk_size):
+            chunk = degrees[start:start + chunk_size]
+            size = max(len(chunk) * max_per_degree, 1)
+            r_dist = np.empty(size, dtype=np.float64)
+            r_ray_num = np.empty(size, dtype=np.int32)
+            r_index = np.empty(size, dtype=np.int32)
+            phase_count = clibtau.seismic_phase_calc_time_many_inner_loop(
+                chunk,
+                len(chunk),
+                self.max_distance,
+                self.dist,
+                self.ray_param,
+                r_dist,
+                r_ray_num,
+                r_index,
+                count
+            )
+            for _i in range(phase_count):
+                index = start + r_index[_i]
+                indices.append(index)
+                arrivals.append(self.refine_arrival(
+                    degrees[index], r_ray_num[_i], r_dist[_i], ray_param_tol,
+                    self._settings["max_recursion"]))
+
+        # Sort by index and time, same order as calc_time() for each index.
+        order = sorted(range(len(arrivals)),
+                       key=lambda _i: (indices[_i], arrivals[_i].time))
+        return (np.array([indices[_i] for _i in order], dtype=np.int64),
+                [arrivals[_i] for _i in order])
+
     def calc_pierce(self, degrees,
                     ray_param_tol=_DEFAULT_VALUES["default_path_ray_param_tol"]
                     ):
@@ -1373,8 +1437,95 @@ class SeismicPhase(object):
         Only calls :meth:`calc_path_from_arrival`.
         """
         arrivals = self.calc_time(degrees, ray_param_tol=ray_param_tol)
-        for arrival in arrivals:
-            self.calc_path_from_arrival(arrival)
+        return self.calc_path_many(arrivals)
+
+    def calc_path_many(self, arrivals):
+        """
+        Calculate the paths for many arrivals of this phase at once.
+
+        Gives the same paths as calling :meth:`calc_path_from_arrival` for
+        each arrival, but the path through each branch is calculated for all
+        ray parameters in one go. The arrivals are modified in place.
+
+        :param arrivals: Arrivals of this phase, e.g. as returned by
+            :meth:`calc_time` or :meth:`calc_time_many`.
+        :type arrivals: list of :class:`~obspy.taup.helper_classes.Arrival`
+        :returns: The arrivals with the paths filled in.
+        :rtype: list of :class:`~obspy.taup.helper_classes.Arrival`
+        """
+        num = len(arrivals)
+        if not num:
+            return arrivals
+        ray_params = np.array([arr.ray_param for arr in arrivals],
+                              dtype=np.float64)
+        purist_dist = np.array([arr.purist_dist for arr in arrivals],
+                               dtype=np.float64)
+        everyone = np.arange(num)
+
+        # Collect the path segments of all arrivals in the order in which
+        # they make up each path. A stable sort by arrival index then puts
+        # every path together in the right order.
+        first = np.empty(num, dtype=TimeDist)
+        first['p'] = ray_params
+        first['time'] = 0
+        first['dist'] = 0
+        first['depth'] = self.tau_model.source_depth
+        indices = [everyone]
+        segments = [first]
+        for i, branch_num, is_p_wave, is_down_going in zip(
+                count(), self.branch_seq, self.wave_type, self.down_going):
+            br = self.tau_model.get_tau_branch(branch_num, is_p_wave)
+            index, temp_time_dist = br.path_many(
+                ray_params, is_down_going, self.tau_model.s_mod)
+            if len(temp_time_dist):
+                if np.any(temp_time_dist['dist'] < 0):
+                    raise RuntimeError("Path is backtracking, "
+                                       "this is impossible.")
+                indices.append(index)
+                segments.append(temp_time_dist)
+
+            # Special case for head and diffracted waves:
+            if i in self.head_or_diffract_seq:
+                dist_diff = (
+                    purist_dist - self.dist[0]
+                    )/len(self.head_or_diffract_seq)
+                if "Pdiff" in self.name or "Sdiff" in self.name:
+                    branch_depth = self.tau_model.cmb_depth
+                elif "Pn" in self.name or "Sn" in self.name:
+                    branch_depth = self.tau_model.moho_depth
+                elif "Kdiff" in self.name:
+                    branch_depth = self.tau_model.iocb_depth
+                else:
+                    raise RuntimeError(
+                        "Path adding head and diffracted wave, "
+                        "but did not find P/Sdiff or P/Sn, expected")
+                diff_td = np.empty(num, dtype=TimeDist)
+                diff_td['p'] = ray_params
+                diff_td['time'] = dist_diff * ray_params
+                diff_td['dist'] = dist_diff
+                diff_td['depth'] = branch_depth
+                indices.append(everyone)
+                segments.append(diff_td)
+
+        if "kmps" in self.name:
+            # kmps phases have no branches, so need to end them at the arrival
+            # distance.
+            head_td = np.empty(num, dtype=TimeDist)
+            head_td['p'] = ray_params
+            head_td['time'] = purist_dist * ray_params
+            head_td['dist'] = purist_dist
+            head_td['depth'] = 0
+            indices.append(everyone)
+            segments.append(head_td)
+
+        indices = np.concatenate(indices)
+        order = np.argsort(indices, kind='stable')
+        paths = np.concatenate(segments)[order]
+        splits = np.cumsum(np.bincount(indices, minlength=num))[:-1]
+        for arrival, path in zip(arrivals, np.split(paths, splits)):
+            np.cumsum(path['time'], out=path['time'])
+            np.cumsum(path['dist'], out=path['dist'])
+            arrival.path = path
         return arrivals
 
     def calc_path_from_arrival(self, curr_arrival):
@@ -1514,45 +1665,48 @@ class SeismicPhase(object):
             if self.ray_param[ray_param_index + 1] < ray_param:
                 break
 
-        tau_model = self.tau_model
-        s_mod = tau_model.s_mod
-
-        # counter for passes through each branch. 0 is P and 1 is S.
-        times_branches = self.calc_branch_mult(tau_model)
+        s_mod = self.tau_model.s_mod
         time = np.zeros(1)
         dist = np.zeros(1)
         ray_param = np.array([ray_param])
 
         # Sum the branches with the appropriate multiplier.
-        for j in range(tau_model.tau_branches.shape[1]):
-            if times_branches[0, j] != 0:
-                br = tau_model.get_tau_branch(j, s_mod.p_wave)
-                top_layer = s_mod.layer_number_below(br.top_depth,
-                                                     s_mod.p_wave)
-                bot_layer = s_mod.layer_number_above(br.bot_depth,
-                                                     s_mod.p_wave)
-                td = br.calc_time_dist(s_mod, top_layer, bot_layer, ray_param,
-                                       allow_turn_in_layer=True)
-
-                time += times_branches[0, j] * td['time']
-                dist += times_branches[0, j] * td['dist']
-
-            if times_branches[1, j] != 0:
-                br = tau_model.get_tau_branch(j, s_mod.s_wave)
-                top_layer = s_mod.layer_number_below(br.top_depth,
-                                                     s_mod.s_wave)
-                bot_layer = s_mod.layer_number_above(br.bot_depth,
-                                                     s_mod.s_wave)
-                td = br.calc_time_dist(s_mod, top_layer, bot_layer, ray_param,
-                                       allow_turn_in_layer=True)
-
-                time += times_branches[1, j] * td['time']
-                dist += times_branches[1, j] * td['dist']
+        for mult, br, top_layer, bot_layer in self._get_shoot_branches():
+            td = br.calc_time_dist(s_mod, top_layer, bot_layer, ray_param,
+                                   allow_turn_in_layer=True)
+            time += mult * td['time']
+            dist += mult * td['dist']
 
         return Arrival(self, degrees, time[0], dist[0], ray_param[0],
                        ray_param_index, self.name, self.purist_name,
                        self.source_depth, self.receiver_depth)
 
+    def _get_shoot_branches(self):
+        """
+        Return the branches a shot ray has to be summed over.
+
+        A list of (multiplier, branch, top layer, bottom layer) tuples in the
+        order P and S for each branch, only computed on first use.
+        """
+        if self._shoot_branches is not None:
+            return self._shoot_branches
+        tau_model = self.tau_model
+        s_mod = tau_model.s_mod
+        # counter for passes through each branch. 0 is P and 1 is S.
+        times_branches = self.calc_branch_mult(tau_model)
+        shoot_branches = []
+        for j in range(tau_model.tau_branches.shape[1]):
+            for k, is_p_wave in enumerate((s_mod.p_wave, s_mod.s_wave)):
+                if times_branches[k, j] == 0:
+                    continue
+                br = tau_model.get_tau_branch(j, is_p_wave)
+                top_layer = s_mod.layer_number_below(br.top_depth, is_p_wave)
+                bot_layer = s_mod.layer_number_above(br.bot_depth, is_p_wave)
+                shoot_branches.append(
+                    (times_branches[k, j], br, top_layer, bot_layer))
+        self._shoot_branches = shoot_branches
+        return shoot_branches
+
     def linear_interp_arrival(self, degrees, search_dist, left, right):
         if left.purist_dist == search_dist:
             return left
@@ -1603,17 +1757,20 @@ class SeismicPhase(object):
         if self.name.endswith('kmps'):
             return 0
 
-        v_mod = self.tau_model.s_mod.v_mod
-        try:
-            if self.down_going[0]:
-                takeoff_velocity = v_mod.evaluate_below(self.source_depth,
-                                                        self.name[0])
-            else:
-                takeoff_velocity = v_mod.evaluate_above(self.source_depth,
-                                                        self.name[0])
-        except (IndexError, LookupError) as e:
-            msg = 'Please contact the developers. This error should not occur.'
-            raise RuntimeError(msg) from e
+        if self._takeoff_velocity is None:
+            v_mod = self.tau_model.s_mod.v_mod
+            try:
+                if self.down_going[0]:
+                    self._takeoff_velocity = v_mod.evaluate_below(
+                        self.source_depth, self.name[0])
+                else:
+                    self._takeoff_velocity = v_mod.evaluate_above(
+                        self.source_depth, self.name[0])
+            except (IndexError, LookupError) as e:
+                msg = ('Please contact the developers. This error should not '
+                       'occur.')
+                raise RuntimeError(msg) from e
+        takeoff_velocity = self._takeoff_velocity
 
         takeoff_angle = np.degrees(math.asin(np.clip(
             takeoff_velocity.item() * ray_param /
@@ -1628,19 +1785,22 @@ class SeismicPhase(object):
         if self.name.endswith('kmps'):
             return 0
 
-        v_mod = self.tau_model.s_mod.v_mod
-        # Very last item is "END", assume first char is P or S
-        last_leg = self.legs[-2][0]
-        try:
-            if self.down_going[-1]:
-                incident_velocity = v_mod.evaluate_above(self.receiver_depth,
-                                                         last_leg)
-            else:
-                incident_velocity = v_mod.evaluate_below(self.receiver_depth,
-                                                         last_leg)
-        except (IndexError, LookupError) as e:
-            msg = 'Please contact the developers. This error should not occur.'
-            raise RuntimeError(msg) from e
+        if self._incident_velocity is None:
+            v_mod = self.tau_model.s_mod.v_mod
+            # Very last item is "END", assume first char is P or S
+            last_leg = self.legs[-2][0]
+            try:
+                if self.down_going[-1]:
+                    self._incident_velocity = v_mod.evaluate_above(
+                        self.receiver_depth, last_leg)
+                else:
+                    self._incident_velocity = v_mod.evaluate_below(
+                        self.receiver_depth, last_leg)
+            except (IndexError, LookupError) as e:
+                msg = ('Please contact the developers. This error should not '
+                       'occur.')
+                raise RuntimeError(msg) from e
+        incident_velocity = self._incident_velocity
 
         incident_angle = np.degrees(math.asin(np.clip(
             incident_velocity.item() * ray_param /
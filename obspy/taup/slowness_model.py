@@ -931,49 +931,62 @@ class SlownessModel(object):
             other_layers = self.p_layers
             wave = 'S'
 
+        # Only layers containing the ray parameter need to be split, so the
+        # velocity model is only evaluated for those.
+        mask = ((layers['top_p'] - p) * (p - layers['bot_p'])) > 0
+        # Don't need to check for S waves in inner core if
+        # allow_inner_core_s is False.
+        if not is_p_wave and not self.allow_inner_core_s:
+            iocb_mask = layers['bot_depth'] > self.v_mod.iocb_depth
+            mask &= ~iocb_mask
+        index = np.where(mask)[0]
+        if not len(index):
+            return
+        split_layers = layers[index]
+
         # If depths are the same only need top_velocity, and just to verify we
         # are not in a fluid.
-        nonzero = layers['top_depth'] != layers['bot_depth']
-        above = self.v_mod.evaluate_above(layers['bot_depth'], wave)
-        below = self.v_mod.evaluate_below(layers['top_depth'], wave)
+        nonzero = split_layers['top_depth'] != split_layers['bot_depth']
+        above = self.v_mod.evaluate_above(split_layers['bot_depth'], wave)
+        below = self.v_mod.evaluate_below(split_layers['top_depth'], wave)
         top_velocity = np.where(nonzero, below, above)
         bot_velocity = np.where(nonzero, above, below)
 
-        mask = ((layers['top_p'] - p) * (p - layers['bot_p'])) > 0
-        # Don't need to check for S waves in a fluid or in inner core if
-        # allow_inner_core_s is False.
+        # Don't need to check for S waves in a fluid.
         if not is_p_wave:
-            mask &= top_velocity != 0
-            if not self.allow_inner_core_s:
-                iocb_mask = layers['bot_depth'] > self.v_mod.iocb_depth
-                mask &= ~iocb_mask
-
-        index = np.where(mask)[0]
-
-        bot_depth = np.copy(layers['bot_depth'])
+            fluid = top_velocity == 0
+            if np.any(fluid):
+                index = index[~fluid]
+                split_layers = split_layers[~fluid]
+                nonzero = nonzero[~fluid]
+                top_velocity = top_velocity[~fluid]
+                bot_velocity = bot_velocity[~fluid]
+
+        bot_depth = np.copy(split_layers['bot_depth'])
         # Not a zero thickness layer, so calculate the depth for
         # the ray parameter.
         slope = ((bot_velocity[nonzero] - top_velocity[nonzero]) /
-                 (layers['bot_depth'][nonzero] - layers['top_depth'][nonzero]))
-        bot_depth[nonzero] = self.interpolate(p, top_velocity[nonzero],
-                                              layers['top_depth'][nonzero],
-                                              slope)
+                 (split_layers['bot_depth'][nonzero] -
+                  split_layers['top_depth'][nonzero]))
+        bot_depth[nonzero] = self.interpolate(
+            p, top_velocity[nonzero], split_layers['top_depth'][nonzero],
+            slope)
 
         bot_layer = np.empty(shape=index.shape, dtype=SlownessLayer)
         bot_layer['top_p'].fill(p)
-        bot_layer['top_depth'] = bot_depth[mask]
-        bot_layer['bot_p'] = layers['bot_p'][mask]
-        bot_layer['bot_depth'] = layers['bot_depth'][mask]
+        bot_layer['top_depth'] = bot_depth
+        bot_layer['bot_p'] = split_layers['bot_p']
+        bot_layer['bot_depth'] = split_layers['bot_depth']
 
         top_layer = np.empty(shape=index.shape, dtype=SlownessLayer)
-        top_layer['top_p'] = layers['top_p'][mask]
-        top_layer['top_depth'] = layers['top_depth'][mask]
+        top_layer['top_p'] = split_layers['top_p']
+        top_layer['top_depth'] = split_layers['top_depth']
         top_layer['bot_p'].fill(p)
-        top_layer['bot_depth'] = bot_depth[mask]
+        top_layer['bot_depth'] = bot_depth
 
         # numpy 1.6 compatibility
         other_index = np.where(other_layers.reshape(1, -1) ==
-                               layers[mask].reshape(-1, 1))
+                               split_layers.reshape(-1, 1))
         layers[index] = bot_layer
         layers = np.insert(layers, index, top_layer)
         if len(other_index[0]):
@@ -1769,7 +1782,7 @@ class SlownessModel(object):
             out_layers[layer_num] = bot_layer
             out_layers = np.insert(out_layers, layer_num, top_layer)
             # Fix critical layers since we added a slowness layer.
-            out_critical_depths = self.critical_depths
+            out_critical_depths = out.critical_depths
             _fix_critical_depths(out_critical_depths, layer_num, is_p_wave)
             if is_p_wave:
                 out_p_layers = out_layers
@@ -165,6 +165,41 @@ int seismic_phase_calc_time_inner_loop(
 }
 
 
+/*
+ * Same as seismic_phase_calc_time_inner_loop() but for many distances at
+ * once. The results for all distances are written one after the other,
+ * degree_index_results holds the index of the distance each result belongs
+ * to. The result arrays must be large enough to hold all results, i.e.
+ * 2 * (count - 1) * (floor(max_distance / (2 * pi)) + 1) per distance.
+ */
+int seismic_phase_calc_time_many_inner_loop(
+    double *degrees,
+    int n_degrees,
+    double max_distance,
+    double *dist,
+    double *ray_param,
+    double *search_dist_results,
+    int *ray_num_results,
+    int *degree_index_results,
+    int count) {
+
+    int i, j;
+    int n = 0;
+    int r = 0;
+
+    for (i=0; i < n_degrees; i++) {
+        n = seismic_phase_calc_time_inner_loop(
+            degrees[i], max_distance, dist, ray_param,
+            search_dist_results + r, ray_num_results + r, count);
+        for (j=r; j < r + n; j++) {
+            degree_index_results[j] = i;
+        }
+        r += n;
+    }
+    return r;
+}
+
+
 void bullen_radial_slowness_inner_loop(
         double *layer,
         double *p,
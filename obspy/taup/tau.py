@@ -3,7 +3,10 @@
 High-level interface to travel-time calculation routines.
 """
 import copy
+import os
 import warnings
+from collections import OrderedDict
+from multiprocessing import Pool
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
@@ -18,7 +21,7 @@ from .tau_model import TauModel
 from .taup_path import TauPPath
 from .taup_pierce import TauPPierce
 from .taup_time import TauPTime
-from .taup_geo import calc_dist, add_geo_to_arrivals
+from .taup_geo import calc_dist, calc_dist_azi_many, add_geo_to_arrivals
 from .seismic_phase import SeismicPhase
 from .utils import parse_phase_list, split_ray_path
 import obspy.geodetics.base as geodetics
@@ -621,13 +624,33 @@ class Arrivals(list):
                               phase_list=("ttall",))
 
 
+# Model used in the worker processes of
+# TauPyModel.get_travel_times_geo_many().
+_WORKER_MODEL = None
+
+
+def _init_worker(model):
+    """
+    Set the model of a worker process.
+    """
+    global _WORKER_MODEL
+    _WORKER_MODEL = model
+
+
+def _get_travel_times_many_worker(args):
+    """
+    Compute the travel times for one source depth in a worker process.
+    """
+    return _WORKER_MODEL.get_travel_times_many(*args)
+
+
 class TauPyModel(object):
     """
     Representation of a seismic model and methods for ray paths through it.
     """
 
     def __init__(self, model="iasp91", verbose=False, planet_flattening=0.0,
-                 cache=None):
+                 cache=None, phase_cache=None, mmap=False):
         """
         Loads an already created TauPy model.
 
@@ -647,8 +670,30 @@ class TauPyModel(object):
             multiple results are requested for the same source depth. The
             dictionary must be ordered, otherwise the LRU cache will not
             behave correctly. If ``False`` is specified, then no cache will be
-            used.
-        :type cache: :class:`collections.OrderedDict` or bool
+            used. Use a :class:`~obspy.taup.tau_model.DepthCache` to change
+            the number of cached models or to store them on disk for reuse
+            in other processes.
+        :type cache: :class:`collections.OrderedDict`,
+            :class:`~obspy.taup.tau_model.DepthCache` or bool
+        :param phase_cache: An object to use to cache the seismic phases set
+            up for a source and receiver depth, so that repeated requests for
+            the same depths only do the distance dependent calculations.
+            Like ``cache``, it must be an ordered dictionary and ``False``
+            disables caching. By default at most 512 phases are kept, this
+            can be changed with a ``maxsize`` attribute of the dictionary
+            (e.g. by passing a :class:`~obspy.taup.tau_model.DepthCache`).
+            Cached phases keep their depth corrected models alive, so the
+            phase cache is disabled by default if ``cache`` is ``False``.
+        :type phase_cache: :class:`collections.OrderedDict` or bool
+        :param mmap: Memory map the model from its file instead of reading it
+            into memory, so that all processes using the same model file
+            share one copy of it. This requires an uncompressed model file,
+            which can be created with
+            :meth:`~obspy.taup.tau_model.TauModel.serialize`. Pickled
+            models (e.g. when sent to the processes of a
+            :class:`multiprocessing.Pool`) map the file again instead of
+            carrying a copy of the model.
+        :type mmap: bool
 
         Usage:
 
@@ -662,9 +707,43 @@ class TauPyModel(object):
         2
         """
         self.verbose = verbose
-        self.model = TauModel.from_file(model, cache=cache)
+        self.model = TauModel.from_file(model, cache=cache, mmap=mmap)
+        if phase_cache is None:
+            phase_cache = None if cache is False else OrderedDict()
+        elif phase_cache is False:
+            phase_cache = None
+        self._phase_cache = phase_cache
         self.planet_flattening = planet_flattening
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The caches are passed on empty, their contents are private copies
+        # or refer to this model and can be much larger than the model.
+        caches = []
+        for cache in (self.model._depth_cache, self._phase_cache):
+            if cache is not None:
+                cache = copy.copy(cache)
+                cache.clear()
+            caches.append(cache)
+        depth_cache, state["_phase_cache"] = caches
+        filename = self.model._mmap_filename
+        if filename is not None:
+            # Only pass on the file name, the model is mapped again when
+            # unpickling.
+            state["model"] = (filename,
+                              False if depth_cache is None else depth_cache)
+        else:
+            state["model"] = copy.copy(self.model)
+            state["model"]._depth_cache = depth_cache
+        return state
+
+    def __setstate__(self, state):
+        if isinstance(state["model"], tuple):
+            filename, cache = state["model"]
+            state["model"] = TauModel.deserialize(filename, cache=cache,
+                                                  mmap=True)
+        self.__dict__.update(state)
+
     def get_travel_times(self, source_depth_in_km, distance_in_degree=None,
                          phase_list=("ttall",), receiver_depth_in_km=0.0,
                          ray_param_tol=_DEFAULT_VALUES[
@@ -696,11 +775,98 @@ class TauPyModel(object):
         # same phase.
         tt = TauPTime(self.model, phase_list, source_depth_in_km,
                       distance_in_degree, receiver_depth_in_km,
-                      ray_param_tol=ray_param_tol)
+                      ray_param_tol=ray_param_tol,
+                      phase_cache=self._phase_cache)
         tt.run()
         return Arrivals(sorted(tt.arrivals, key=lambda x: x.time),
                         model=self.model)
 
+    def get_travel_times_many(self, source_depth_in_km, distances_in_degree,
+                              phase_list=("ttall",), receiver_depth_in_km=0.0,
+                              ray_param_tol=_DEFAULT_VALUES[
+                                  "default_time_ray_param_tol"]):
+        """
+        Return travel times of every given phase for many distances at once.
+
+        This gives the same arrivals as calling :meth:`get_travel_times` for
+        every distance, but the model is only corrected for the source depth
+        and the phases are only set up once, and the search for the arrivals
+        of each phase is done for all distances in a single pass.
+
+        :param source_depth_in_km: Source depth in km
+        :type source_depth_in_km: float
+        :param distances_in_degree: Epicentral distances in degrees.
+        :type distances_in_degree: :class:`numpy.ndarray` or list[float]
+        :param phase_list: List of phases for which travel times should be
+            calculated. If this is empty, all phases in arrivals object
+            will be used.
+        :type phase_list: list[str]
+        :param receiver_depth_in_km: Receiver depth in km
+        :type receiver_depth_in_km: float
+        :param ray_param_tol: Absolute tolerance in s used in estimation of
+            ray parameter.
+        :type ray_param_tol: float
+
+        :return: Structured array with one row per arrival, sorted by the
+            index of the distance and then by time. Fields are ``index``
+            (index into ``distances_in_degree``), ``distance`` (in degrees),
+            ``name`` (phase name), ``time`` (in s), ``ray_param`` (in s/rad),
+            ``takeoff_angle``, ``incident_angle`` and ``purist_distance``
+            (all in degrees), see
+            :class:`~obspy.taup.helper_classes.Arrival`.
+        :rtype: :class:`numpy.ndarray`
+
+        .. rubric:: Example
+
+        >>> from obspy.taup import TauPyModel
+        >>> model = TauPyModel(model="iasp91")
+        >>> arrivals = model.get_travel_times_many(
+        ...     10, [40, 60, 80], phase_list=["P", "S"])
+        >>> for row in arrivals:
+        ...     print(row["index"], row["name"], round(row["time"], 1))
+        0 P 454.7
+        0 S 821.1
+        1 P 606.7
+        1 S 1100.0
+        2 P 729.6
+        2 S 1334.2
+        """
+        distances = np.atleast_1d(
+            np.asarray(distances_in_degree, dtype=np.float64))
+        if distances.ndim != 1:
+            msg = "Distances must be a scalar or a 1-D array."
+            raise ValueError(msg)
+        tt = TauPTime(self.model, phase_list, source_depth_in_km,
+                      distances, receiver_depth_in_km,
+                      ray_param_tol=ray_param_tol,
+                      phase_cache=self._phase_cache)
+        tt.depth_correct(source_depth_in_km, receiver_depth_in_km)
+        tt.recalc_phases()
+
+        indices = []
+        arrivals = []
+        for phase in tt.phases:
+            index, arrivals_ = phase.calc_time_many(distances, ray_param_tol)
+            indices.append(index)
+            arrivals.extend(arrivals_)
+        indices = np.concatenate(indices or [np.empty(0, dtype=np.int64)])
+
+        max_name_length = max([len(arr.name) for arr in arrivals] + [1])
+        dtype = [("index", np.int64), ("distance", np.float64),
+                 ("name", "U%d" % max_name_length), ("time", np.float64),
+                 ("ray_param", np.float64), ("takeoff_angle", np.float64),
+                 ("incident_angle", np.float64),
+                 ("purist_distance", np.float64)]
+        table = np.empty(len(arrivals), dtype=dtype)
+        table["index"] = indices
+        table["distance"] = distances[indices]
+        for key in ("name", "time", "ray_param", "takeoff_angle",
+                    "incident_angle", "purist_distance"):
+            table[key] = [getattr(arr, key) for arr in arrivals]
+        # Phases were appended in order, so ties in time keep the phase order
+        # of get_travel_times().
+        return table[np.lexsort((table["time"], table["index"]))]
+
     def get_pierce_points(self, source_depth_in_km, distance_in_degree,
                           phase_list=("ttall",), receiver_depth_in_km=0.0,
                           add_depth=[],
@@ -733,7 +899,8 @@ class TauPyModel(object):
         """
         pp = TauPPierce(self.model, phase_list, source_depth_in_km,
                         distance_in_degree, receiver_depth_in_km,
-                        add_depth, ray_param_tol=ray_param_tol)
+                        add_depth, ray_param_tol=ray_param_tol,
+                        phase_cache=self._phase_cache)
         pp.run()
         return Arrivals(sorted(pp.arrivals, key=lambda x: x.time),
                         model=self.model)
@@ -766,11 +933,78 @@ class TauPyModel(object):
         """
         rp = TauPPath(self.model, phase_list, source_depth_in_km,
                       distance_in_degree, receiver_depth_in_km,
-                      ray_param_tol=ray_param_tol)
+                      ray_param_tol=ray_param_tol,
+                      phase_cache=self._phase_cache)
         rp.run()
         return Arrivals(sorted(rp.arrivals, key=lambda x: x.time),
                         model=self.model)
 
+    def get_ray_paths_many(self, source_depth_in_km, distances_in_degree,
+                           phase_list=("ttall",), receiver_depth_in_km=0.0,
+                           ray_param_tol=_DEFAULT_VALUES[
+                               "default_path_ray_param_tol"]):
+        """
+        Return ray paths of every given phase for many distances at once.
+
+        This gives the same arrivals as calling :meth:`get_ray_paths` for
+        every distance, but the model is only corrected for the source depth
+        and the phases are only set up once, and the paths of all arrivals of
+        a phase are calculated together, see
+        :meth:`~obspy.taup.seismic_phase.SeismicPhase.calc_path_many`.
+
+        :param source_depth_in_km: Source depth in km
+        :type source_depth_in_km: float
+        :param distances_in_degree: Epicentral distances in degrees.
+        :type distances_in_degree: :class:`numpy.ndarray` or list[float]
+        :param phase_list: List of phases for which travel times should be
+            calculated. If this is empty, all phases in arrivals object
+            will be used.
+        :type phase_list: list[str]
+        :param receiver_depth_in_km: Receiver depth in km
+        :type receiver_depth_in_km: float
+        :param ray_param_tol: Absolute tolerance in s used in estimation of
+            ray parameter.
+        :type ray_param_tol: float
+
+        :return: One :class:`Arrivals` object per distance, each sorted by
+            time like the ones returned by :meth:`get_ray_paths`.
+        :rtype: list of :class:`Arrivals`
+
+        .. rubric:: Example
+
+        >>> from obspy.taup import TauPyModel
+        >>> model = TauPyModel(model="iasp91")
+        >>> arrivals = model.get_ray_paths_many(
+        ...     10, [40, 60, 80], phase_list=["P"])
+        >>> for arrivals_ in arrivals:
+        ...     print(arrivals_[0].distance, len(arrivals_[0].path))
+        40.0 206
+        60.0 286
+        80.0 358
+        """
+        distances = np.atleast_1d(
+            np.asarray(distances_in_degree, dtype=np.float64))
+        if distances.ndim != 1:
+            msg = "Distances must be a scalar or a 1-D array."
+            raise ValueError(msg)
+        rp = TauPPath(self.model, phase_list, source_depth_in_km,
+                      distances, receiver_depth_in_km,
+                      ray_param_tol=ray_param_tol,
+                      phase_cache=self._phase_cache)
+        rp.depth_correct(source_depth_in_km, receiver_depth_in_km)
+        rp.recalc_phases()
+
+        arrivals = [[] for _ in distances]
+        for phase in rp.phases:
+            indices, arrivals_ = phase.calc_time_many(distances,
+                                                      ray_param_tol)
+            phase.calc_path_many(arrivals_)
+            for index, arrival in zip(indices, arrivals_):
+                arrivals[index].append(arrival)
+        return [Arrivals(sorted(arrivals_, key=lambda x: x.time),
+                         model=self.model)
+                for arrivals_ in arrivals]
+
     def get_travel_times_geo(self, source_depth_in_km, source_latitude_in_deg,
                              source_longitude_in_deg, receiver_latitude_in_deg,
                              receiver_longitude_in_deg, phase_list=("ttall",),
@@ -822,6 +1056,139 @@ class TauPyModel(object):
                                          ray_param_tol=ray_param_tol)
         return arrivals
 
+    def get_travel_times_geo_many(self, source_depth_in_km,
+                                  source_latitude_in_deg,
+                                  source_longitude_in_deg,
+                                  receiver_latitude_in_deg,
+                                  receiver_longitude_in_deg,
+                                  phase_list=("ttall",),
+                                  ray_param_tol=_DEFAULT_VALUES[
+                                      "default_time_ray_param_tol"],
+                                  processes=1):
+        """
+        Return travel times of every given phase for many sources and
+        receivers given geographical data.
+
+        Travel times are calculated for every combination of source (e.g. the
+        events of a catalog) and receiver (e.g. the stations of a network).
+        This gives the same arrivals as calling :meth:`get_travel_times_geo`
+        for every pair, but sources are grouped by depth and all distances
+        of a group are computed with :meth:`get_travel_times_many`. Groups
+        can be distributed over several processes.
+
+        :param source_depth_in_km: Source depths in km
+        :type source_depth_in_km: :class:`numpy.ndarray` or float
+        :param source_latitude_in_deg: Source latitudes in degrees
+        :type source_latitude_in_deg: :class:`numpy.ndarray` or float
+        :param source_longitude_in_deg: Source longitudes in degrees
+        :type source_longitude_in_deg: :class:`numpy.ndarray` or float
+        :param receiver_latitude_in_deg: Receiver latitudes in degrees
+        :type receiver_latitude_in_deg: :class:`numpy.ndarray` or float
+        :param receiver_longitude_in_deg: Receiver longitudes in degrees
+        :type receiver_longitude_in_deg: :class:`numpy.ndarray` or float
+        :param phase_list: List of phases for which travel times should be
+            calculated. If this is empty, all phases in arrivals object
+            will be used.
+        :type phase_list: list[str]
+        :param ray_param_tol: Absolute tolerance in s used in estimation of
+            ray parameter.
+        :type ray_param_tol: float
+        :param processes: Number of worker processes. ``1`` (the default)
+            does all calculations in the current process, ``None`` uses as
+            many processes as there are CPUs.
+        :type processes: int
+
+        :return: Structured array with one row per arrival, sorted by source
+            index, receiver index and time. Fields are ``source_index`` and
+            ``receiver_index`` (indices into the given source and receiver
+            arrays), ``distance``, ``azimuth`` (from source to receiver) and
+            ``backazimuth`` (from receiver to source) in degrees, and
+            ``name``, ``time``, ``ray_param``, ``takeoff_angle``,
+            ``incident_angle`` and ``purist_distance`` like in
+            :meth:`get_travel_times_many`.
+        :rtype: :class:`numpy.ndarray`
+
+        .. rubric:: Example
+
+        >>> from obspy.taup import TauPyModel
+        >>> model = TauPyModel(model="iasp91")
+        >>> arrivals = model.get_travel_times_geo_many(
+        ...     [10, 100], [0, 10], [0, 20], [40, 50], [30, 30],
+        ...     phase_list=["P"])
+        >>> for row in arrivals:
+        ...     print(row["source_index"], row["receiver_index"],
+        ...           round(row["distance"], 1), round(row["time"], 1))
+        0 0 48.4 522.3
+        0 1 56.2 579.8
+        1 0 31.3 370.4
+        1 1 40.8 451.7
+        """
+        depths, source_lats, source_lons = [
+            np.atleast_1d(np.asarray(x, dtype=np.float64))
+            for x in np.broadcast_arrays(source_depth_in_km,
+                                         source_latitude_in_deg,
+                                         source_longitude_in_deg)]
+        receiver_lats, receiver_lons = [
+            np.atleast_1d(np.asarray(x, dtype=np.float64))
+            for x in np.broadcast_arrays(receiver_latitude_in_deg,
+                                         receiver_longitude_in_deg)]
+        if depths.ndim != 1 or receiver_lats.ndim != 1:
+            msg = "Source and receiver locations must be 1-D arrays."
+            raise ValueError(msg)
+        num_receivers = len(receiver_lats)
+        distance, azimuth, backazimuth = calc_dist_azi_many(
+            source_lats[:, np.newaxis], source_lons[:, np.newaxis],
+            receiver_lats[np.newaxis, :], receiver_lons[np.newaxis, :],
+            self.model.radius_of_planet, self.planet_flattening)
+
+        # Group the sources by depth, one task per depth.
+        unique_depths, inverse = np.unique(depths, return_inverse=True)
+        inverse = inverse.ravel()
+        groups = np.split(np.argsort(inverse, kind="stable"),
+                          np.cumsum(np.bincount(inverse))[:-1])
+        tasks = [(depth, distance[sources].ravel(), phase_list, 0.0,
+                  ray_param_tol)
+                 for depth, sources in zip(unique_depths, groups)]
+        if processes == 1:
+            tables = [self.get_travel_times_many(*task) for task in tasks]
+        else:
+            processes = processes or os.cpu_count() or 1
+            with Pool(processes, initializer=_init_worker,
+                      initargs=(self, )) as pool:
+                chunksize = max(1, len(tasks) // (4 * processes))
+                tables = pool.map(_get_travel_times_many_worker, tasks,
+                                  chunksize=chunksize)
+
+        max_name_length = max(
+            [table.dtype["name"].itemsize // 4 for table in tables] + [1])
+        dtype = [("source_index", np.int64), ("receiver_index", np.int64),
+                 ("distance", np.float64), ("azimuth", np.float64),
+                 ("backazimuth", np.float64),
+                 ("name", "U%d" % max_name_length), ("time", np.float64),
+                 ("ray_param", np.float64), ("takeoff_angle", np.float64),
+                 ("incident_angle", np.float64),
+                 ("purist_distance", np.float64)]
+        result = np.empty(sum(len(table) for table in tables), dtype=dtype)
+        start = 0
+        for sources, table in zip(groups, tables):
+            end = start + len(table)
+            source_index = sources[table["index"] // num_receivers]
+            receiver_index = table["index"] % num_receivers
+            result["source_index"][start:end] = source_index
+            result["receiver_index"][start:end] = receiver_index
+            for key in ("distance", "name", "time", "ray_param",
+                        "takeoff_angle", "incident_angle", "purist_distance"):
+                result[key][start:end] = table[key]
+            start = end
+        result["azimuth"] = azimuth[result["source_index"],
+                                    result["receiver_index"]]
+        result["backazimuth"] = backazimuth[result["source_index"],
+                                            result["receiver_index"]]
+        # Sorting is stable, so ties in time keep the phase order of
+        # get_travel_times().
+        return result[np.lexsort((result["time"], result["receiver_index"],
+                                  result["source_index"]))]
+
     def get_pierce_points_geo(self, source_depth_in_km, source_latitude_in_deg,
                               source_longitude_in_deg,
                               receiver_latitude_in_deg,
@@ -92,15 +92,26 @@ class TauBranch(object):
 
         plen = len(ray_params)
         llen = len(layer_num)
+        # The inner loop only sums up the increments of each ray down to the
+        # layer in which it turns, so only those need to be calculated.
+        turned = ((ray_params[:, np.newaxis] > layer['top_p']) |
+                  (ray_params[:, np.newaxis] > layer['bot_p']))
+        last = np.where(turned.any(axis=1), turned.argmax(axis=1), llen - 1)
+        used = np.arange(llen) <= last[:, np.newaxis]
+        used[ray_params > self.max_ray_param] = False
+
         ray_params = np.repeat(ray_params, llen).reshape((plen, llen))
         layer_num = np.tile(layer_num, plen).reshape((plen, llen))
+        time = np.zeros(ray_params.shape, dtype=np.float64)
+        dist = np.zeros(ray_params.shape, dtype=np.float64)
 
-        # Ignore some errors because we pass in a few invalid combinations that
-        # are masked out later.
-        with np.errstate(divide='ignore', invalid='ignore'):
-            time, dist = s_mod.layer_time_dist(
-                ray_params, layer_num, self.is_p_wave, check=False,
-                allow_turn=True)
+        if np.any(used):
+            # Ignore some errors because we pass in a few invalid
+            # combinations that are masked out later.
+            with np.errstate(divide='ignore', invalid='ignore'):
+                time[used], dist[used] = s_mod.layer_time_dist(
+                    ray_params[used], layer_num[used], self.is_p_wave,
+                    check=False, allow_turn=True)
 
         clibtau.tau_branch_calc_time_dist_inner_loop(
             ray_params, time, dist, layer, time_dist, ray_params.shape[0],
@@ -445,6 +456,134 @@ class TauBranch(object):
         temp_path = the_path[:path_index]
         return temp_path
 
+    def path_many(self, ray_params, downgoing, s_mod):
+        """
+        Same as :meth:`path` for many ray parameters at once.
+
+        The time and distance increments for all rays are calculated in a
+        single call per layer type instead of one call per ray.
+
+        :param ray_params: The ray parameters of the rays.
+        :type ray_params: :class:`~numpy.ndarray`
+        :param downgoing: Whether the rays are downgoing in this branch.
+        :type downgoing: bool
+        :param s_mod: The slowness model.
+        :type s_mod: :class:`~obspy.taup.slowness_model.SlownessModel`
+        :returns: The index into ``ray_params`` of every path point and the
+            path points themselves. The points of each ray are contiguous
+            and in the same order as returned by :meth:`path`.
+        :rtype: tuple(:class:`~numpy.ndarray`, :class:`~numpy.ndarray`)
+        """
+        ray_params = np.asarray(ray_params, dtype=np.float64)
+        assert np.all(ray_params >= 0)
+        num_rays = len(ray_params)
+        valid = ray_params <= self.max_ray_param
+        if not np.any(valid):
+            return (np.empty(0, dtype=np.int_),
+                    np.empty(0, dtype=TimeDist))
+
+        try:
+            top_layer_num = s_mod.layer_number_below(self.top_depth,
+                                                     self.is_p_wave)
+            bot_layer_num = s_mod.layer_number_above(self.bot_depth,
+                                                     self.is_p_wave)
+        except SlownessModelError:
+            raise SlownessModelError("SlownessModel and TauModel are likely"
+                                     "out of sync.")
+
+        # Check to make sure layers and branches are compatible.
+        s_layer = s_mod.get_slowness_layer(top_layer_num, self.is_p_wave)
+        if s_layer['top_depth'] != self.top_depth:
+            raise SlownessModelError("Branch and slowness model are not in "
+                                     "agreement.")
+        s_layer = s_mod.get_slowness_layer(bot_layer_num, self.is_p_wave)
+        if s_layer['bot_depth'] != self.bot_depth:
+            raise SlownessModelError("Branch and slowness model are not in "
+                                     "agreement.")
+
+        if downgoing:
+            s_layer_num = np.arange(top_layer_num, bot_layer_num + 1)
+        else:
+            s_layer_num = np.arange(bot_layer_num, top_layer_num - 1, -1)
+        s_layer = s_mod.get_slowness_layer(s_layer_num, self.is_p_wave)
+        num_layers = len(s_layer)
+        nonzero = s_layer['top_depth'] != s_layer['bot_depth']
+        rays = np.arange(num_rays)
+        p = ray_params[:, np.newaxis]
+
+        if downgoing:
+            # Layers down to the turning layer, as (ray, layer) matrix.
+            mask = np.cumprod(s_layer['bot_p'] >= p, axis=1).astype(np.bool_)
+            mask &= nonzero
+            mask &= valid[:, np.newaxis]
+            # The layer after the last one used is the turning layer.
+            any_used = mask.any(axis=1)
+            turn = np.where(
+                any_used, num_layers - np.argmax(mask[:, ::-1], axis=1), 0)
+            has_turn = valid & (turn < num_layers)
+            has_turn[has_turn] = nonzero[turn[has_turn]]
+            layer_depth = s_layer['bot_depth']
+        else:
+            mask = (s_layer['top_p'] <= p) | ~nonzero
+            mask = np.cumprod(mask, axis=1).astype(np.bool_)
+            mask[:, -1] = False  # Always leave one element for Bullen.
+            # Apply Bullen laws on first available element, if possible.
+            turn = mask.sum(axis=1)
+            has_turn = valid & (s_layer['bot_p'][turn] < ray_params)
+            mask[rays[has_turn], turn[has_turn]] = True
+            mask = ~mask & nonzero & valid[:, np.newaxis]
+            layer_depth = s_layer['top_depth']
+
+        # Bullen laws for the layers in which the rays turn.
+        turn_layer = s_layer[turn[has_turn]]
+        turn_p = ray_params[has_turn]
+        turn_s_layer = np.empty(len(turn_layer), dtype=SlownessLayer)
+        if len(turn_layer):
+            turn_depth = bullen_depth_for(turn_layer, turn_p,
+                                          s_mod.radius_of_planet)
+            turn_s_layer['top_p'] = turn_layer['top_p']
+            turn_s_layer['top_depth'] = turn_layer['top_depth']
+            turn_s_layer['bot_p'] = turn_p
+            turn_s_layer['bot_depth'] = turn_depth
+            turn_time, turn_dist = bullen_radial_slowness(
+                turn_s_layer, turn_p, s_mod.radius_of_planet)
+
+        # Regular time/distance calculation for all other used layers.
+        layer_ray, layer_index = np.nonzero(mask)
+        if len(layer_ray):
+            time, dist = s_mod.layer_time_dist(
+                ray_params[layer_ray], s_layer_num[layer_index],
+                self.is_p_wave)
+
+        # Assemble points ray by ray.
+        num_layer_points = mask.sum(axis=1)
+        counts = num_layer_points + has_turn
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        the_path = np.empty(counts.sum(), dtype=TimeDist)
+        index = np.repeat(rays, counts)
+        if downgoing:
+            layer_start = offsets
+            turn_pos = offsets[has_turn] + num_layer_points[has_turn]
+            turn_depth_field = 'bot_depth'
+        else:
+            layer_start = offsets + has_turn
+            turn_pos = offsets[has_turn]
+            turn_depth_field = 'top_depth'
+        if len(layer_ray):
+            layer_pos = (layer_start[layer_ray] + np.arange(len(layer_ray)) -
+                         np.repeat(np.cumsum(num_layer_points) -
+                                   num_layer_points, num_layer_points))
+            the_path['p'][layer_pos] = ray_params[layer_ray]
+            the_path['time'][layer_pos] = time
+            the_path['dist'][layer_pos] = dist
+            the_path['depth'][layer_pos] = layer_depth[layer_index]
+        if len(turn_pos):
+            the_path['p'][turn_pos] = turn_p
+            the_path['time'][turn_pos] = turn_time
+            the_path['dist'][turn_pos] = turn_dist
+            the_path['depth'][turn_pos] = turn_s_layer[turn_depth_field]
+        return index, the_path
+
     def _to_array(self):
         """
         Store all attributes for serialization in a structured array.
@@ -2,6 +2,13 @@
 """
 Internal TauModel class.
 """
+import hashlib
+import io
+import mmap
+import os
+import struct
+import tempfile
+import zipfile
 from collections import OrderedDict
 from pathlib import Path
 from copy import deepcopy
@@ -16,6 +23,189 @@ from .tau_branch import TauBranch
 from .velocity_model import VelocityModel
 
 
+class _MemoryMappedNpz(object):
+    """
+    Read-only access to the arrays of an uncompressed npz file.
+
+    Behaves like the object returned by :func:`numpy.load` for npz files, but
+    the arrays are memory mapped from the file instead of being read into
+    memory. All processes that map the same file share one physical copy of
+    the data.
+    """
+    def __init__(self, filename):
+        self.filename = str(filename)
+        with open(self.filename, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = {}
+        with zipfile.ZipFile(self.filename) as zf:
+            for info in zf.infolist():
+                if info.compress_type != zipfile.ZIP_STORED:
+                    msg = ("Only uncompressed npz files can be memory "
+                           "mapped, use TauModel.serialize() with "
+                           "compress=False to create one.")
+                    raise ValueError(msg)
+                # The data follows the 30 byte local file header, the file
+                # name and the extra field.
+                start = info.header_offset
+                name_length, extra_length = struct.unpack(
+                    "<HH", self._mmap[start + 26:start + 30])
+                key = info.filename
+                if key.endswith(".npy"):
+                    key = key[:-4]
+                self._offsets[key] = start + 30 + name_length + extra_length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        # The mapping stays open as long as any array references it.
+        pass
+
+    def keys(self):
+        return self._offsets.keys()
+
+    def __getitem__(self, key):
+        self._mmap.seek(self._offsets[key])
+        version = np.lib.format.read_magic(self._mmap)
+        if version == (1, 0):
+            header = np.lib.format.read_array_header_1_0(self._mmap)
+        else:
+            header = np.lib.format.read_array_header_2_0(self._mmap)
+        shape, fortran_order, dtype = header
+        return np.ndarray(shape, dtype=dtype, buffer=self._mmap,
+                          offset=self._mmap.tell(),
+                          order="F" if fortran_order else "C")
+
+
+class DepthCache(OrderedDict):
+    """
+    LRU cache of depth corrected models, optionally backed by a directory.
+
+    Can be passed as ``cache`` to :class:`~obspy.taup.tau.TauPyModel`. At
+    most ``maxsize`` depth corrected models are kept in memory. If a
+    ``directory`` is given, every newly computed model is additionally
+    serialized to that directory and later looked up there before splitting
+    the model again. Files are keyed by a hash of the surface model and the
+    source depth, so the same directory can be shared between different
+    models and between concurrently running processes.
+
+    :param maxsize: Maximum number of depth corrected models kept in memory.
+    :type maxsize: int
+    :param directory: Directory used for the on-disk cache. It is created if
+        it does not exist. If ``None`` (the default), models are only cached
+        in memory.
+    :type directory: str or :class:`pathlib.Path`
+    :param max_disk_size: Maximum total size of the on-disk cache in bytes.
+        The least recently used files are deleted when the limit is exceeded.
+        ``None`` means no limit.
+    :type max_disk_size: int
+
+    >>> from obspy.taup import TauPyModel
+    >>> from obspy.taup.tau_model import DepthCache
+    >>> model = TauPyModel("iasp91", cache=DepthCache(maxsize=16))
+    >>> arrivals = model.get_travel_times(10.0, 20, phase_list=["P"])
+    >>> list(model.model._depth_cache.keys())
+    [10.0]
+    """
+    suffix = ".npz"
+
+    def __init__(self, maxsize=128, directory=None,
+                 max_disk_size=100 * 1024 ** 2):
+        super(DepthCache, self).__init__()
+        self.maxsize = maxsize
+        if directory is not None:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.max_disk_size = max_disk_size
+
+    def __repr__(self):
+        return "%s(maxsize=%r, directory=%r, max_disk_size=%r)" % (
+            self.__class__.__name__, self.maxsize,
+            None if self.directory is None else str(self.directory),
+            self.max_disk_size)
+
+    def _get_filename(self, model, depth):
+        return self.directory / ("%s_%r%s" % (
+            model._get_model_hash(), float(depth), self.suffix))
+
+    def load(self, model, depth):
+        """
+        Load a depth corrected model from disk.
+
+        Returns ``None`` if no (readable) file exists for ``model`` and
+        ``depth``.
+        """
+        if self.directory is None:
+            return None
+        filename = self._get_filename(model, depth)
+        try:
+            with open(filename, "rb") as fh:
+                data = fh.read()
+        except OSError:
+            return None
+        try:
+            value = TauModel.deserialize(io.BytesIO(data), cache=False)
+        except Exception:
+            # Truncated or otherwise broken file, just recompute it.
+            return None
+        # Mark file as recently used for the eviction.
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+        return value
+
+    def store(self, model, depth, value):
+        """
+        Write a depth corrected model to disk.
+
+        The file is first written to a temporary file in the cache directory
+        and then atomically renamed, so concurrent readers never see partial
+        files.
+        """
+        if self.directory is None:
+            return
+        filename = self._get_filename(model, depth)
+        fd, tmp = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                value.serialize(fh)
+            os.replace(tmp, str(filename))
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Delete least recently used files until the on-disk cache is smaller
+        than ``max_disk_size``.
+        """
+        if self.directory is None or self.max_disk_size is None:
+            return
+        files = []
+        for filename in self.directory.glob("*" + self.suffix):
+            try:
+                stat = filename.stat()
+            except OSError:
+                # Removed by another process in the meantime.
+                continue
+            files.append((stat.st_mtime, stat.st_size, filename))
+        total = sum(size for _, size, _ in files)
+        for _, size, filename in sorted(files):
+            if total <= self.max_disk_size:
+                break
+            try:
+                filename.unlink()
+            except OSError:
+                pass
+            total -= size
+
+
 class TauModel(object):
     """
     Provides storage of all the TauBranches comprising a model.
@@ -52,6 +242,10 @@ class TauModel(object):
         # happens to fall on a real discontinuity then it is not included.
         self.no_discon_depths = []
 
+        self._model_hash = None
+        # File the arrays are memory mapped from, if any.
+        self._mmap_filename = None
+
         if cache is None:
             self._depth_cache = OrderedDict()
         elif cache is not False:
@@ -228,16 +422,24 @@ class TauModel(object):
     def load_from_depth_cache(self, depth):
         # Very simple and straightforward LRU cache implementation.
         if self._depth_cache is not None:
+            cache = self._depth_cache
             # Retrieve and later insert again to get LRU cache behaviour.
             try:
-                value = self._depth_cache.pop(depth)
+                value = cache.pop(depth)
             except KeyError:
-                value = self._load_from_depth_cache(depth)
-            self._depth_cache[depth] = value
-            # Pop first key-value pairs until at most 128 elements are still
-            # in the cache.
-            while len(self._depth_cache) > 128:
-                self._depth_cache.popitem(last=False)
+                value = None
+                if isinstance(cache, DepthCache):
+                    value = cache.load(self, depth)
+                if value is None:
+                    value = self._load_from_depth_cache(depth)
+                    if isinstance(cache, DepthCache):
+                        cache.store(self, depth, value)
+            cache[depth] = value
+            # Pop first key-value pairs until at most maxsize (by default
+            # 128) elements are still in the cache.
+            maxsize = getattr(cache, "maxsize", 128)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
             return value
         else:
             return self._load_from_depth_cache(depth)
@@ -246,9 +448,27 @@ class TauModel(object):
         depth_corrected = self.split_branch(depth)
         depth_corrected.source_depth = depth
         depth_corrected.source_branch = depth_corrected.find_branch(depth)
+        # Split models hold copies of the arrays, even if this one is mapped.
+        depth_corrected._mmap_filename = None
         depth_corrected.validate()
         return depth_corrected
 
+    def _get_model_hash(self):
+        """
+        Hash of the model contents identifying it in on-disk caches.
+        """
+        if self._model_hash is None:
+            sha = hashlib.sha1()
+            sha.update(np.float64(self.radius_of_planet).tobytes())
+            sha.update(np.float64(self.source_depth).tobytes())
+            sha.update(np.ascontiguousarray(self.ray_params).tobytes())
+            sha.update(np.ascontiguousarray(self.s_mod.p_layers).tobytes())
+            sha.update(np.ascontiguousarray(self.s_mod.s_layers).tobytes())
+            sha.update(
+                np.ascontiguousarray(self.s_mod.v_mod.layers).tobytes())
+            self._model_hash = sha.hexdigest()
+        return self._model_hash
+
     def split_branch(self, depth):
         """
         Returns a new TauModel with the branches containing depth split at
@@ -408,10 +628,15 @@ class TauModel(object):
             for i in range(1, len(self.tau_branches[0]))]
         return branch_depths
 
-    def serialize(self, filename):
+    def serialize(self, filename, compress=True):
         """
         Serialize model to numpy npz binary file.
 
+        :param filename: File name or open file object.
+        :param compress: Whether to compress the file. Uncompressed files are
+            larger, but can be memory mapped by :meth:`deserialize`.
+        :type compress: bool
+
         Summary of contents that have to be handled during serialization::
 
             TauModel
@@ -543,14 +768,31 @@ class TauModel(object):
         arrays['v_mod.layers'] = self.s_mod.v_mod.layers
 
         # finally save the collection of (structured) arrays to a binary file
-        np.savez_compressed(filename, **arrays)
+        if compress:
+            np.savez_compressed(filename, **arrays)
+        else:
+            np.savez(filename, **arrays)
 
     @staticmethod
-    def deserialize(filename, cache=None):
+    def deserialize(filename, cache=None, mmap=False):
         """
         Deserialize model from numpy npz binary file.
+
+        :param filename: File name or open file object.
+        :param cache: The cache of depth corrected models, see
+            :class:`~obspy.taup.tau.TauPyModel`.
+        :param mmap: Memory map the arrays of the model from the file instead
+            of reading them into memory. Several processes loading the same
+            file then share one copy of the tau branches and slowness layers.
+            The file must be uncompressed, see :meth:`serialize`, and the
+            arrays are read-only.
+        :type mmap: bool
         """
-        with np.load(filename) as npz:
+        if mmap:
+            npz = _MemoryMappedNpz(filename)
+        else:
+            npz = np.load(filename)
+        with npz:
             model = TauModel(s_mod=None,
                              radius_of_planet=float(npz["radius_of_planet"]),
                              cache=cache, skip_calc=True)
@@ -613,8 +855,11 @@ class TauModel(object):
                 setattr(slowness_model, key, data)
 
             # e) handle .s_mod.v_mod
+            model_name = npz["v_mod"]["model_name"].item()
+            if isinstance(model_name, bytes):
+                model_name = model_name.decode()
             velocity_model = VelocityModel(
-                model_name=npz["v_mod"]["model_name"],
+                model_name=model_name,
                 radius_of_planet=float(npz["v_mod"]["radius_of_planet"]),
                 min_radius=float(npz["v_mod"]["min_radius"]),
                 max_radius=float(npz["v_mod"]["max_radius"]),
@@ -626,14 +871,16 @@ class TauModel(object):
             )
             setattr(slowness_model, "v_mod", velocity_model)
             setattr(velocity_model, 'layers', npz['v_mod.layers'])
+        if mmap:
+            model._mmap_filename = npz.filename
         return model
 
     @staticmethod
-    def from_file(model_name, cache=None):
+    def from_file(model_name, cache=None, mmap=False):
         model_path = Path(model_name)
         if model_path.exists():
             filepath = model_path
         else:
             filepath = Path(__file__).parent / "data"
             filepath = filepath / (model_name.lower()+".npz")
-        return TauModel.deserialize(filepath, cache=cache)
+        return TauModel.deserialize(filepath, cache=cache, mmap=mmap)
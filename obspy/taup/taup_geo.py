@@ -109,6 +109,67 @@ def calc_dist_azi(source_latitude_in_deg, source_longitude_in_deg,
             receiver_to_source_backazimuth)
 
 
+def calc_dist_azi_many(source_latitude_in_deg, source_longitude_in_deg,
+                       receiver_latitude_in_deg, receiver_longitude_in_deg,
+                       radius_of_planet_in_km, flattening_of_planet):
+    """
+    Same as :func:`calc_dist_azi` for arrays of source and receiver
+    locations.
+
+    All location arrays are broadcast against each other. For a spherical
+    planet the calculation is vectorized, otherwise :func:`calc_dist_azi` is
+    called for every pair of locations.
+
+    :param source_latitude_in_deg: Source location latitudes in degrees
+    :type source_latitude_in_deg: :class:`numpy.ndarray`
+    :param source_longitude_in_deg: Source location longitudes in degrees
+    :type source_longitude_in_deg: :class:`numpy.ndarray`
+    :param receiver_latitude_in_deg: Receiver location latitudes in degrees
+    :type receiver_latitude_in_deg: :class:`numpy.ndarray`
+    :param receiver_longitude_in_deg: Receiver location longitudes in
+        degrees
+    :type receiver_longitude_in_deg: :class:`numpy.ndarray`
+    :param radius_of_planet_in_km: Radius of the planet in km
+    :type radius_of_planet_in_km: float
+    :param flattening_of_planet: Flattening of planet (0 for a sphere)
+    :type flattening_of_planet: float
+
+    :returns: distance_in_deg (in degrees), source_receiver_azimuth (in
+              degrees) and receiver_to_source_backazimuth (in degrees).
+    :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`,
+        :class:`numpy.ndarray`)
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        *[np.asarray(x, dtype=np.float64) for x in (
+            source_latitude_in_deg, source_longitude_in_deg,
+            receiver_latitude_in_deg, receiver_longitude_in_deg)])
+    if flattening_of_planet != 0.0:
+        values = np.empty((3, ) + lat1.shape)
+        for i in np.ndindex(*lat1.shape):
+            values[(slice(None), ) + i] = calc_dist_azi(
+                lat1[i], lon1[i], lat2[i], lon2[i], radius_of_planet_in_km,
+                flattening_of_planet)
+        return values[0], values[1], values[2]
+
+    # great circle on a sphere
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dlon = np.radians(lon2 - lon1)
+    sin_phi1, cos_phi1 = np.sin(phi1), np.cos(phi1)
+    sin_phi2, cos_phi2 = np.sin(phi2), np.cos(phi2)
+    sin_dlon, cos_dlon = np.sin(dlon), np.cos(dlon)
+    x1 = cos_phi1 * sin_phi2 - sin_phi1 * cos_phi2 * cos_dlon
+    y1 = cos_phi2 * sin_dlon
+    x2 = sin_phi1 * cos_phi2 - cos_phi1 * sin_phi2 * cos_dlon
+    y2 = -cos_phi1 * sin_dlon
+    z = sin_phi1 * sin_phi2 + cos_phi1 * cos_phi2 * cos_dlon
+    distance_in_deg = np.degrees(np.arctan2(np.hypot(y1, x1), z))
+    source_receiver_azimuth = np.degrees(np.arctan2(y1, x1)) % 360
+    receiver_to_source_backazimuth = np.degrees(np.arctan2(y2, x2)) % 360
+    return (distance_in_deg, source_receiver_azimuth,
+            receiver_to_source_backazimuth)
+
+
 def add_geo_to_arrivals(arrivals, source_latitude_in_deg,
                         source_longitude_in_deg, receiver_latitude_in_deg,
                         receiver_longitude_in_deg, radius_of_planet_in_km,
@@ -13,10 +13,12 @@ class TauPPierce(TauPTime):
     """
     def __init__(self, model, phase_list, depth, degrees, receiver_depth=0.0,
                  add_depth=[],
-                 ray_param_tol=_DEFAULT_VALUES["default_path_ray_param_tol"]):
+                 ray_param_tol=_DEFAULT_VALUES["default_path_ray_param_tol"],
+                 phase_cache=None):
         super(TauPPierce, self).__init__(
             model=model, phase_list=phase_list, depth=depth, degrees=degrees,
-            receiver_depth=receiver_depth, ray_param_tol=ray_param_tol)
+            receiver_depth=receiver_depth, ray_param_tol=ray_param_tol,
+            phase_cache=phase_cache)
         self.only_turn_points = False
         self.only_rev_points = False
         self.only_under_points = False
@@ -61,6 +63,14 @@ class TauPPierce(TauPTime):
             TauPTime.depth_correct(self, depth, receiver_depth)
             self.model = orig_tau_model
 
+    def _phase_cache_key(self, phase_name):
+        """
+        Key of a phase in the phase cache, including the additional depths
+        the model was split at.
+        """
+        key = super(TauPPierce, self)._phase_cache_key(phase_name)
+        return key + (tuple(self.add_depth or ()), )
+
     def calculate(self, degrees):
         """
         Call all the necessary calculations to obtain the pierce points.
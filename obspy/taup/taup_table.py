@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed travel time tables.
+
+Exact ray tracing is unnecessarily expensive when huge numbers of travel
+times are needed, e.g. for phase association or template matching. A
+:class:`TravelTimeTable` stores travel times and ray parameters of a couple
+of phases on a grid of source depths and epicentral distances and
+interpolates them for arbitrary depths and distances.
+"""
+import math
+
+import numpy as np
+
+from . import _DEFAULT_VALUES
+from .helper_classes import TauModelError
+from .seismic_phase import SeismicPhase
+from .tau_model import TauModel
+from .utils import parse_phase_list
+
+
+class TravelTimeTable(object):
+    """
+    Travel times of some phases tabulated over source depth and distance.
+
+    Travel times are interpolated with cubic Hermite polynomials in distance,
+    using the ray parameter as derivative of the travel time, and linearly in
+    source depth. Ray parameters are interpolated linearly.
+
+    A phase can have several arrivals at the same distance, e.g. in
+    triplications or for phases that reach distances larger than 180
+    degrees. These are stored as separate branches of the phase, each branch
+    corresponding to a monotonous part of the distance vs. ray parameter
+    curve of the phase. Outside of a branch (e.g. in shadow zones) the
+    tabulated values are NaN. As interpolation needs the values at all
+    surrounding grid points, interpolated values are also NaN within one grid
+    cell of the end of a branch.
+
+    If the table is built with ``estimate_error=True``, exact travel times
+    are additionally calculated at the centers of all grid cells and the
+    maximum absolute deviation of the interpolated travel times (in s) is
+    stored for every phase in :attr:`max_error`. Errors grow with the grid
+    spacing and are largest close to the end of branches and around
+    discontinuities of the model that are crossed between two depths of the
+    grid.
+
+    :ivar phase_names: Names of the tabulated phases.
+    :vartype phase_names: list[str]
+    :ivar depths: Source depths of the grid in km.
+    :vartype depths: :class:`numpy.ndarray`
+    :ivar distances: Epicentral distances of the grid in degrees.
+    :vartype distances: :class:`numpy.ndarray`
+    :ivar times: Travel times in s, with shape ``(number of phases, number
+        of branches, number of depths, number of distances)``.
+    :vartype times: :class:`numpy.ndarray`
+    :ivar ray_params: Ray parameters in s/rad, same shape as ``times``.
+    :vartype ray_params: :class:`numpy.ndarray`
+    :ivar directions: ``1`` for branches whose travel times increase with
+        distance, ``-1`` for branches of arrivals at ``n * 360 - distance``
+        degrees, with shape ``(number of phases, number of branches)``.
+    :vartype directions: :class:`numpy.ndarray`
+    :ivar num_branches: Number of branches of every phase.
+    :vartype num_branches: dict
+    :ivar max_error: Estimated maximum interpolation error of the travel
+        times in s for every phase, NaN if not estimated.
+    :vartype max_error: dict
+
+    .. rubric:: Example
+
+    >>> from obspy.taup import TauPyModel
+    >>> from obspy.taup.taup_table import TravelTimeTable
+    >>> model = TauPyModel("iasp91")
+    >>> table = TravelTimeTable.build(
+    ...     model, ["P"], depths=[0, 50, 100], distances=range(30, 91, 5))
+    >>> times, ray_params = table.get_travel_times(33, [42.3, 77.7], "P")
+    >>> print(times.round(1))  # doctest: +NORMALIZE_WHITESPACE
+    [[ 470.8]
+     [ 713.8]]
+    >>> print(table)  # doctest: +NORMALIZE_WHITESPACE
+    Travel time table for model iasp91
+        3 depths from 0 to 100 km
+        13 distances from 30 to 90 degrees
+        1 phases:
+            P (1 branches, max. error 0.481 s)
+    """
+    def __init__(self, phase_names, depths, distances, times, ray_params,
+                 directions=None, receiver_depth=0.0, model_name=None,
+                 max_error=None):
+        self.phase_names = list(phase_names)
+        self.depths = np.asarray(depths, dtype=np.float64)
+        self.distances = np.asarray(distances, dtype=np.float64)
+        self.times = np.asarray(times, dtype=np.float64)
+        self.ray_params = np.asarray(ray_params, dtype=np.float64)
+        if directions is None:
+            directions = np.ones(self.times.shape[:2])
+        self.directions = np.asarray(directions, dtype=np.float64)
+        self.receiver_depth = receiver_depth
+        self.model_name = model_name
+        shape = (len(self.phase_names), self.times.shape[1],
+                 len(self.depths), len(self.distances))
+        if self.times.shape != shape or self.ray_params.shape != shape:
+            msg = "Shape of travel times or ray parameters is not %s." % (
+                str(shape))
+            raise ValueError(msg)
+        if self.directions.shape != shape[:2]:
+            msg = "Shape of branch directions is not %s." % str(shape[:2])
+            raise ValueError(msg)
+        if len(self.depths) < 2 or np.any(np.diff(self.depths) <= 0):
+            msg = "Need at least two depths in increasing order."
+            raise ValueError(msg)
+        if len(self.distances) < 2 or np.any(np.diff(self.distances) <= 0):
+            msg = "Need at least two distances in increasing order."
+            raise ValueError(msg)
+        self.num_branches = {
+            name: int(np.any(np.isfinite(self.times[i]),
+                             axis=(1, 2)).sum())
+            for i, name in enumerate(self.phase_names)}
+        if max_error is None:
+            max_error = [np.nan] * len(self.phase_names)
+        self.max_error = dict(zip(self.phase_names,
+                                  [float(x) for x in max_error]))
+
+    def __str__(self):
+        ret = ["Travel time table for model %s" % self.model_name,
+               "\t%d depths from %g to %g km" % (
+                   len(self.depths), self.depths[0], self.depths[-1]),
+               "\t%d distances from %g to %g degrees" % (
+                   len(self.distances), self.distances[0],
+                   self.distances[-1]),
+               "\t%d phases:" % len(self.phase_names)]
+        for name in self.phase_names:
+            ret.append("\t\t%s (%d branches, max. error %.3f s)" % (
+                name, self.num_branches[name], self.max_error[name]))
+        return "\n".join(ret)
+
+    def _repr_pretty_(self, p, cycle):
+        p.text(str(self))
+
+    @classmethod
+    def build(cls, model, phase_list, depths, distances,
+              receiver_depth_in_km=0.0, estimate_error=True,
+              ray_param_tol=_DEFAULT_VALUES["default_time_ray_param_tol"]):
+        """
+        Calculate a travel time table.
+
+        :param model: The model to calculate travel times with.
+        :type model: :class:`~obspy.taup.tau.TauPyModel`,
+            :class:`~obspy.taup.tau_model.TauModel` or str
+        :param phase_list: List of phases to tabulate.
+        :type phase_list: list[str]
+        :param depths: Source depths of the grid in km, in increasing order.
+        :type depths: :class:`numpy.ndarray` or list[float]
+        :param distances: Epicentral distances of the grid in degrees, in
+            increasing order, from 0 to 180 degrees.
+        :type distances: :class:`numpy.ndarray` or list[float]
+        :param receiver_depth_in_km: Receiver depth in km
+        :type receiver_depth_in_km: float
+        :param estimate_error: Whether to estimate the interpolation error by
+            computing exact travel times at the centers of all grid cells.
+            This roughly doubles the time needed to build the table.
+        :type estimate_error: bool
+        :param ray_param_tol: Absolute tolerance in s used in estimation of
+            ray parameter.
+        :type ray_param_tol: float
+        :rtype: :class:`TravelTimeTable`
+        """
+        tau_model = _get_tau_model(model)
+        depths = np.asarray(depths, dtype=np.float64)
+        distances = np.asarray(distances, dtype=np.float64)
+        if np.any(distances < 0) or np.any(distances > 180):
+            msg = "Distances must be between 0 and 180 degrees."
+            raise ValueError(msg)
+        phase_names = parse_phase_list(phase_list)
+        known_branches = [[] for _ in phase_names]
+        nodes = _calc_nodes(tau_model, phase_names, depths, distances,
+                            receiver_depth_in_km, ray_param_tol,
+                            known_branches)
+
+        # Number the branches of every phase in order of their earliest
+        # arrival.
+        first_times = [{} for _ in phase_names]
+        for (i, j, k), phase_nodes in nodes.items():
+            for key, time, _ in phase_nodes:
+                first_times[i][key] = min(first_times[i].get(key, np.inf),
+                                          time)
+        branches = [
+            {key: branch for branch, key in enumerate(
+                sorted(first_times_, key=lambda x: (first_times_[x], x)))}
+            for first_times_ in first_times]
+
+        num_branches = max([1] + [len(x) for x in branches])
+        shape = (len(phase_names), num_branches, len(depths), len(distances))
+        times = np.full(shape, np.nan)
+        ray_params = np.full(shape, np.nan)
+        directions = np.ones(shape[:2])
+        for (i, j, k), phase_nodes in nodes.items():
+            for key, time, ray_param in phase_nodes:
+                branch = branches[i][key]
+                # Keep the first arrival if a branch is hit several times.
+                if not time >= times[i, branch, j, k]:
+                    times[i, branch, j, k] = time
+                    ray_params[i, branch, j, k] = ray_param
+                # Travel times decrease with increasing distance for arrivals
+                # at n * 360 - distance.
+                directions[i, branch] = -1.0 if key[1] % 2 else 1.0
+
+        model_name = np.asarray(tau_model.s_mod.v_mod.model_name).item()
+        if isinstance(model_name, bytes):
+            model_name = model_name.decode()
+        table = cls(phase_names, depths, distances, times, ray_params,
+                    directions=directions,
+                    receiver_depth=receiver_depth_in_km,
+                    model_name=str(model_name))
+        if estimate_error:
+            table._estimate_error(tau_model, known_branches, branches,
+                                  ray_param_tol)
+        return table
+
+    def _estimate_error(self, tau_model, known_branches, branches,
+                        ray_param_tol):
+        """
+        Compare interpolated and exact travel times at all cell centers.
+        """
+        depths = (self.depths[1:] + self.depths[:-1]) / 2.0
+        distances = (self.distances[1:] + self.distances[:-1]) / 2.0
+        nodes = _calc_nodes(tau_model, self.phase_names, depths, distances,
+                            self.receiver_depth, ray_param_tol,
+                            [list(x) for x in known_branches], add=False)
+        max_error = np.full(len(self.phase_names), np.nan)
+        for (i, j, k), phase_nodes in nodes.items():
+            times, _ = self._interpolate(i, depths[j], distances[k])
+            for key, time, _ in phase_nodes:
+                branch = branches[i].get(key)
+                if branch is None or np.isnan(times[branch]):
+                    continue
+                error = abs(times[branch] - time)
+                if not error <= max_error[i]:
+                    max_error[i] = error
+        self.max_error = dict(zip(self.phase_names,
+                                  [float(x) for x in max_error]))
+
+    def get_travel_times(self, source_depth_in_km, distance_in_degree,
+                         phase):
+        """
+        Interpolate travel times and ray parameters of a phase.
+
+        Depths and distances may be arrays and are broadcast against each
+        other.
+
+        :param source_depth_in_km: Source depth(s) in km
+        :type source_depth_in_km: float or :class:`numpy.ndarray`
+        :param distance_in_degree: Epicentral distance(s) in degrees.
+        :type distance_in_degree: float or :class:`numpy.ndarray`
+        :param phase: Name of the phase.
+        :type phase: str
+        :returns: Travel times in s and ray parameters in s/rad, each with
+            the broadcast shape of depths and distances and an additional
+            last axis for the branches of the phase. Values are NaN where a
+            branch does not exist.
+        :rtype: tuple of two :class:`numpy.ndarray`
+        """
+        try:
+            i = self.phase_names.index(phase)
+        except ValueError:
+            msg = "Phase '%s' is not in the table." % phase
+            raise ValueError(msg) from None
+        depth, distance = np.broadcast_arrays(
+            np.asarray(source_depth_in_km, dtype=np.float64),
+            np.asarray(distance_in_degree, dtype=np.float64))
+        if np.any(depth < self.depths[0]) or np.any(depth > self.depths[-1]):
+            msg = "Source depth out of range of the table (%g - %g km)." % (
+                self.depths[0], self.depths[-1])
+            raise ValueError(msg)
+        times, ray_params = self._interpolate(i, depth, distance)
+        num_branches = self.num_branches[phase]
+        return times[..., :num_branches], ray_params[..., :num_branches]
+
+    def get_first_arrival_times(self, source_depth_in_km, distance_in_degree,
+                                phase):
+        """
+        Interpolate the travel times of the first arrivals of a phase.
+
+        Same as :meth:`get_travel_times` but only returns the earliest travel
+        time of all branches of the phase, NaN where there is no arrival.
+        """
+        times, _ = self.get_travel_times(source_depth_in_km,
+                                         distance_in_degree, phase)
+        with np.errstate(invalid="ignore"):
+            times = np.where(np.isnan(times), np.inf, times).min(axis=-1)
+        times[np.isinf(times)] = np.nan
+        return times
+
+    def _interpolate(self, i, depth, distance):
+        """
+        Interpolate all branches of the i-th phase.
+        """
+        depth = np.asarray(depth, dtype=np.float64)
+        distance = np.asarray(distance, dtype=np.float64)
+        # Same distance normalization as in SeismicPhase.calc_time().
+        distance = np.abs(distance) % 360.0
+        distance = np.where(distance > 180.0, 360.0 - distance, distance)
+        outside = (distance < self.distances[0]) | \
+            (distance > self.distances[-1])
+
+        j = np.clip(np.searchsorted(self.depths, depth, side="right") - 1,
+                    0, len(self.depths) - 2)
+        k = np.clip(np.searchsorted(self.distances, distance, side="right") -
+                    1, 0, len(self.distances) - 2)
+        wz = (depth - self.depths[j]) / (self.depths[j + 1] - self.depths[j])
+        h = self.distances[k + 1] - self.distances[k]
+        t = (distance - self.distances[k]) / h
+
+        # cubic Hermite basis, derivatives are scaled to degrees
+        h00 = (1 + 2 * t) * (1 - t) ** 2
+        h10 = t * (1 - t) ** 2 * h * np.pi / 180.0
+        h01 = t ** 2 * (3 - 2 * t)
+        h11 = t ** 2 * (t - 1) * h * np.pi / 180.0
+
+        times = self.times[i]
+        ray_params = self.ray_params[i]
+        # slowness as derivative of the travel time with respect to distance
+        slowness = ray_params * self.directions[i][:, np.newaxis, np.newaxis]
+        time = 0.0
+        ray_param = 0.0
+        for jj, wj in ((j, 1 - wz), (j + 1, wz)):
+            for kk, wt, wh0, wh1, wp in ((k, h00, h10, 0.0, 1 - t),
+                                         (k + 1, h01, 0.0, h11, t)):
+                node_time = np.moveaxis(times[:, jj, kk], 0, -1)
+                node_p = np.moveaxis(ray_params[:, jj, kk], 0, -1)
+                node_slowness = np.moveaxis(slowness[:, jj, kk], 0, -1)
+                wj_ = wj[..., np.newaxis]
+                time = time + _weighted(wj_ * wt[..., np.newaxis], node_time)
+                time = time + _weighted(
+                    wj_ * np.asarray(wh0 + wh1)[..., np.newaxis],
+                    node_slowness)
+                ray_param = ray_param + _weighted(
+                    wj_ * wp[..., np.newaxis], node_p)
+        time = np.where(outside[..., np.newaxis], np.nan, time)
+        ray_param = np.where(outside[..., np.newaxis], np.nan, ray_param)
+        return time, ray_param
+
+    def save(self, filename):
+        """
+        Save the table to a ``.npz`` file.
+
+        :param filename: Filename or open file to write to.
+        :type filename: str or file-like object
+        """
+        np.savez_compressed(
+            filename, phase_names=np.array(self.phase_names),
+            depths=self.depths, distances=self.distances, times=self.times,
+            ray_params=self.ray_params, directions=self.directions,
+            receiver_depth=np.float64(self.receiver_depth),
+            model_name=np.array(self.model_name or ""),
+            max_error=np.array([self.max_error[name]
+                                for name in self.phase_names]))
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load a table saved with :meth:`save`.
+
+        :param filename: Filename or open file to read from.
+        :type filename: str or file-like object
+        :rtype: :class:`TravelTimeTable`
+        """
+        with np.load(filename, allow_pickle=False) as npz:
+            return cls(npz["phase_names"].tolist(), npz["depths"],
+                       npz["distances"], npz["times"], npz["ray_params"],
+                       directions=npz["directions"],
+                       receiver_depth=float(npz["receiver_depth"]),
+                       model_name=str(npz["model_name"]) or None,
+                       max_error=npz["max_error"])
+
+
+def _weighted(weight, values):
+    """
+    Multiply values with weights, ignoring values with a weight of zero.
+    """
+    return np.where(weight == 0, 0.0, weight * values)
+
+
+def _get_tau_model(model):
+    """
+    Get the TauModel of a TauPyModel, TauModel or model name.
+    """
+    if isinstance(model, TauModel):
+        return model
+    if isinstance(model, str):
+        return TauModel.from_file(model)
+    return model.model
+
+
+def _branch_keys(phase):
+    """
+    Number the monotonous parts of the distance curve of a phase.
+
+    Returns an array with the number of the part each interval between
+    neighboring ray parameter samples belongs to, and the range of ray
+    parameters and the direction of the distance curve of each part. Parts
+    are split where the distance changes direction and at shadow zones
+    (repeated ray parameters).
+    """
+    diff = np.sign(np.diff(phase.dist))
+    # zero length intervals continue the previous direction
+    for _i in range(1, len(diff)):
+        if diff[_i] == 0:
+            diff[_i] = diff[_i - 1]
+    splits = np.zeros(len(diff), dtype=np.int64)
+    splits[1:] = diff[1:] != diff[:-1]
+    if not phase.head_or_diffract_seq:
+        splits[1:] |= np.diff(phase.ray_param)[1:] == 0
+    keys = np.cumsum(splits)
+    parts = []
+    for key in range(keys[-1] + 1 if len(keys) else 0):
+        idx = np.nonzero(keys == key)[0]
+        ray_param = phase.ray_param[idx[0]:idx[-1] + 2]
+        parts.append((ray_param.min(), ray_param.max(), diff[idx[0]]))
+    return keys, parts
+
+
+def _match_branches(parts, branches, add=True):
+    """
+    Match the parts of a distance curve to the branches of a phase.
+
+    The branches found at other source depths are described by their range of
+    ray parameters and direction in ``branches``. Parts are greedily matched
+    to the branch with the same direction and the largest relative overlap
+    of ray parameters. Unmatched parts are added as new branches if ``add``
+    is ``True``, otherwise they are mapped to ``None``.
+    """
+    eps = 1e-9
+    scores = []
+    for i, (pmin, pmax, direction) in enumerate(parts):
+        for j, (bmin, bmax, bdirection) in enumerate(branches):
+            if direction != bdirection:
+                continue
+            overlap = min(pmax, bmax) - max(pmin, bmin)
+            if overlap < 0:
+                continue
+            score = (overlap + eps) / (min(pmax - pmin, bmax - bmin) + eps)
+            scores.append((-score, i, j))
+    mapping = {}
+    taken = set()
+    for _, i, j in sorted(scores):
+        if i in mapping or j in taken:
+            continue
+        mapping[i] = j
+        taken.add(j)
+    for i, part in enumerate(parts):
+        if i in mapping:
+            if add:
+                # follow changes of the ray parameters with depth
+                branches[mapping[i]] = part
+        elif add:
+            mapping[i] = len(branches)
+            branches.append(part)
+        else:
+            mapping[i] = None
+    return mapping
+
+
+def _calc_nodes(tau_model, phase_names, depths, distances, receiver_depth,
+                ray_param_tol, branches, add=True):
+    """
+    Calculate arrivals of all phases for a grid of depths and distances.
+
+    ``branches`` holds a list of known branches for every phase, see
+    :func:`_match_branches`. Returns a dictionary mapping (phase index, depth
+    index, distance index) to lists of (branch key, time, ray parameter)
+    tuples. Branch keys are tuples of the branch number and the number of
+    half turns around the planet.
+    """
+    nodes = {}
+    for j, depth in enumerate(depths):
+        model = tau_model.depth_correct(depth)
+        if receiver_depth != depth:
+            model = model.split_branch(receiver_depth)
+        for i, name in enumerate(phase_names):
+            try:
+                phase = SeismicPhase(name, model, receiver_depth)
+            except TauModelError:
+                continue
+            keys, parts = _branch_keys(phase)
+            mapping = _match_branches(parts, branches[i], add=add)
+            index, arrivals = phase.calc_time_many(distances, ray_param_tol)
+            for k, arrival in zip(index, arrivals):
+                branch = mapping[keys[arrival.ray_param_index]]
+                if branch is None:
+                    continue
+                # Separate arrivals at n * 360 + distance (even) and
+                # n * 360 - distance (odd). Arrivals at multiples of 180
+                # degrees are the end points of two of them.
+                half_turns = arrival.purist_dist / np.pi
+                wraps = [int(math.floor(half_turns))]
+                if abs(half_turns - round(half_turns)) < 1e-9:
+                    wraps = [int(round(half_turns)) - 1,
+                             int(round(half_turns))]
+                for wrap in wraps:
+                    if wrap < 0:
+                        continue
+                    nodes.setdefault((i, j, int(k)), []).append(
+                        ((branch, wrap), arrival.time, arrival.ray_param))
+    return nodes
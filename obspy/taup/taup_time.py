@@ -14,8 +14,8 @@ class TauPTime(object):
     between known slowness samples.
     """
     def __init__(self, model, phase_list, depth, degrees, receiver_depth=0.0,
-                 ray_param_tol=_DEFAULT_VALUES["default_time_ray_param_tol"]
-                 ):
+                 ray_param_tol=_DEFAULT_VALUES["default_time_ray_param_tol"],
+                 phase_cache=None):
         self.source_depth = depth
         self.receiver_depth = receiver_depth
         self.degrees = degrees
@@ -28,6 +28,9 @@ class TauPTime(object):
         self.model = model
         self.depth_corrected_model = self.model
         self.ray_param_tol = ray_param_tol
+        # Optional ordered dictionary used as LRU cache of SeismicPhase
+        # objects, shared between calculations for the same model.
+        self.phase_cache = phase_cache
 
     def run(self):
         """
@@ -77,15 +80,46 @@ class TauPTime(object):
             else:
                 # Didn't find it precomputed, so recalculate:
                 try:
-                    seismic_phase = SeismicPhase(temp_phase_name,
-                                                 self.depth_corrected_model,
-                                                 self.receiver_depth)
+                    seismic_phase = self._get_phase(temp_phase_name)
                     new_phases.append(seismic_phase)
                 except TauModelError:
                     print("Error with this phase, skipping it: " +
                           str(temp_phase_name))
             self.phases = new_phases
 
+    def _phase_cache_key(self, phase_name):
+        """
+        Key of a phase in the phase cache.
+
+        The depth corrected model is split anew for every receiver depth, so
+        the phase is identified by the original model and the depths.
+        """
+        return (phase_name, self.source_depth, self.receiver_depth,
+                self.model)
+
+    def _get_phase(self, phase_name):
+        """
+        Create the SeismicPhase for the depth corrected model or take it from
+        the phase cache.
+        """
+        cache = self.phase_cache
+        if cache is None:
+            return SeismicPhase(phase_name, self.depth_corrected_model,
+                                self.receiver_depth)
+        key = self._phase_cache_key(phase_name)
+        # Retrieve and later insert again to get LRU cache behaviour.
+        try:
+            seismic_phase = cache.pop(key)
+        except KeyError:
+            seismic_phase = SeismicPhase(phase_name,
+                                         self.depth_corrected_model,
+                                         self.receiver_depth)
+        cache[key] = seismic_phase
+        maxsize = getattr(cache, "maxsize", 512)
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+        return seismic_phase
+
     def calculate(self, degrees):
         """
         Calculate the arrival times.
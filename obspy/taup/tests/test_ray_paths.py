@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import pickle
+
 import numpy as np
 import pytest
 
@@ -164,6 +166,62 @@ class TestRayPathCalculations:
         np.testing.assert_allclose(path[:, ::10], path_steps_expected,
                                    rtol=1e-6)
 
+    @pytest.mark.skipif(
+        not geodetics.GEOGRAPHICLIB_VERSION_AT_LEAST_1_34,
+        reason='test needs geographiclib >= 1.34')
+    def test_compute_ray_paths_processes(self):
+        """
+        Ray paths are the same as the ones of get_ray_paths_geo() for every
+        station and event and do not depend on the number of processes.
+        """
+        stations = [obspy.core.inventory.Station(
+            code='ST%d' % i, latitude=lat, longitude=lon, elevation=0.)
+            for i, (lat, lon) in enumerate([(0., 30.), (45., -120.),
+                                            (-30., 150.)])]
+        network = obspy.core.inventory.Network(code='NET', stations=stations)
+        inventory = obspy.core.inventory.Inventory(
+            source='ME', networks=[network])
+        events = []
+        for lat, lon, depth in [(0., 90., 100000.), (10., -20., 10000.)]:
+            origin = obspy.core.event.Origin(
+                latitude=lat, longitude=lon, depth=depth,
+                time=obspy.UTCDateTime(2017, 2, 3))
+            magnitude = obspy.core.event.Magnitude(mag=6.)
+            events.append(obspy.core.event.Event(origins=[origin],
+                                                 magnitudes=[magnitude]))
+        catalog = obspy.core.event.Catalog(events=events)
+        phase_list = ['P', 'PKP', 'S']
+        model = TauPyModel('iasp91')
+
+        expected = []
+        for station in stations:
+            for event in events:
+                origin = event.origins[0]
+                arrivals = model.get_ray_paths_geo(
+                    origin.depth / 1e3, origin.latitude, origin.longitude,
+                    station.latitude, station.longitude,
+                    phase_list=phase_list, resample=True)
+                for arr in arrivals:
+                    expected.append((arr.name, 'NET.' + station.code,
+                                     str(event.resource_id), arr.path))
+        # the model is sent to the worker processes without its caches
+        assert len(model.model._depth_cache) > 0
+        assert len(pickle.dumps(model)) < \
+            1.1 * len(pickle.dumps(TauPyModel('iasp91')))
+        for processes in (1, 2):
+            greatcircles = get_ray_paths(
+                inventory, catalog, phase_list=phase_list,
+                coordinate_system='RTP', taup_model=model,
+                processes=processes)
+            assert len(greatcircles) == len(expected)
+            for circ, (name, label, event_id, path) in zip(greatcircles,
+                                                           expected):
+                assert circ[1] == name
+                assert circ[2] == label
+                assert circ[5] == event_id
+                np.testing.assert_allclose(circ[0][2],
+                                           np.radians(path['lon']))
+
     def test_deep_source(self):
         # Regression test -- check if deep sources are ok
         model = TauPyModel("ak135")
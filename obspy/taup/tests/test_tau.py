@@ -5,6 +5,7 @@ Tests the high level obspy.taup.tau interface.
 """
 import collections
 import os
+import pickle
 import warnings
 from collections import OrderedDict
 from pathlib import Path
@@ -17,6 +18,7 @@ from obspy.taup import TauPyModel
 from obspy.taup.tau import Arrivals
 from obspy.taup.taup_create import build_taup_model
 from obspy.taup.seismic_phase import SeismicPhase
+from obspy.taup.tau_model import DepthCache
 import obspy.geodetics.base as geodetics
 
 
@@ -44,7 +46,7 @@ class TestTauPyModel:
     @pytest.fixture  # Note: tests fail when cache is set to class level
     def caches(self):
         """A cache for test state."""
-        return [OrderedDict(), False, None]
+        return [OrderedDict(), False, None, DepthCache(maxsize=2)]
 
     def _read_taup_output(self, path):
         """
@@ -1123,3 +1125,264 @@ class TestTauPyModel:
             model = TauPyModel(os.path.join(folder, model_name + ".npz"))
             arrivals = model.get_ray_paths(20.0, 0.84, phase_list=["sS"])
             assert len(arrivals) == 0
+
+    def test_get_travel_times_many(self):
+        """
+        Tests that travel times for many distances at once are identical to
+        the ones of separate get_travel_times() calls.
+        """
+        m = TauPyModel(model="iasp91")
+        distances = [0.0, 3.5, 20.0, 20.0, 97.3, 145.0, 180.0, 215.0, -40.0]
+        phase_list = ["P", "S", "PKP", "pP", "Pn", "PcP", "3kmps"]
+        for depth, receiver_depth in ((10.0, 0.0), (300.0, 50.0)):
+            table = m.get_travel_times_many(
+                depth, np.array(distances), phase_list=phase_list,
+                receiver_depth_in_km=receiver_depth)
+            expected = []
+            for i, distance in enumerate(distances):
+                for arr in m.get_travel_times(
+                        depth, distance, phase_list=phase_list,
+                        receiver_depth_in_km=receiver_depth):
+                    expected.append((
+                        i, distance, arr.name, arr.time, arr.ray_param,
+                        arr.takeoff_angle, arr.incident_angle,
+                        arr.purist_distance))
+            assert len(table) == len(expected)
+            for row, exp in zip(table, expected):
+                assert tuple(row.tolist()) == exp
+        # scalars and phases that do not exist at the given distances
+        table = m.get_travel_times_many(10.0, 20.0, phase_list=["P"])
+        assert len(table) == 5
+        assert np.all(table["index"] == 0)
+        table = m.get_travel_times_many(10.0, [10.0, 20.0],
+                                        phase_list=["PKIKP"])
+        assert len(table) == 0
+        assert table.dtype.names == (
+            "index", "distance", "name", "time", "ray_param",
+            "takeoff_angle", "incident_angle", "purist_distance")
+        with pytest.raises(ValueError):
+            m.get_travel_times_many(10.0, [[10.0]])
+
+    def test_get_ray_paths_many(self):
+        """
+        Tests that ray paths for many distances at once are identical to the
+        ones of separate get_ray_paths() calls.
+        """
+        m = TauPyModel(model="iasp91")
+        distances = [0.0, 3.5, 20.0, 97.3, 110.0, 145.0, 180.0, 215.0]
+        phase_list = ["P", "S", "PKP", "pP", "Pn", "Pdiff", "SKS", "3kmps"]
+        for depth, receiver_depth in ((10.0, 0.0), (300.0, 50.0)):
+            got = m.get_ray_paths_many(depth, distances, phase_list,
+                                       receiver_depth_in_km=receiver_depth)
+            assert len(got) == len(distances)
+            for distance, arrivals in zip(distances, got):
+                expected = m.get_ray_paths(
+                    depth, distance, phase_list,
+                    receiver_depth_in_km=receiver_depth)
+                assert [(arr.name, arr.time) for arr in arrivals] == \
+                    [(arr.name, arr.time) for arr in expected]
+                for arr, exp in zip(arrivals, expected):
+                    np.testing.assert_array_equal(arr.path, exp.path)
+        assert len(m.get_ray_paths_many(10.0, 20.0, ["PKIKP"])[0]) == 0
+        with pytest.raises(ValueError):
+            m.get_ray_paths_many(10.0, [[10.0]])
+
+    def test_depth_cache(self, tmp_path):
+        """
+        Tests the in-memory size and the on-disk storage of DepthCache.
+        """
+        directory = tmp_path / "cache"
+        phase_list = ["P", "S", "PKiKP", "sP"]
+        m = TauPyModel(model="iasp91", cache=DepthCache(
+            maxsize=2, directory=directory))
+        expected = {}
+        for depth in (10.0, 33.3, 250.0):
+            expected[depth] = [
+                (arr.name, arr.time, arr.ray_param) for arr in
+                m.get_travel_times(depth, 50.0, phase_list=phase_list)]
+        assert list(m.model._depth_cache.keys()) == [33.3, 250.0]
+        files = sorted(p.name for p in directory.iterdir())
+        assert len(files) == 3
+        assert all(f.endswith(".npz") for f in files)
+        # a new model (e.g. in a different process) reads the files written
+        # above instead of splitting the model again
+        m2 = TauPyModel(model="iasp91", cache=DepthCache(
+            directory=directory))
+        m2.model._load_from_depth_cache = None
+        for depth, exp in expected.items():
+            got = [(arr.name, arr.time, arr.ray_param) for arr in
+                   m2.get_travel_times(depth, 50.0, phase_list=phase_list)]
+            assert got == exp
+        # other models use different files
+        m3 = TauPyModel(model="ak135", cache=DepthCache(directory=directory))
+        m3.get_travel_times(10.0, 50.0, phase_list=phase_list)
+        assert len(list(directory.iterdir())) == 4
+        # broken files are recomputed
+        for p in directory.iterdir():
+            p.write_bytes(b"")
+        m4 = TauPyModel(model="ak135", cache=DepthCache(directory=directory))
+        m4.get_travel_times(10.0, 50.0, phase_list=phase_list)
+        assert (directory / files[0]).stat().st_size == 0
+        assert max(p.stat().st_size for p in directory.iterdir()) > 0
+        # size limit, least recently used files are deleted first
+        directory = tmp_path / "cache2"
+        m5 = TauPyModel(model="ak135", cache=DepthCache(
+            directory=directory, max_disk_size=None))
+        for depth in (10.0, 20.0):
+            m5.get_travel_times(depth, 50.0, phase_list=phase_list)
+        files = sorted(directory.iterdir())
+        size = max(p.stat().st_size for p in files)
+        for i, p in enumerate(files):
+            os.utime(p, (1e9 + i, 1e9 + i))
+        m6 = TauPyModel(model="ak135", cache=DepthCache(
+            directory=directory, max_disk_size=2 * size + size // 2))
+        for depth in (10.0, 30.0):
+            m6.get_travel_times(depth, 50.0, phase_list=phase_list)
+        assert sorted(p.name.split("_")[1] for p in directory.iterdir()) == \
+            ["10.0.npz", "30.0.npz"]
+
+    def test_mmap(self, tmp_path):
+        """
+        Tests memory mapped models from uncompressed files.
+        """
+        filename = str(tmp_path / "iasp91.npz")
+        m = TauPyModel(model="iasp91")
+        m.model.serialize(filename, compress=False)
+        m_mmap = TauPyModel(model=filename, mmap=True)
+        assert m_mmap.model._mmap_filename == filename
+        for arr in (m_mmap.model.tau_branches[0, 0].time,
+                    m_mmap.model.s_mod.p_layers, m_mmap.model.ray_params):
+            assert not arr.flags.writeable
+        assert m_mmap.model._get_model_hash() == m.model._get_model_hash()
+        for depth in (0.0, 10.0, 300.0):
+            got = m_mmap.get_ray_paths(depth, 50.0, ["P", "SKS", "sP"])
+            expected = m.get_ray_paths(depth, 50.0, ["P", "SKS", "sP"])
+            assert len(got) == len(expected)
+            for arr, exp in zip(got, expected):
+                assert arr.time == exp.time
+                np.testing.assert_array_equal(arr.path, exp.path)
+        # pickled models map the file again and do not carry the caches
+        assert len(m_mmap.model._depth_cache) > 0
+        data = pickle.dumps(m_mmap)
+        assert len(data) < 1000
+        m2 = pickle.loads(data)
+        assert m2.model._mmap_filename == filename
+        assert len(m2.model._depth_cache) == 0
+        assert len(m2._phase_cache) == 0
+        assert m2.get_travel_times(10.0, 50.0, ["P"])[0].time == \
+            m.get_travel_times(10.0, 50.0, ["P"])[0].time
+        # other models are pickled without their caches as well
+        size = len(pickle.dumps(TauPyModel(model="iasp91")))
+        for depth in (10.0, 100.0, 300.0):
+            m.get_travel_times(depth, 50.0, ["P"])
+        data = pickle.dumps(m)
+        assert len(data) < 1.1 * size
+        m2 = pickle.loads(data)
+        assert len(m2.model._depth_cache) == 0
+        assert len(m2._phase_cache) == 0
+        assert len(m.model._depth_cache) > 0
+        assert len(m._phase_cache) > 0
+        assert m2.get_travel_times(10.0, 50.0, ["P"])[0].time == \
+            m.get_travel_times(10.0, 50.0, ["P"])[0].time
+        # compressed files can not be mapped
+        with pytest.raises(ValueError, match="uncompressed"):
+            TauPyModel(model="iasp91", mmap=True)
+
+    def test_phase_cache(self):
+        """
+        Tests that seismic phases are reused for the same source and receiver
+        depth and that results do not change.
+        """
+        phase_list = ["P", "S", "PKiKP", "sP"]
+        m = TauPyModel(model="iasp91")
+        m_no_cache = TauPyModel(model="iasp91", phase_cache=False)
+        assert m_no_cache._phase_cache is None
+        # disabling the depth cache also disables the phase cache, unless
+        # it is passed explicitly
+        assert TauPyModel(model="iasp91", cache=False)._phase_cache is None
+        cache = OrderedDict()
+        assert TauPyModel(model="iasp91", cache=False,
+                          phase_cache=cache)._phase_cache is cache
+        for depth, receiver_depth in ((10.0, 0.0), (10.0, 0.0), (10.0, 5.0),
+                                      (300.0, 0.0)):
+            for distance in (30.0, 70.0):
+                got = m.get_travel_times(depth, distance, phase_list,
+                                         receiver_depth)
+                expected = m_no_cache.get_travel_times(
+                    depth, distance, phase_list, receiver_depth)
+                assert [(arr.name, arr.time) for arr in got] == \
+                    [(arr.name, arr.time) for arr in expected]
+        assert len(m._phase_cache) == 3 * len(phase_list)
+        phase = m._phase_cache[("P", 10.0, 5.0, m.model)]
+        arrival = m.get_travel_times(10.0, 40.0, ["P"], 5.0)[0]
+        assert arrival.phase is phase
+        # pierce points for additional depths use their own phases
+        for add_depth in ([], [1000.0]):
+            got = m.get_pierce_points(10.0, 50.0, ["P"], add_depth=add_depth)
+            expected = m_no_cache.get_pierce_points(10.0, 50.0, ["P"],
+                                                    add_depth=add_depth)
+            np.testing.assert_array_equal(got[0].pierce, expected[0].pierce)
+        assert ("P", 10.0, 0.0, m.model, (1000.0, )) in m._phase_cache
+        # LRU eviction
+        cache = DepthCache(maxsize=3)
+        m = TauPyModel(model="iasp91", phase_cache=cache)
+        m.get_travel_times(10.0, 50.0, phase_list)
+        names = [key[0] for key in cache]
+        assert len(names) == 3
+        m.get_travel_times(10.0, 50.0, [names[0]])
+        assert [key[0] for key in cache] == names[1:] + names[:1]
+
+    def test_get_travel_times_geo_many(self):
+        """
+        Tests that travel times for many sources and receivers are identical
+        to the ones of separate get_travel_times_geo() calls.
+        """
+        m = TauPyModel(model="iasp91")
+        source_depths = [10.0, 150.0, 10.0, 33.0]
+        source_lats = [0.0, -20.0, 45.0, 80.0]
+        source_lons = [0.0, 170.0, -30.0, 10.0]
+        receiver_lats = [10.0, -60.0, 0.0]
+        receiver_lons = [20.0, 100.0, 180.0]
+        phase_list = ["P", "S", "PKP", "Pn"]
+        table = m.get_travel_times_geo_many(
+            source_depths, source_lats, source_lons, receiver_lats,
+            receiver_lons, phase_list=phase_list)
+        expected = []
+        for i, (depth, slat, slon) in enumerate(zip(
+                source_depths, source_lats, source_lons)):
+            for j, (rlat, rlon) in enumerate(zip(receiver_lats,
+                                                 receiver_lons)):
+                for arr in m.get_travel_times_geo(depth, slat, slon, rlat,
+                                                  rlon, phase_list):
+                    expected.append((i, j, arr.name, arr.time,
+                                     arr.ray_param, arr.distance))
+        assert len(table) == len(expected)
+        for row, exp in zip(table, expected):
+            assert (row["source_index"], row["receiver_index"],
+                    row["name"]) == exp[:3]
+            assert row["time"] == pytest.approx(exp[3], rel=1e-10)
+            assert row["ray_param"] == pytest.approx(exp[4], rel=1e-10)
+            assert row["distance"] == pytest.approx(exp[5], abs=1e-10)
+        for row in table:
+            dist, az, baz = geodetics.gps2dist_azimuth(
+                source_lats[row["source_index"]],
+                source_lons[row["source_index"]],
+                receiver_lats[row["receiver_index"]],
+                receiver_lons[row["receiver_index"]],
+                a=m.model.radius_of_planet * 1000.0, f=0.0)
+            assert row["azimuth"] == pytest.approx(az, abs=1e-6)
+            assert row["backazimuth"] == pytest.approx(baz, abs=1e-6)
+        # worker processes give the same result
+        table2 = m.get_travel_times_geo_many(
+            source_depths, source_lats, source_lons, receiver_lats,
+            receiver_lons, phase_list=phase_list, processes=2)
+        np.testing.assert_array_equal(table2, table)
+        # scalar receiver
+        table = m.get_travel_times_geo_many(
+            source_depths, source_lats, source_lons, 10.0, 20.0,
+            phase_list=["P", "PKP"])
+        assert np.all(table["receiver_index"] == 0)
+        assert set(table["source_index"]) == {0, 1, 2, 3}
+        with pytest.raises(ValueError):
+            m.get_travel_times_geo_many([[10.0]], [[0.0]], [[0.0]], 10.0,
+                                        20.0)
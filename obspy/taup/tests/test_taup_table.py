@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests the TravelTimeTable class.
+"""
+import io
+
+import numpy as np
+import pytest
+
+from obspy.taup.tau import TauPyModel
+from obspy.taup.taup_table import TravelTimeTable
+
+
+class TestTravelTimeTable:
+    """
+    Test suite for the TravelTimeTable class.
+    """
+    @pytest.fixture(scope='class')
+    def model(self):
+        return TauPyModel('iasp91')
+
+    @pytest.fixture(scope='class')
+    def table(self, model):
+        return TravelTimeTable.build(
+            model, ["P", "PKP", "S"], depths=[0.0, 40.0, 100.0, 200.0],
+            distances=np.arange(0.0, 181.0, 4.0))
+
+    def test_values_at_grid_points(self, model, table):
+        """
+        At the grid points the table returns all exact arrivals.
+        """
+        for depth, distance in ((0.0, 20.0), (40.0, 24.0), (100.0, 148.0),
+                                (200.0, 180.0), (0.0, 0.0)):
+            for phase in table.phase_names:
+                times, ray_params = table.get_travel_times(
+                    depth, distance, phase)
+                arrivals = model.get_travel_times(
+                    depth, distance, phase_list=[phase])
+                expected = sorted(set(arr.time for arr in arrivals))
+                got = np.sort(times[np.isfinite(times)])
+                np.testing.assert_allclose(got, expected, rtol=1e-12)
+                for arr in arrivals:
+                    i = np.nanargmin(np.abs(times - arr.time))
+                    assert ray_params[i] == pytest.approx(arr.ray_param)
+
+    def test_interpolation(self, model, table):
+        """
+        Interpolated travel times stay within the estimated error.
+        """
+        assert table.num_branches["P"] > 1
+        assert table.num_branches["PKP"] > 1
+        for phase in table.phase_names:
+            assert 0 < table.max_error[phase] < 2.0
+        rng = np.random.default_rng(42)
+        depths = rng.uniform(0, 200, 30)
+        distances = rng.uniform(0, 180, 30)
+        times, _ = table.get_travel_times(depths, distances, "P")
+        assert times.shape == (30, table.num_branches["P"])
+        first = table.get_first_arrival_times(depths, distances, "P")
+        assert first.shape == (30, )
+        checked = 0
+        for depth, distance, times_, first_ in zip(depths, distances, times,
+                                                   first):
+            expected = [arr.time for arr in model.get_travel_times(
+                depth, distance, phase_list=["P"])]
+            for time in times_[np.isfinite(times_)]:
+                checked += 1
+                error = min(abs(time - exp) for exp in expected)
+                assert error < 2 * table.max_error["P"]
+            if np.isfinite(first_):
+                assert abs(first_ - min(expected)) < 2 * table.max_error["P"]
+        assert checked > 10
+
+    def test_distances_larger_than_180_degrees(self, table):
+        """
+        Distances are mapped like in TauPyModel.get_travel_times().
+        """
+        times, _ = table.get_travel_times(40.0, [50.0, 310.0, -50.0, 410.0],
+                                          "S")
+        for i in range(1, 4):
+            np.testing.assert_array_equal(times[i], times[0])
+
+    def test_save_load(self, table):
+        """
+        Tables survive a round trip through an npz file.
+        """
+        buf = io.BytesIO()
+        table.save(buf)
+        buf.seek(0)
+        table2 = TravelTimeTable.load(buf)
+        assert table2.phase_names == table.phase_names
+        assert table2.model_name == "iasp91"
+        assert table2.max_error == table.max_error
+        assert table2.num_branches == table.num_branches
+        for key in ("depths", "distances", "times", "ray_params",
+                    "directions"):
+            np.testing.assert_array_equal(getattr(table2, key),
+                                          getattr(table, key))
+        assert str(table2) == str(table)
+
+    def test_errors(self, table):
+        with pytest.raises(ValueError, match="not in the table"):
+            table.get_travel_times(10.0, 10.0, "SKS")
+        with pytest.raises(ValueError, match="out of range"):
+            table.get_travel_times(300.0, 10.0, "P")
+        with pytest.raises(ValueError):
+            TravelTimeTable.build('iasp91', ["P"], [0, 10], [170, 190])
+        with pytest.raises(ValueError):
+            TravelTimeTable.build('iasp91', ["P"], [10, 0], [10, 20])
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import numpy as np
+import pytest
 
 from obspy.taup.velocity_model import VelocityModel
 
@@ -31,6 +32,16 @@ class TestTauPyVelocityModel:
             # check boundary cases
             assert test2.layer_number_above(6371) == 128
             assert test2.layer_number_below(0) == 0
+            # arrays, depths outside of the model are dropped
+            depths = np.array([-1.0, 0.0, 20.0, 21.0, 6371.0, 7000.0])
+            np.testing.assert_array_equal(
+                test2.layer_number_above(depths), [0, 1, 128])
+            np.testing.assert_array_equal(
+                test2.layer_number_below(depths), [0, 1, 1])
+            with pytest.raises(LookupError):
+                test2.layer_number_above(0.0)
+            with pytest.raises(LookupError):
+                test2.layer_number_below(6371.0)
 
             # evaluate at cmb
             assert test2.evaluate_above(2889.0, 'p') == 13.6908
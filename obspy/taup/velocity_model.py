@@ -96,11 +96,14 @@ class VelocityModel(object):
         :rtype: :class:`int` or :class:`~numpy.ndarray` (dtype = :class:`int`,
             shape equivalent to ``depth``)
         """
-        depth = np.atleast_1d(depth)
-        layer = np.logical_and(
-            self.layers['top_depth'][np.newaxis, :] < depth[:, np.newaxis],
-            depth[:, np.newaxis] <= self.layers['bot_depth'][np.newaxis, :])
-        layer = np.where(layer)[-1]
+        depth = np.atleast_1d(depth).ravel()
+        # Layers are sorted by depth, so use a binary search for the first
+        # layer with a bottom at or below depth.
+        layer = np.searchsorted(self.layers['bot_depth'], depth, side='left')
+        found = layer < len(self.layers)
+        found[found] = (self.layers['top_depth'][layer[found]] <
+                        depth[found])
+        layer = layer[found]
         if len(layer):
             return layer
         else:
@@ -122,11 +125,14 @@ class VelocityModel(object):
         :rtype: :class:`int` or :class:`~numpy.ndarray` (dtype = :class:`int`,
             shape equivalent to ``depth``)
         """
-        depth = np.atleast_1d(depth)
-        layer = np.logical_and(
-            self.layers['top_depth'][np.newaxis, :] <= depth[:, np.newaxis],
-            depth[:, np.newaxis] < self.layers['bot_depth'][np.newaxis, :])
-        layer = np.where(layer)[-1]
+        depth = np.atleast_1d(depth).ravel()
+        # Layers are sorted by depth, so use a binary search for the last
+        # layer with a top at or above depth.
+        layer = np.searchsorted(self.layers['top_depth'], depth,
+                                side='right') - 1
+        found = layer >= 0
+        found[found] = depth[found] < self.layers['bot_depth'][layer[found]]
+        layer = layer[found]
         if len(layer):
             return layer
         else: